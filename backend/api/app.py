@@ -27,13 +27,14 @@ from routers import (
     timers_router,
     video_queue_router,
 )
+from shared.cache import cache_stats
+from shared.cache_bus import cache_bus
 
 logger = logging.getLogger(__name__)
 
 # Track server start time
 _start_time: float = 0.0
 _heartbeat_task: asyncio.Task | None = None
-_pool_heartbeat_task: asyncio.Task | None = None
 _db_retry_task: asyncio.Task | None = None
 
 
@@ -47,39 +48,6 @@ async def _heartbeat(interval: int = 300) -> None:
         logger.info(f"Heartbeat: uptime={uptime}s, db={db_ok}")
 
 
-async def _pool_heartbeat_loop() -> None:
-    """Periodically ping the DB pool to keep idle connections alive.
-
-    Constraint chain: heartbeat(15s) < max_inactive(25s) < Supavisor(~30-60s).
-    On failure, backs off to avoid flooding logs and wasting connections.
-    """
-    interval = 15
-    fail_count = 0
-    while True:
-        await asyncio.sleep(interval)
-        try:
-            db_manager = get_database_manager()
-            if db_manager._pool is not None:
-                async with db_manager._pool.acquire(timeout=10.0) as conn:
-                    await conn.fetchval("SELECT 1")
-                if fail_count > 0:
-                    logger.info(f"Pool heartbeat recovered after {fail_count} failures")
-                fail_count = 0
-                interval = 15
-        except asyncio.CancelledError:
-            break
-        except Exception as e:
-            fail_count += 1
-            if fail_count <= 3:
-                logger.warning(f"Pool heartbeat failed ({fail_count}): {type(e).__name__}: {e}")
-            elif fail_count == 4:
-                logger.warning(
-                    f"Pool heartbeat still failing ({fail_count}x), suppressing until recovery"
-                )
-            # Backoff: 15s → 30s → 60s → 120s max
-            interval = min(15 * (2 ** min(fail_count - 1, 3)), 120)
-
-
 async def _db_retry_loop(db_manager) -> None:
     """Background loop to retry DB connection after startup timeout."""
     delay = 5
@@ -92,6 +60,7 @@ async def _db_retry_loop(db_manager) -> None:
         try:
             await db_manager.connect()
             logger.info("Database connected (background retry)")
+            cache_bus.start(db_manager.database_url, db_manager.pool)
             return
         except asyncio.CancelledError:
             return
@@ -105,7 +74,7 @@ async def _db_retry_loop(db_manager) -> None:
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Handle startup and shutdown"""
-    global _start_time, _heartbeat_task, _pool_heartbeat_task, _db_retry_task
+    global _start_time, _heartbeat_task, _db_retry_task
     _start_time = time.time()
 
     settings = get_settings()
@@ -123,6 +92,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     try:
         await asyncio.wait_for(db_manager.connect(), timeout=30)
         logger.info("Database connected")
+        # Cross-process cache invalidation (keeps API workers and bots coherent)
+        cache_bus.start(settings.database_url, db_manager.pool)
     except TimeoutError:
         logger.warning("DB connection timed out during startup, retrying in background")
         _db_retry_task = asyncio.create_task(_db_retry_loop(db_manager))
@@ -137,20 +108,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         _heartbeat_task = asyncio.create_task(_heartbeat(settings.keep_alive_interval))
         logger.info(f"Heartbeat started (interval={settings.keep_alive_interval}s)")
 
-    # Start pool heartbeat to prevent Supavisor idle kills
-    _pool_heartbeat_task = asyncio.create_task(_pool_heartbeat_loop())
-
     yield
 
     # Shutdown
     logger.info("Shutting down Niibot API server")
     if _db_retry_task:
         _db_retry_task.cancel()
-    if _pool_heartbeat_task:
-        _pool_heartbeat_task.cancel()
     if _heartbeat_task:
         _heartbeat_task.cancel()
     try:
+        await cache_bus.stop()
         await close_twitch_api()
         await close_discord_api()
         await db_manager.disconnect()
@@ -226,9 +193,24 @@ def create_app() -> FastAPI:
             "version": "2.0.0",
             "uptime_seconds": int(time.time() - _start_time),
             "db_connected": db_ok,
+            "db_circuit": db_manager.breaker.stats() if db_manager is not None else None,
+            "db_pool": db_manager.pool_stats() if db_manager is not None else None,
             "environment": settings.environment,
         }
 
+    # Cache metrics (sizes, hit ratios, stale serves, lock waits, load latency)
+    @app.get("/status/caches")
+    async def caches():
+        """Per-cache metrics for this API worker"""
+        return cache_stats()
+
+    # Database metrics (pool wait, per-statement latency, timeouts, slow queries)
+    @app.get("/status/db")
+    async def db_metrics():
+        """Query metrics for this API worker's pool"""
+        db_manager = get_database_manager()
+        return db_manager.metrics_report() if db_manager is not None else None
+
     # Ping endpoint
     @app.api_route("/ping", methods=["GET", "HEAD"], response_class=PlainTextResponse)
     async def ping():
@@ -28,6 +28,8 @@ from core import (  # noqa: E402
     RateLimitMonitor,
     setup_logging,
 )
+from shared.cache_bus import cache_bus  # noqa: E402
+from shared.cache_snapshot import CacheSnapshot  # noqa: E402
 from shared.database import DatabaseManager, PoolConfig  # noqa: E402
 
 setup_logging()
@@ -53,7 +55,7 @@ class NiibotClient(commands.Bot):
         self._db_manager: DatabaseManager | None = None
         self.db_pool: asyncpg.Pool | None = None
         self._commands_synced: bool = False
-        self._heartbeat_task: asyncio.Task | None = None
+        self._cache_snapshot = CacheSnapshot.for_service("discord")
 
     async def setup_database(self, max_retries: int = 5, retry_delay: float = 5.0) -> None:
         """Initialize database connection pool"""
@@ -74,48 +76,17 @@ class NiibotClient(commands.Bot):
         )
         await self._db_manager.connect()
         self.db_pool = self._db_manager.pool
-        self._heartbeat_task = asyncio.create_task(self._pool_heartbeat_loop())
+        cache_bus.start(database_url, self.db_pool)
 
     async def close_database(self) -> None:
         """Close the database connection pool."""
-        if self._heartbeat_task is not None:
-            self._heartbeat_task.cancel()
-            self._heartbeat_task = None
+        await cache_bus.stop()
+        await self._cache_snapshot.stop()
         if self._db_manager is not None:
             await self._db_manager.disconnect()
             self._db_manager = None
             self.db_pool = None
 
-    async def _pool_heartbeat_loop(self) -> None:
-        """Periodically ping the DB pool to keep the idle connection alive.
-
-        Constraint chain: heartbeat(15s) < max_inactive(25s) < Supavisor(~30-60s).
-        On failure, backs off to avoid flooding logs and wasting connections.
-        """
-        interval = 15
-        fail_count = 0
-        while True:
-            await asyncio.sleep(interval)
-            try:
-                if self.db_pool is not None:
-                    async with self.db_pool.acquire(timeout=10.0) as conn:
-                        await conn.fetchval("SELECT 1")
-                    if fail_count > 0:
-                        logger.info(f"Pool heartbeat recovered after {fail_count} failures")
-                    fail_count = 0
-                    interval = 15
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                fail_count += 1
-                if fail_count <= 3:
-                    logger.warning(f"Pool heartbeat failed ({fail_count}): {type(e).__name__}: {e}")
-                elif fail_count == 4:
-                    logger.warning(
-                        f"Pool heartbeat still failing ({fail_count}x), suppressing until recovery"
-                    )
-                interval = min(15 * (2 ** min(fail_count - 1, 3)), 120)
-
     def _get_extensions(self) -> list[str]:
         """Scan cogs directory for loadable extensions"""
         if not COGS_DIR.exists():
@@ -150,6 +121,11 @@ class NiibotClient(commands.Bot):
         if failed:
             logger.error(f"[red]Failed to load:[/red] {', '.join(failed)}")
 
+        # Cogs register their repository caches on import: preload the
+        # last-known-good values from the previous run now
+        self._cache_snapshot.load()
+        self._cache_snapshot.start()
+
         guild_id = os.getenv("DISCORD_GUILD_ID")
         if guild_id:
             self._sync_guild_id = guild_id
@@ -11,6 +11,7 @@ from discord import app_commands
 from discord.ext import commands, tasks
 
 from core import DATA_DIR
+from shared.database import BACKGROUND, db_lane
 from shared.repositories.birthday import BirthdayRepository
 
 from .constants import BIRTHDAY_COLOR, BIRTHDAY_THUMBNAIL, TZ_UTC8
@@ -114,6 +115,7 @@ class BirthdayCog(commands.Cog):
     # ==================== Background Tasks ====================
 
     @tasks.loop(time=time(hour=16, minute=1))  # 00:01 UTC+8
+    @db_lane(BACKGROUND)
     async def birthday_notify_task(self) -> None:
         if not self._ready:
             return
@@ -183,6 +185,7 @@ class BirthdayCog(commands.Cog):
             logger.error(f"Error in birthday notify: {e}")
 
     @tasks.loop(time=time(hour=15, minute=59))  # 23:59 UTC+8
+    @db_lane(BACKGROUND)
     async def birthday_role_cleanup_task(self) -> None:
         if not self._ready:
             return
@@ -208,6 +211,7 @@ class BirthdayCog(commands.Cog):
             logger.error(f"Error in role cleanup: {e}")
 
     @tasks.loop(time=time(hour=16, minute=0))  # 00:00 UTC+8
+    @db_lane(BACKGROUND)
     async def monthly_birthday_list_task(self) -> None:
         """每月 1 日發送當月壽星名單"""
         if not self._ready:
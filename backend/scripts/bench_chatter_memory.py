@@ -0,0 +1,66 @@
+"""Compare chatter buffer memory: legacy dict-of-dicts vs ChatterTable.
+
+Measures the bytes allocated by each structure (via tracemalloc) after
+recording one message per chatter. User ID and username strings are created
+up front, because in the bot they come from the chat payload either way.
+
+Usage:
+    python scripts/bench_chatter_memory.py [N ...]   (default: 10000 100000 1000000)
+"""
+
+import gc
+import sys
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "twitch"))
+
+from core.chatter_table import ChatterTable  # noqa: E402
+
+
+def _measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def bench(n: int) -> None:
+    user_ids = [str(100_000_000 + i) for i in range(n)]
+    usernames = [f"chatter_{i}" for i in range(n)]
+
+    def legacy() -> dict:
+        buf: dict[str, dict] = {}
+        for uid, name in zip(user_ids, usernames, strict=True):
+            buf[uid] = {"username": name, "count": 1, "last_at": datetime.now()}
+        return buf
+
+    def compact() -> ChatterTable:
+        table = ChatterTable()
+        for uid, name in zip(user_ids, usernames, strict=True):
+            table.record(uid, name)
+        return table
+
+    legacy_bytes = _measure(legacy)
+    compact_bytes = _measure(compact)
+    print(
+        f"{n:>9,} chatters | legacy {legacy_bytes / 1e6:8.2f} MB "
+        f"({legacy_bytes / n:6.1f} B/chatter) | "
+        f"ChatterTable {compact_bytes / 1e6:8.2f} MB "
+        f"({compact_bytes / n:6.1f} B/chatter) | "
+        f"ratio {legacy_bytes / compact_bytes:4.1f}x"
+    )
+
+
+def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    for n in sizes:
+        bench(n)
+
+
+if __name__ == "__main__":
+    main()
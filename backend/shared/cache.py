@@ -1,7 +1,9 @@
 """In-process TTL cache with stale fallback for Niibot services.
 
 Uses cachetools.TTLCache for zero-infrastructure caching.
-Each service creates its own cache instances — no cross-process sharing.
+Each service creates its own cache instances. Named caches are kept coherent
+across processes by ``shared.cache_bus``: invalidations are published over
+PostgreSQL NOTIFY and applied by every service holding a cache of that name.
 
 When the database is unavailable, read operations fall back to stale
 (TTL-expired) cached values so the bot keeps running.
@@ -10,18 +12,150 @@ When the database is unavailable, read operations fall back to stale
 import asyncio
 import functools
 import logging
+import sys
+import time
 from collections import OrderedDict
-from collections.abc import Callable
-from typing import Any, TypeVar
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any, Generic, TypeVar
 
 from cachetools import TTLCache  # type: ignore[import-untyped]
 
+from shared.database import CircuitBreaker, CircuitOpenError, breaker_for_pool, is_outage_error
+
 logger = logging.getLogger(__name__)
 
 # Sentinel object to distinguish "not in cache" from cached None values
 _MISSING = object()
 
 F = TypeVar("F", bound=Callable[..., Any])
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Named caches, by name (for cross-process invalidation)
+_registry: dict[str, "AsyncTTLCache"] = {}
+
+# Called as publisher(cache_name, key, tag) on local invalidation; a key or a
+# tag is set, neither means the whole cache was cleared.
+# Installed by shared.cache_bus when the bus is running.
+Publisher = Callable[[str, str | None, str | None], None]
+_publisher: Publisher | None = None
+
+
+def set_invalidation_publisher(publisher: Publisher | None) -> None:
+    """Install (or remove, with None) the hook that publishes invalidations."""
+    global _publisher
+    _publisher = publisher
+
+
+def channel_tag(channel_id: str) -> str:
+    """Tag for entries that belong to one channel."""
+    return f"channel:{channel_id}"
+
+
+def channel_tags(_self: Any, channel_id: str, *args: Any, **kwargs: Any) -> tuple[str]:
+    """``tags_func`` for repository methods whose first argument is a channel id."""
+    return (channel_tag(channel_id),)
+
+
+def _breaker_for(args: tuple) -> CircuitBreaker | None:
+    """Breaker of the pool behind a repository method call (``self.pool``)."""
+    return breaker_for_pool(getattr(args[0], "pool", None)) if args else None
+
+
+def _report(breaker: CircuitBreaker | None, exc: BaseException | None = None) -> None:
+    """Feed a query outcome to *breaker*. Query errors still prove the DB is reachable."""
+    if breaker is None:
+        return
+    if exc is not None and is_outage_error(exc):
+        breaker.record_failure(exc)
+    else:
+        breaker.record_success()
+
+
+class CacheMetrics:
+    """Counters for one cache, exported by the services' status endpoints."""
+
+    __slots__ = (
+        "hits",
+        "misses",
+        "stale_served",
+        "refreshes",
+        "evictions",
+        "stale_evictions",
+        "lock_waits",
+        "lock_wait_total",
+        "lock_wait_max",
+        "loads",
+        "load_errors",
+        "load_total",
+        "load_max",
+    )
+
+    def __init__(self) -> None:
+        for field in self.__slots__:
+            setattr(self, field, 0)
+
+    def record_lock_wait(self, seconds: float) -> None:
+        # Only contended acquisitions count; an uncontended lock returns at once
+        if seconds >= 0.001:
+            self.lock_waits += 1
+            self.lock_wait_total += seconds
+            self.lock_wait_max = max(self.lock_wait_max, seconds)
+
+    def record_load(self, seconds: float, *, ok: bool) -> None:
+        self.loads += 1
+        if not ok:
+            self.load_errors += 1
+        self.load_total += seconds
+        self.load_max = max(self.load_max, seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "stale_served": self.stale_served,
+            "refreshes": self.refreshes,
+            "evictions": self.evictions,
+            "stale_evictions": self.stale_evictions,
+            "lock_waits": self.lock_waits,
+            "lock_wait_avg_ms": round(self.lock_wait_total / self.lock_waits * 1000, 2)
+            if self.lock_waits
+            else 0.0,
+            "lock_wait_max_ms": round(self.lock_wait_max * 1000, 2),
+            "loads": self.loads,
+            "load_errors": self.load_errors,
+            "load_avg_ms": round(self.load_total / self.loads * 1000, 2) if self.loads else 0.0,
+            "load_max_ms": round(self.load_max * 1000, 2),
+        }
+
+
+class _FreshTier(TTLCache):
+    """TTLCache that counts capacity evictions (TTL expiry is not counted)."""
+
+    def __init__(self, maxsize: int, ttl: float, metrics: CacheMetrics):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._metrics = metrics
+
+    def popitem(self) -> tuple[Any, Any]:
+        item = super().popitem()
+        self._metrics.evictions += 1
+        return item
+
+
+def get_cache(name: str) -> "AsyncTTLCache | None":
+    """Return the named cache registered in this process, if any."""
+    return _registry.get(name)
+
+
+def registered_caches() -> dict[str, "AsyncTTLCache"]:
+    return dict(_registry)
+
+
+def cache_stats() -> dict[str, dict[str, Any]]:
+    """Size and metrics of every named cache, by name (for status endpoints)."""
+    return {name: cache.stats() for name, cache in sorted(_registry.items())}
 
 
 class AsyncTTLCache:
@@ -32,49 +166,155 @@ class AsyncTTLCache:
       2. ``_stale`` (OrderedDict, LRU, bounded by *maxsize*) — last-known-good
          values that survive TTL expiry.  Used **only** when the upstream source
          (DB) is unreachable.
+
+    Entries may carry tags (e.g. ``channel_tag(channel_id)``) so that all
+    entries of one channel can be dropped with ``invalidate_tag()`` without
+    touching other channels. The tag index follows the stale tier, so it is
+    bounded by *maxsize* as well; a key evicted from the stale tier is
+    dropped from the fresh tier too, so every fresh entry stays indexed.
+
+    *ttl* is the hard TTL. ``cached(..., soft_ttl=...)`` can serve entries
+    older than a shorter soft TTL while one background refresh runs.
+
+    Named caches with *persist* (the default) have their stale tier saved
+    to disk by ``shared.cache_snapshot``; pass ``persist=False`` for
+    secrets such as OAuth tokens.
     """
 
-    def __init__(self, maxsize: int = 128, ttl: float = 60.0):
+    def __init__(
+        self,
+        maxsize: int = 128,
+        ttl: float = 60.0,
+        *,
+        name: str | None = None,
+        persist: bool = True,
+    ):
+        self._init_common(ttl, name, persist)
         self._maxsize = maxsize
-        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._cache: TTLCache = _FreshTier(maxsize, ttl, self.metrics)
         self._stale: OrderedDict[str, Any] = OrderedDict()
+
+    def _init_common(self, ttl: float, name: str | None, persist: bool) -> None:
+        """State shared with PartitionedTTLCache (everything but the storage)."""
+        self.name = name
+        self.persist = persist
+        if name is not None:
+            if name in _registry:
+                logger.warning("Cache name %r registered twice; the last one wins", name)
+            _registry[name] = self
+        self._ttl = ttl
+        self.metrics = CacheMetrics()
         self._locks: dict[str, asyncio.Lock] = {}
+        self._tags: dict[str, set[str]] = {}  # tag -> keys
+        self._key_tags: dict[str, tuple[str, ...]] = {}  # key -> tags
+        self._written: dict[str, float] = {}  # key -> monotonic write time
+        # key -> background refresh. Invalidating a key unregisters its
+        # refresh, so one that read pre-invalidation data does not write it back
+        self._refreshing: dict[str, asyncio.Task] = {}
 
     # --- lock management (bounded) ---
 
     def _get_lock(self, key: str) -> asyncio.Lock:
         if key not in self._locks:
             self._locks[key] = asyncio.Lock()
-            # Prune locks that no longer have a corresponding stale entry
-            if len(self._locks) > self._maxsize * 2:
-                stale_keys = set(self._stale)
+            # Prune locks that no longer have a corresponding entry
+            if len(self._locks) > max(self._maxsize, self.stale_size) * 2:
                 for k in list(self._locks):
-                    if k not in stale_keys and k not in self._cache:
+                    if k != key and not self._contains(k):
                         del self._locks[k]
         return self._locks[key]
 
+    def _contains(self, key: str) -> bool:
+        return key in self._stale or key in self._cache
+
     # --- primary (fresh) operations ---
 
     def get(self, key: str) -> Any:
         """Return fresh value or ``_MISSING``."""
-        return self._cache.get(key, _MISSING)
+        value = self._cache.get(key, _MISSING)
+        if value is not _MISSING:
+            # Hot keys stay at the recent end of the stale LRU, keeping their
+            # write time (soft TTL) and stale fallback
+            self._stale.move_to_end(key)
+        return value
 
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()) -> None:
         """Write to both fresh cache and stale store."""
         self._cache[key] = value
         # Update stale store (LRU: move to end)
         self._stale[key] = value
         self._stale.move_to_end(key)
-        while len(self._stale) > self._maxsize:
-            self._stale.popitem(last=False)
+        self._written[key] = time.monotonic()
+        self._index(key, tuple(tags))
+        self._evict_stale()
 
-    def invalidate(self, key: str) -> None:
-        """Remove from fresh cache; stale store keeps the value."""
+    def _evict_stale(self) -> None:
+        while len(self._stale) > self._maxsize:
+            evicted, _ = self._stale.popitem(last=False)
+            # The tag index and write times follow the stale tier, so a key
+            # leaving it leaves the fresh tier too; otherwise it would stay
+            # readable but unreachable by invalidate_tag()
+            self._cache.pop(evicted, None)
+            self._written.pop(evicted, None)
+            self._unindex(evicted)
+            self.metrics.stale_evictions += 1
+
+    def age(self, key: str) -> float:
+        """Seconds since *key* was last written (0.0 if unknown)."""
+        written = self._written.get(key)
+        return 0.0 if written is None else time.monotonic() - written
+
+    # --- tag index ---
+
+    def _index(self, key: str, tags: tuple[str, ...]) -> None:
+        if self._key_tags.get(key, ()) == tags:
+            return
+        self._unindex(key)
+        if tags:
+            self._key_tags[key] = tags
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+    def _unindex(self, key: str) -> None:
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate_tag(self, tag: str, *, publish: bool = True) -> int:
+        """Remove every fresh entry carrying *tag*; stale store keeps the values.
+
+        Runs in O(entries with that tag). Returns the number of entries dropped.
+        """
+        dropped = 0
+        for key in self._tags.get(tag, ()):
+            self._refreshing.pop(key, None)
+            if self._cache.pop(key, _MISSING) is not _MISSING:
+                dropped += 1
+        if publish and self.name is not None and _publisher is not None:
+            _publisher(self.name, None, tag)
+        return dropped
+
+    def invalidate(self, key: str, *, publish: bool = True) -> None:
+        """Remove from fresh cache; stale store keeps the value.
+
+        For a named cache, the invalidation is also published to other
+        processes unless *publish* is False (e.g. when reacting to a
+        notification rather than to a local write).
+        """
+        self._refreshing.pop(key, None)
         self._cache.pop(key, None)
+        if publish and self.name is not None and _publisher is not None:
+            _publisher(self.name, key, None)
 
-    def clear(self) -> None:
+    def clear(self, *, publish: bool = True) -> None:
         """Clear fresh cache; stale store is preserved."""
+        self._refreshing.clear()
         self._cache.clear()
+        if publish and self.name is not None and _publisher is not None:
+            _publisher(self.name, None, None)
 
     # --- stale fallback ---
 
@@ -85,6 +325,27 @@ class AsyncTTLCache:
             self._stale.move_to_end(key)  # refresh LRU position
         return value
 
+    # --- snapshot (see shared.cache_snapshot) ---
+
+    def snapshot(self) -> list[tuple[str, Any, tuple[str, ...]]]:
+        """``(key, value, tags)`` of the stale tier, least recently used first."""
+        return [(k, v, self._key_tags.get(k, ())) for k, v in self._stale.items()]
+
+    def preload(self, entries: Iterable[tuple[str, Any, tuple[str, ...]]]) -> int:
+        """Seed the stale tier from a snapshot. Returns the number of entries added.
+
+        Keys already present are kept, and preloaded entries rank as least
+        recently used, so live values always win. The fresh tier is not
+        touched: reads still try the database first.
+        """
+        added = [(k, v, tags) for k, v, tags in entries if k not in self._stale]
+        for key, value, tags in reversed(added):
+            self._stale[key] = value
+            self._stale.move_to_end(key, last=False)
+            self._index(key, tuple(tags))
+        self._evict_stale()
+        return min(len(added), self._maxsize)
+
     @property
     def size(self) -> int:
         return len(self._cache)
@@ -93,11 +354,232 @@ class AsyncTTLCache:
     def stale_size(self) -> int:
         return len(self._stale)
 
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": self.size,
+            "maxsize": self._maxsize,
+            "ttl": self._ttl,
+            "stale_size": self.stale_size,
+            "tags": len(self._tags),
+            **self.metrics.as_dict(),
+        }
+
+
+def estimate_size(obj: Any, _depth: int = 0) -> int:
+    """Approximate deep size of a cached value in bytes (containers, dataclasses)."""
+    size = sys.getsizeof(obj)
+    if _depth >= 4:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(v, _depth + 1) for v in obj)
+    if hasattr(obj, "__dict__"):
+        return size + estimate_size(vars(obj), _depth + 1)
+    slots = getattr(type(obj), "__slots__", None)
+    if slots and not isinstance(obj, (str, bytes)):
+        return size + sum(estimate_size(getattr(obj, s, None), _depth + 1) for s in slots)
+    return size
+
+
+class _Partition:
+    __slots__ = ("entries", "bytes")
+
+    def __init__(self) -> None:
+        # key -> [value, size, expires_at]; LRU order (least recent first)
+        self.entries: OrderedDict[str, list[Any]] = OrderedDict()
+        self.bytes = 0
+
+
+class PartitionedTTLCache(AsyncTTLCache):
+    """AsyncTTLCache partitioned by channel under a global byte budget.
+
+    Entries are grouped by their first tag (``channel_tag(channel_id)``;
+    untagged entries share one partition) and sized with ``estimate_size()``.
+    Fresh and stale values live in the same entry: an expired or invalidated
+    entry is stale until evicted. When the total exceeds *max_bytes*, the
+    least recently used entry of the **largest** partition is evicted. A
+    partition within its fair share (``max_bytes / partitions``) is
+    therefore never evicted to make room for another one: warming a big
+    channel only pushes out that channel's own entries (or those of an even
+    bigger one).
+
+    Drop-in for ``AsyncTTLCache`` with ``cached`` and the cache bus.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 4 * 1024 * 1024,
+        ttl: float = 60.0,
+        *,
+        name: str | None = None,
+        persist: bool = True,
+    ):
+        self._init_common(ttl, name, persist)
+        self._maxsize = 0  # no entry-count bound; see max_bytes
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._partitions: dict[str, _Partition] = {}
+        self._key_partition: dict[str, str] = {}
+
+    def _contains(self, key: str) -> bool:
+        return key in self._key_partition
+
+    def _entry(self, key: str) -> list[Any] | None:
+        pid = self._key_partition.get(key)
+        return None if pid is None else self._partitions[pid].entries[key]
+
+    # --- storage ---
+
+    def get(self, key: str) -> Any:
+        """Return fresh value or ``_MISSING``."""
+        entry = self._entry(key)
+        if entry is None or entry[2] <= time.monotonic():
+            return _MISSING
+        self._partitions[self._key_partition[key]].entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()) -> None:
+        """Store a fresh value in the key's channel partition."""
+        tags = tuple(tags)
+        self._insert(key, value, tags, time.monotonic() + self._ttl, recent=True)
+        self._written[key] = time.monotonic()
+        self._evict()
+
+    def _insert(
+        self, key: str, value: Any, tags: tuple[str, ...], expires_at: float, *, recent: bool
+    ) -> None:
+        self._remove(key)
+        pid = tags[0] if tags else ""
+        partition = self._partitions.get(pid)
+        if partition is None:
+            partition = self._partitions[pid] = _Partition()
+        size = estimate_size(key) + estimate_size(value)
+        partition.entries[key] = [value, size, expires_at]
+        partition.entries.move_to_end(key, last=recent)
+        partition.bytes += size
+        self._bytes += size
+        self._key_partition[key] = pid
+        self._index(key, tags)
+
+    def _remove(self, key: str) -> None:
+        pid = self._key_partition.pop(key, None)
+        if pid is None:
+            return
+        partition = self._partitions[pid]
+        _, size, _ = partition.entries.pop(key)
+        partition.bytes -= size
+        self._bytes -= size
+        if not partition.entries:
+            del self._partitions[pid]
+        self._written.pop(key, None)
+        self._unindex(key)
+
+    def _evict(self) -> None:
+        while self._bytes > self._max_bytes and self._partitions:
+            largest = max(self._partitions.values(), key=lambda p: p.bytes)
+            victim = next(iter(largest.entries))
+            self._remove(victim)
+            self.metrics.evictions += 1
+
+    # --- invalidation (values stay available as stale) ---
+
+    def _expire(self, key: str) -> bool:
+        entry = self._entry(key)
+        if entry is None or entry[2] <= time.monotonic():
+            return False
+        entry[2] = 0.0
+        return True
+
+    def invalidate_tag(self, tag: str, *, publish: bool = True) -> int:
+        """Expire every entry carrying *tag*; values stay available as stale."""
+        dropped = 0
+        for key in list(self._tags.get(tag, ())):
+            self._refreshing.pop(key, None)
+            dropped += self._expire(key)
+        if publish and self.name is not None and _publisher is not None:
+            _publisher(self.name, None, tag)
+        return dropped
+
+    def invalidate(self, key: str, *, publish: bool = True) -> None:
+        """Expire *key*; the value stays available as stale."""
+        self._refreshing.pop(key, None)
+        self._expire(key)
+        if publish and self.name is not None and _publisher is not None:
+            _publisher(self.name, key, None)
+
+    def clear(self, *, publish: bool = True) -> None:
+        """Expire every entry; values stay available as stale."""
+        self._refreshing.clear()
+        for partition in self._partitions.values():
+            for entry in partition.entries.values():
+                entry[2] = 0.0
+        if publish and self.name is not None and _publisher is not None:
+            _publisher(self.name, None, None)
+
+    def get_stale(self, key: str) -> Any:
+        """Return last-known-good value or ``_MISSING``."""
+        entry = self._entry(key)
+        if entry is None:
+            return _MISSING
+        self._partitions[self._key_partition[key]].entries.move_to_end(key)
+        return entry[0]
+
+    # --- snapshot ---
+
+    def snapshot(self) -> list[tuple[str, Any, tuple[str, ...]]]:
+        return [
+            (key, entry[0], self._key_tags.get(key, ()))
+            for partition in self._partitions.values()
+            for key, entry in partition.entries.items()
+        ]
+
+    def preload(self, entries: Iterable[tuple[str, Any, tuple[str, ...]]]) -> int:
+        """Seed stale entries from a snapshot (least recently used, live values win)."""
+        added = 0
+        for key, value, tags in entries:
+            if key not in self._key_partition:
+                self._insert(key, value, tuple(tags), 0.0, recent=False)
+                added += 1
+        self._evict()
+        return added
+
+    # --- introspection ---
+
+    @property
+    def size(self) -> int:
+        now = time.monotonic()
+        return sum(
+            1 for p in self._partitions.values() for entry in p.entries.values() if entry[2] > now
+        )
+
+    @property
+    def stale_size(self) -> int:
+        return len(self._key_partition)
+
+    def stats(self) -> dict[str, Any]:
+        largest = sorted(self._partitions.items(), key=lambda kv: -kv[1].bytes)[:5]
+        return {
+            "size": self.size,
+            "ttl": self._ttl,
+            "stale_size": self.stale_size,
+            "tags": len(self._tags),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "partitions": len(self._partitions),
+            "largest_partitions": {pid or "(untagged)": p.bytes for pid, p in largest},
+            **self.metrics.as_dict(),
+        }
+
 
 def cached(
     cache: AsyncTTLCache,
     key_func: Callable[..., str],
     *,
+    tags_func: Callable[..., Iterable[str]] | None = None,
+    soft_ttl: float | None = None,
     retry: int = 2,
 ):
     """Decorator for caching async function results with DB resilience.
@@ -109,6 +591,15 @@ def cached(
     key_func : callable
         Receives the same ``(*args, **kwargs)`` as the decorated function
         and returns the cache key string.
+    tags_func : callable, optional
+        Same arguments as *key_func*; returns the tags stored with the entry
+        (e.g. ``(channel_tag(channel_id),)``) for ``invalidate_tag()``.
+    soft_ttl : float, optional
+        Enables stale-while-revalidate. A hit older than *soft_ttl* seconds
+        is returned at once and a single background refresh is scheduled for
+        the key; callers only wait on a true miss or after the cache's own
+        (hard) *ttl* has expired the entry. A failed refresh keeps the
+        current value until the hard TTL.
     retry : int
         Max number of attempts on DB failure (default 2).
 
@@ -117,35 +608,104 @@ def cached(
     After *retry* attempts, the decorator checks the **stale** store.
     If a stale value exists it is returned with a warning log.
     Otherwise the original exception is re-raised.
+
+    Outcomes are fed to the circuit breaker of the repository's pool
+    (``self.pool``, see ``shared.database.CircuitBreaker``). While it is
+    open, misses skip the database and the retry sleeps entirely: they get
+    the stale value, or ``CircuitOpenError`` when there is none.
     """
 
+    metrics = cache.metrics
+
     def decorator(func: F) -> F:
+        async def refresh(
+            cache_key: str, args: tuple, kwargs: dict, breaker: CircuitBreaker | None
+        ) -> None:
+            task = asyncio.current_task()
+            started = time.monotonic()
+            try:
+                result = await func(*args, **kwargs)
+                metrics.record_load(time.monotonic() - started, ok=True)
+                _report(breaker)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                metrics.record_load(time.monotonic() - started, ok=False)
+                _report(breaker, exc)
+                logger.warning(
+                    "Background refresh failed for %s: %s", cache_key, type(exc).__name__
+                )
+            else:
+                # Still registered: the key was not invalidated meanwhile
+                if cache._refreshing.get(cache_key) is task:
+                    tags = tags_func(*args, **kwargs) if tags_func else ()
+                    cache.set(cache_key, result, tags)
+            finally:
+                if cache._refreshing.get(cache_key) is task:
+                    del cache._refreshing[cache_key]
+
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
             cache_key = key_func(*args, **kwargs)
 
-            # 1. Fast path — fresh cache hit
+            # 1. Fast path — fresh cache hit (revalidated in the background
+            #    once older than soft_ttl)
             result = cache.get(cache_key)
             if result is not _MISSING:
+                metrics.hits += 1
+                if (
+                    soft_ttl is not None
+                    and cache_key not in cache._refreshing
+                    and cache.age(cache_key) > soft_ttl
+                ):
+                    breaker = _breaker_for(args)
+                    if breaker is None or breaker.allow_request():
+                        metrics.refreshes += 1
+                        cache._refreshing[cache_key] = asyncio.create_task(
+                            refresh(cache_key, args, kwargs, breaker)
+                        )
                 return result
 
-            # 2. Slow path with lock (double-checked locking)
+            # 2. Circuit open — serve stale without touching the DB or waiting
+            breaker = _breaker_for(args)
+            if breaker is not None and not breaker.allow_request():
+                stale = cache.get_stale(cache_key)
+                if stale is not _MISSING:
+                    metrics.stale_served += 1
+                    logger.debug("Circuit open, returning stale data for %s", cache_key)
+                    return stale
+                raise CircuitOpenError(f"Database circuit open, no cached value for {cache_key}")
+
+            # 3. Slow path with lock (double-checked locking)
+            waiting = time.monotonic()
             async with cache._get_lock(cache_key):
+                metrics.record_lock_wait(time.monotonic() - waiting)
                 result = cache.get(cache_key)
                 if result is not _MISSING:
+                    # Loaded by the caller we waited for
+                    metrics.hits += 1
                     return result
+                metrics.misses += 1
 
-                # 3. Try DB with retry
+                # 4. Try DB with retry (stops early once the breaker opens)
                 last_exc: BaseException | None = None
                 for attempt in range(1, retry + 1):
+                    started = time.monotonic()
                     try:
                         result = await func(*args, **kwargs)
-                        cache.set(cache_key, result)
+                        metrics.record_load(time.monotonic() - started, ok=True)
+                        _report(breaker)
+                        tags = tags_func(*args, **kwargs) if tags_func else ()
+                        cache.set(cache_key, result, tags)
                         return result
                     except asyncio.CancelledError:
                         raise
                     except Exception as exc:
+                        metrics.record_load(time.monotonic() - started, ok=False)
                         last_exc = exc
+                        _report(breaker, exc)
+                        if breaker is not None and breaker.is_open:
+                            break
                         if attempt < retry:
                             delay = 1.0 * attempt
                             logger.warning(
@@ -158,9 +718,10 @@ def cached(
                             )
                             await asyncio.sleep(delay)
 
-                # 4. All retries exhausted — try stale fallback
+                # 5. All retries exhausted — try stale fallback
                 stale = cache.get_stale(cache_key)
                 if stale is not _MISSING:
+                    metrics.stale_served += 1
                     logger.warning(
                         "Returning stale data for %s (%s)",
                         cache_key,
@@ -168,10 +729,79 @@ def cached(
                     )
                     return stale
 
-                # 5. No stale data — propagate the error
+                # 6. No stale data — propagate the error
                 raise last_exc  # type: ignore[misc]
 
         wrapper.cache = cache  # type: ignore[attr-defined]
         return wrapper  # type: ignore[return-value]
 
     return decorator
+
+
+class BatchLoader(Generic[K, V]):
+    """Coalesces loads issued within one event-loop tick into one batch query.
+
+    ``load_many(keys)`` receives the distinct keys requested during the tick
+    (at most *max_batch*) and returns ``{key: value}``; keys it leaves out
+    resolve to None. Meant to sit *under* ``cached`` so that locking, retry,
+    stale fallback and storing stay per key::
+
+        self._loader = BatchLoader(self._fetch_channels)
+
+        @cached(cache=_channel_cache, key_func=...)
+        async def get_channel(self, channel_id):
+            return await self._loader.load(channel_id)
+
+    A failed batch raises the same exception in every waiter.
+    """
+
+    def __init__(
+        self,
+        load_many: Callable[[list[K]], Awaitable[dict[K, V]]],
+        *,
+        max_batch: int = 100,
+    ):
+        self._load_many = load_many
+        self._max_batch = max_batch
+        self._pending: dict[K, asyncio.Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+        self.keys_loaded = 0
+
+    async def load(self, key: K) -> V | None:
+        """Load one key, sharing the query with other keys requested this tick."""
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self._max_batch:
+                self._dispatch()
+        # Shielded: one cancelled caller must not cancel the load for the others
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        task = asyncio.get_running_loop().create_task(self._run(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: dict[K, asyncio.Future]) -> None:
+        self.batches += 1
+        self.keys_loaded += len(pending)
+        try:
+            results = await self._load_many(list(pending))
+        except BaseException as exc:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(exc)
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            return
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(key))
@@ -0,0 +1,228 @@
+"""Cross-process invalidation bus for named AsyncTTLCache instances.
+
+Invalidations (keys, tags or full clears) on a named cache
+(``AsyncTTLCache(..., name=...)``) are applied locally at once, batched per
+event-loop tick, and published on the ``cache_invalidate`` NOTIFY channel. Every service runs a listener that
+applies invalidations from other processes to its own cache of the same name,
+so an API write reaches the Twitch bot, the Discord bot and every API worker.
+
+Usage (once per process, after the pool is connected)::
+
+    from shared.cache_bus import cache_bus
+
+    cache_bus.start(database_url, pool)
+    ...
+    await cache_bus.stop()
+
+A process that already runs a ``PgListener`` passes it as ``listener=`` so
+the bus shares that LISTEN connection instead of opening its own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import Iterator
+from typing import Any
+
+import asyncpg
+
+from shared.cache import get_cache, registered_caches, set_invalidation_publisher
+from shared.pg_listener import PgListener
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache_invalidate"
+
+# PostgreSQL NOTIFY payloads are limited to 8000 bytes
+_MAX_PAYLOAD = 7900
+
+
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"))
+
+
+class CacheBus:
+    """Publishes local cache invalidations and applies remote ones."""
+
+    # Resyncs closer together than this are folded into one (see resync())
+    RESYNC_MIN_INTERVAL = 30.0
+
+    def __init__(self) -> None:
+        # Unique per process, so a process ignores its own notifications
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._pool: asyncpg.Pool | None = None
+        # cache name -> (keys, tags) to publish; None = whole cache cleared
+        self._pending: dict[str, tuple[set[str], set[str]] | None] = {}
+        self._flush_scheduled = False
+        # Listener started (and stopped) by the bus itself; None when shared
+        self._own_listener: PgListener | None = None
+        self._last_resync = float("-inf")
+        self._resync_handle: asyncio.TimerHandle | None = None
+        self.published = 0
+        self.applied = 0
+        self.resyncs = 0
+
+    @property
+    def running(self) -> bool:
+        return self._pool is not None
+
+    def start(self, dsn: str, pool: asyncpg.Pool, *, listener: PgListener | None = None) -> None:
+        """Start publishing through *pool* and listening for other processes.
+
+        With *listener*, the bus registers on it and its owner starts and
+        stops it; otherwise the bus runs its own ``PgListener`` on *dsn*.
+        """
+        if self._pool is not None:
+            return
+        self._pool = pool
+        set_invalidation_publisher(self._enqueue)
+        if listener is None:
+            listener = self._own_listener = PgListener(dsn)
+        listener.add(CHANNEL, self.handle_notification).on_reconnect(self.resync)
+        if self._own_listener is not None:
+            self._own_listener.start()
+        logger.info(f"Cache bus started ({len(registered_caches())} named caches)")
+
+    async def stop(self) -> None:
+        """Publish what is pending, then stop listening."""
+        set_invalidation_publisher(None)
+        await self.flush()
+        if self._resync_handle is not None:
+            self._resync_handle.cancel()
+            self._resync_handle = None
+        if self._own_listener is not None:
+            await self._own_listener.stop()
+            self._own_listener = None
+        self._pool = None
+
+    # ── Publishing ───────────────────────────────────────────────────
+
+    def _enqueue(self, cache_name: str, key: str | None, tag: str | None) -> None:
+        if key is None and tag is None:
+            self._pending[cache_name] = None
+        else:
+            entry = self._pending.setdefault(cache_name, (set(), set()))
+            if entry is not None:
+                if key is not None:
+                    entry[0].add(key)
+                else:
+                    entry[1].add(tag)  # type: ignore[arg-type]
+
+        if not self._flush_scheduled:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # no loop: published with the next flush
+            self._flush_scheduled = True
+            loop.create_task(self.flush())
+
+    def _encode(self, pending: dict[str, tuple[set[str], set[str]] | None]) -> Iterator[str]:
+        """Yield NOTIFY payloads, splitting large key/tag sets below the size limit."""
+        for name, entry in pending.items():
+            base = {"o": self.origin, "c": name}
+            if entry is None:
+                yield _dumps({**base, "all": True})
+                continue
+            for field, values in zip(("k", "t"), entry, strict=True):
+                overhead = len(_dumps({**base, field: []}).encode())
+                batch: list[str] = []
+                size = overhead
+                for value in values:
+                    value_size = len(_dumps(value).encode()) + 1
+                    if batch and size + value_size > _MAX_PAYLOAD:
+                        yield _dumps({**base, field: batch})
+                        batch, size = [], overhead
+                    batch.append(value)
+                    size += value_size
+                if batch:
+                    yield _dumps({**base, field: batch})
+
+    async def flush(self) -> None:
+        """Publish all pending invalidations."""
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, {}
+        if not pending or self._pool is None:
+            return
+
+        payloads = list(self._encode(pending))
+        try:
+            async with self._pool.acquire() as conn:
+                for payload in payloads:
+                    await conn.execute("SELECT pg_notify($1, $2)", CHANNEL, payload)
+            self.published += len(payloads)
+        except Exception as e:
+            # Other processes fall back to TTL expiry for these keys
+            logger.warning(
+                f"Cache bus publish failed ({len(payloads)} messages): {type(e).__name__}: {e}"
+            )
+
+    # ── Receiving ────────────────────────────────────────────────────
+
+    def apply(self, payload: str) -> None:
+        """Apply one invalidation message from another process."""
+        try:
+            data: dict[str, Any] = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Cache bus: malformed payload {payload[:100]!r}")
+            return
+        if data.get("o") == self.origin:
+            return
+        cache = get_cache(data.get("c", ""))
+        if cache is None:
+            return  # cache not used by this service
+        if data.get("all"):
+            cache.clear(publish=False)
+        else:
+            for key in data.get("k", ()):
+                cache.invalidate(key, publish=False)
+            for tag in data.get("t", ()):
+                cache.invalidate_tag(tag, publish=False)
+        self.applied += 1
+
+    def handle_notification(self, connection, pid, channel, payload) -> None:
+        """asyncpg listener callback ``(connection, pid, channel, payload)``."""
+        self.apply(payload)
+
+    def resync(self) -> None:
+        """Expire every entry of every named cache; values stay available as stale.
+
+        Called after a LISTEN reconnect: notifications sent while the
+        connection was down are lost, so any entry may be out of date. Every
+        entry is then reloaded on its next use, which after a reconnect
+        (usually a pooler restart, seen by all services at once) is a burst
+        of database loads. A flapping connection would repeat that burst on
+        every reconnect, so resyncs less than ``RESYNC_MIN_INTERVAL`` apart
+        are folded into one that runs when the interval is up.
+        """
+        wait = self._last_resync + self.RESYNC_MIN_INTERVAL - time.monotonic()
+        if wait <= 0:
+            self._resync()
+        elif self._resync_handle is None:
+            self._resync_handle = asyncio.get_running_loop().call_later(wait, self._resync)
+
+    def _resync(self) -> None:
+        self._resync_handle = None
+        self._last_resync = time.monotonic()
+        self.resyncs += 1
+        for cache in registered_caches().values():
+            cache.clear(publish=False)
+        logger.info("Cache bus resynced: expired every named cache")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "published": self.published,
+            "applied": self.applied,
+            "resyncs": self.resyncs,
+            "pending": len(self._pending),
+        }
+
+
+# Process-wide bus instance
+cache_bus = CacheBus()
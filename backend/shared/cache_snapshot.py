@@ -0,0 +1,202 @@
+"""On-disk snapshot of the stale tier of named AsyncTTLCache instances.
+
+The stale tier only covers values read since the process started, so a
+service that boots while the database is unreachable has nothing to fall
+back on. A snapshot of every named cache's stale tier is written on a
+schedule and at shutdown, and preloaded into the stale tier at the next
+start: reads still go to the database first, but an outage is answered with
+the last-known-good values instead of errors.
+
+File format: an 8-byte header (``_MAGIC`` + big-endian version) followed by
+a pickle of ``{"saved_at": float, "caches": {name: bytes}}``, where each
+cache is pickled separately as ``[(key, value, tags)]`` so that one cache
+with unpicklable values does not cost the others.
+A file with a different header is ignored, so bump ``SNAPSHOT_VERSION`` when
+a cached model changes incompatibly.
+
+Snapshots are unpickled, so they live in a service-owned directory
+(``backend/data/cache``, or ``NIIBOT_CACHE_DIR``) and are only loaded when
+owned by the current user and not writable by group or others.
+
+Usage (once per process, before the pool is connected)::
+
+    from shared.cache_snapshot import CacheSnapshot
+
+    snapshot = CacheSnapshot.for_service("twitch")
+    snapshot.load()
+    snapshot.start()
+    ...
+    await snapshot.stop()  # writes a final snapshot
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import pickle
+import stat
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from shared.cache import registered_caches
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+_MAGIC = b"NIIC"
+_HEADER = struct.Struct(">4sI")
+
+# backend/data/cache unless NIIBOT_CACHE_DIR is set
+_DEFAULT_DIR = Path(__file__).resolve().parent.parent / "data" / "cache"
+
+
+def _trusted(f: Any) -> str | None:
+    """Reason not to unpickle the open file *f*, or None if it is safe."""
+    st = os.fstat(f.fileno())
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        return f"owned by uid {st.st_uid}"
+    if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return "writable by group or others"
+    return None
+
+
+class CacheSnapshot:
+    """Periodically persists the stale tier of named caches to *path*.
+
+    Args:
+        path: Snapshot file. Written atomically (temp file + rename).
+        interval: Seconds between scheduled snapshots.
+        max_age: Snapshots older than this many seconds are not loaded.
+    """
+
+    def __init__(self, path: str | Path, *, interval: float = 300.0, max_age: float = 86400.0):
+        self.path = Path(path)
+        self.interval = interval
+        self.max_age = max_age
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def for_service(cls, service: str, **kwargs: Any) -> CacheSnapshot:
+        """Snapshot in the service's cache directory, one file per service."""
+        directory = Path(os.getenv("NIIBOT_CACHE_DIR") or _DEFAULT_DIR)
+        return cls(directory / f"niibot-{service}-cache.snapshot", **kwargs)
+
+    # ── Load ─────────────────────────────────────────────────────────
+
+    def load(self) -> int:
+        """Preload the snapshot into the stale tiers. Returns entries loaded."""
+        try:
+            with open(self.path, "rb") as f:
+                # Checked on the open file, so it cannot be swapped in between
+                untrusted = _trusted(f)
+                if untrusted is not None:
+                    logger.warning(f"Cache snapshot {self.path} {untrusted}, ignoring")
+                    return 0
+                data = f.read()
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            logger.warning(f"Cache snapshot unreadable ({self.path}): {e}")
+            return 0
+
+        if len(data) < _HEADER.size or _HEADER.unpack_from(data) != (_MAGIC, SNAPSHOT_VERSION):
+            logger.info(f"Cache snapshot {self.path} has another format version, ignoring")
+            return 0
+        try:
+            payload: dict[str, Any] = pickle.loads(data[_HEADER.size :])
+        except Exception as e:
+            logger.warning(f"Cache snapshot corrupt ({self.path}): {type(e).__name__}: {e}")
+            return 0
+
+        age = time.time() - payload.get("saved_at", 0.0)
+        if age > self.max_age:
+            logger.info(f"Cache snapshot is {age / 3600:.1f}h old, ignoring")
+            return 0
+
+        caches = registered_caches()
+        loaded = 0
+        for name, blob in payload.get("caches", {}).items():
+            cache = caches.get(name)
+            if cache is None or not cache.persist:
+                continue
+            try:
+                loaded += cache.preload(pickle.loads(blob))
+            except Exception as e:
+                logger.warning(f"Cache snapshot: skipping '{name}': {type(e).__name__}: {e}")
+        logger.info(f"Preloaded {loaded} stale cache entries from snapshot ({age:.0f}s old)")
+        return loaded
+
+    # ── Save ─────────────────────────────────────────────────────────
+
+    def _collect(self) -> dict[str, Any]:
+        # Copied on the event loop; pickling happens in a worker thread
+        return {
+            "saved_at": time.time(),
+            "caches": {
+                name: cache.snapshot()
+                for name, cache in registered_caches().items()
+                if cache.persist and cache.stale_size
+            },
+        }
+
+    def _write(self, payload: dict[str, Any]) -> int:
+        caches: dict[str, bytes] = {}
+        for name, entries in payload["caches"].items():
+            try:
+                caches[name] = pickle.dumps(entries, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                logger.debug(f"Cache snapshot: '{name}' not picklable: {type(e).__name__}: {e}")
+        body = pickle.dumps(
+            {"saved_at": payload["saved_at"], "caches": caches},
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, SNAPSHOT_VERSION))
+                f.write(body)
+            os.replace(tmp, self.path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return _HEADER.size + len(body)
+
+    async def save(self) -> None:
+        """Write a snapshot of every persistable named cache."""
+        payload = self._collect()
+        entries = sum(len(v) for v in payload["caches"].values())
+        if not entries:
+            return  # never replace a good snapshot with an empty one
+        try:
+            size = await asyncio.to_thread(self._write, payload)
+            logger.debug(f"Cache snapshot saved: {entries} entries, {size} bytes")
+        except Exception as e:
+            logger.warning(f"Cache snapshot save failed ({self.path}): {type(e).__name__}: {e}")
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Save a snapshot every *interval* seconds."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._save_loop())
+
+    async def _save_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.save()
+
+    async def stop(self) -> None:
+        """Stop the schedule and write a final snapshot."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.save()
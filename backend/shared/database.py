@@ -8,10 +8,18 @@ Supabase connection modes:
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
+import os
+import re
 import socket
 import ssl as _ssl
-from collections.abc import AsyncGenerator
+import time
+import weakref
+from bisect import bisect_left
+from collections import deque
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextvars import ContextVar
 from dataclasses import dataclass, fields
 from typing import Any, ClassVar
 from urllib.parse import urlparse
@@ -19,6 +27,7 @@ from urllib.parse import urlparse
 import asyncpg
 
 logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger(f"{__name__}.slow")
 
 
 @dataclass
@@ -32,15 +41,34 @@ class PoolConfig:
     max_inactive_connection_lifetime: float = 25.0
     max_retries: int = 3
     retry_delay: float = 3.0
+    # Priority lanes (None = DEFAULT_LANES); see LaneScheduler
+    lanes: dict[str, Lane] | None = None
+    # Queries at least this slow are logged to shared.database.slow (0 = off)
+    slow_query_ms: float = 500.0
+    # Adaptive sizing (see PoolSizer): grow from max_size up to this ceiling
+    # while acquires wait longer than grow_wait_ms, give connections back
+    # after shrink_idle_seconds without needing them. None = fixed max_size.
+    adaptive_max_size: int | None = None
+    grow_wait_ms: float = 50.0
+    shrink_idle_seconds: float = 300.0
+    # Connections all adaptive services may grow by together, above their
+    # max_size: Supavisor's pool_size on the smallest Supabase tiers (15)
+    # less the presets' max_size (3 + 2 + 3). None = grow without leasing
+    connection_budget: int | None = 7
+    # Set by for_service; identifies this process's connection lease
+    service: str = "db"
 
     # Per-service preset overrides
-    # All services use Session Pooler (5432) with min_size=1 and heartbeat
-    # loops to keep idle connections alive against Supavisor idle timeout.
+    # All services use Session Pooler (5432) with min_size=1; PoolSupervisor
+    # keeps idle connections alive against Supavisor idle timeout.
     # Transaction Pooler (6543) is only for serverless/edge, not long-running.
+    # max_size is what each service may always hold; growth above it is
+    # leased from connection_budget.
     _SERVICE_PRESETS: ClassVar[dict[str, dict]] = {
-        "api": {"min_size": 1, "max_size": 3},
+        "api": {"min_size": 1, "max_size": 3, "adaptive_max_size": 5},
         "discord": {"min_size": 1, "max_size": 2},
-        "twitch": {"min_size": 1, "max_size": 3},
+        # Stream start/end bursts (session bookkeeping, VOD sync, EventSub)
+        "twitch": {"min_size": 1, "max_size": 3, "adaptive_max_size": 8},
     }
 
     @classmethod
@@ -51,12 +79,1108 @@ class PoolConfig:
         defaults. Only pool sizing / retry differ per service.
         """
         valid_keys = {f.name for f in fields(cls) if not f.name.startswith("_")}
-        preset = dict(cls._SERVICE_PRESETS.get(service, {}))
+        preset = {"service": service, **cls._SERVICE_PRESETS.get(service, {})}
         preset.update(overrides)
         filtered = {k: v for k, v in preset.items() if k in valid_keys}
         return cls(**filtered)
 
 
+# Errors that mean the database (or pooler) is unreachable, as opposed to a
+# failing query
+_OUTAGE_ERRORS: tuple[type[BaseException], ...] = (
+    OSError,  # socket errors, including ConnectionError
+    asyncpg.PostgresConnectionError,  # includes ConnectionDoesNotExistError
+    asyncpg.CannotConnectNowError,
+    asyncpg.TooManyConnectionsError,
+)
+
+
+def is_outage_error(exc: BaseException) -> bool:
+    """True if *exc* indicates the database is unreachable.
+
+    Timeouts are not outages: pool-acquire and lane-queue timeouts mean the
+    pool is saturated, and ``command_timeout`` means a query is slow. Neither
+    should open the breaker.
+    """
+    return isinstance(exc, _OUTAGE_ERRORS) and not isinstance(exc, TimeoutError)
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of querying while a pool's circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker for one DatabaseManager.
+
+    - closed: queries run; *failure_threshold* consecutive outage errors open it.
+    - open: callers skip the database (``shared.cache.cached`` serves stale
+      values) until *reset_timeout* has passed.
+    - half-open: one trial query at a time; success closes the breaker,
+      failure re-opens it with the timeout doubled (up to *max_reset_timeout*).
+
+    While open, a probe task runs *probe* (``SELECT 1``) at each reset so the
+    breaker also closes when no traffic arrives.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 5.0,
+        max_reset_timeout: float = 60.0,
+        probe: Callable[[], Awaitable[bool]] | None = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._probe = probe
+        self._state = self.CLOSED
+        self._failures = 0
+        self._reset_timeout = reset_timeout
+        self._opened_at = 0.0
+        self._trial_started: float | None = None
+        self._last_exc: BaseException | None = None
+        self._probe_task: asyncio.Task | None = None
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        return self._state == self.OPEN
+
+    def allow_request(self) -> bool:
+        """Whether a query may run now (claims the trial slot when half-open)."""
+        if self._state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        if self._state == self.OPEN:
+            if now - self._opened_at < self._reset_timeout:
+                self.rejected += 1
+                return False
+            self._state = self.HALF_OPEN
+        # Half-open: one trial at a time; a trial that never reported back
+        # (e.g. cancelled) frees the slot after reset_timeout
+        if self._trial_started is not None and now - self._trial_started < self._reset_timeout:
+            self.rejected += 1
+            return False
+        self._trial_started = now
+        return True
+
+    def record_success(self) -> None:
+        if self._state != self.CLOSED:
+            logger.info(f"Circuit breaker '{self.name}' closed: database reachable again")
+        self._state = self.CLOSED
+        self._failures = 0
+        self._last_exc = None
+        self._reset_timeout = self.base_reset_timeout
+        self._trial_started = None
+
+    def record_failure(self, exc: BaseException | None = None) -> None:
+        # Waiters of one batched query all report the same exception: count it once
+        if exc is not None and exc is self._last_exc:
+            return
+        self._last_exc = exc
+        self._failures += 1
+        if self._state == self.HALF_OPEN:
+            self._reset_timeout = min(self._reset_timeout * 2, self.max_reset_timeout)
+            self._open(exc)
+        elif self._state == self.CLOSED and self._failures >= self.failure_threshold:
+            self._open(exc)
+
+    def _open(self, exc: BaseException | None) -> None:
+        if self._state == self.CLOSED:
+            self.times_opened += 1
+            reason = f"{type(exc).__name__}: {exc}" if exc is not None else "probe failed"
+            logger.warning(
+                f"Circuit breaker '{self.name}' opened after {self._failures} failures "
+                f"({reason}); serving cached data only"
+            )
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._trial_started = None
+        if self._probe is not None and (self._probe_task is None or self._probe_task.done()):
+            try:
+                self._probe_task = asyncio.get_running_loop().create_task(self._probe_loop())
+            except RuntimeError:
+                pass  # no running loop: traffic will half-open it
+
+    async def _probe_loop(self) -> None:
+        """Probe the database at each reset until the breaker closes."""
+        assert self._probe is not None
+        while self._state != self.CLOSED:
+            remaining = self._opened_at + self._reset_timeout - time.monotonic()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+                continue
+            if not self.allow_request():
+                # A trial query is in flight; let it decide
+                await asyncio.sleep(self._reset_timeout)
+                continue
+            if await self._probe():
+                self.record_success()
+            else:
+                self.record_failure()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "reset_timeout": self._reset_timeout,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+    def close(self) -> None:
+        """Stop the probe task."""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+
+
+# Breakers of connected DatabaseManagers, by id() of their pool (asyncpg
+# pools do not support weak references), so that code holding only a pool
+# (repositories) can find its breaker
+_breakers: dict[int, CircuitBreaker] = {}
+
+
+def breaker_for_pool(pool: Any) -> CircuitBreaker | None:
+    """Return the circuit breaker of the DatabaseManager owning *pool*."""
+    if pool is None:
+        return None
+    return _breakers.get(id(pool))
+
+
+def breaker_states() -> list[dict[str, Any]]:
+    """Stats of every connected DatabaseManager's breaker (for status endpoints)."""
+    return [breaker.stats() for breaker in _breakers.values()]
+
+
+# Connected DatabaseManagers, keyed like _breakers
+_managers: dict[int, DatabaseManager] = {}
+
+
+def db_metrics(limit: int = 50) -> list[dict[str, Any]]:
+    """Detailed query metrics of every connected DatabaseManager."""
+    return [manager.metrics_report(limit) for manager in _managers.values()]
+
+
+def pool_states() -> list[dict[str, Any]]:
+    """Pool health of every connected DatabaseManager (for status endpoints)."""
+    return [manager.pool_stats() for manager in _managers.values()]
+
+
+# ── Priority lanes ──────────────────────────────────────────────────
+
+INTERACTIVE = "interactive"  # chat commands, cache-miss lookups, API requests
+BACKGROUND = "background"  # periodic loops: session checks, config sync, timers
+BULK = "bulk"  # batch writes and reconciliation
+
+
+@dataclass(frozen=True)
+class Lane:
+    """Share of pool connections for one class of work.
+
+    - weight: share of freed connections while several lanes are waiting
+    - reserved: connections no other lane may take
+    - limit: most connections the lane may hold at once (None = no limit)
+    """
+
+    weight: int
+    reserved: int = 0
+    limit: int | None = None
+
+
+DEFAULT_LANES: dict[str, Lane] = {
+    INTERACTIVE: Lane(weight=6, reserved=1),
+    BACKGROUND: Lane(weight=3),
+    BULK: Lane(weight=1, limit=1),
+}
+
+# Lane of the current task; None bypasses the lanes (pool housekeeping)
+_current_lane: ContextVar[str | None] = ContextVar("db_lane", default=INTERACTIVE)
+
+
+class db_lane:  # noqa: N801 - used like contextlib helpers
+    """Run pool acquires of the enclosed code in lane *name*.
+
+    Usable as ``with db_lane(BACKGROUND):`` or as a decorator on a coroutine
+    function. The lane is a context variable, so tasks created inside
+    inherit it. Code outside any ``db_lane`` is INTERACTIVE.
+    """
+
+    def __init__(self, name: str | None):
+        self.name = name
+        self._tokens: list[Any] = []
+
+    def __enter__(self) -> None:
+        self._tokens.append(_current_lane.set(self.name))
+
+    def __exit__(self, *exc: object) -> None:
+        _current_lane.reset(self._tokens.pop())
+
+    def __call__(self, func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        name = self.name
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            token = _current_lane.set(name)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _current_lane.reset(token)
+
+        return wrapper
+
+
+class LaneScheduler:
+    """Admits pool acquires per lane: reserved capacity plus weighted-fair order.
+
+    Holds one slot per pool connection (*capacity* = ``max_size``). A lane
+    may take a free slot unless that would leave fewer free slots than the
+    other lanes' unused reservations. When a slot frees up, the eligible
+    waiting lane with the lowest virtual time gets it (stride scheduling:
+    each grant advances a lane's time by ``1 / weight``), so lanes share
+    connections in proportion to their weights and none is starved.
+    Reservations are trimmed so at least one slot is always shared.
+    """
+
+    def __init__(self, capacity: int, lanes: dict[str, Lane] | None = None):
+        self.lanes = dict(lanes or DEFAULT_LANES)
+        self.capacity = capacity
+        self._reserved = self._trim_reservations(capacity)
+        self._in_use = dict.fromkeys(self.lanes, 0)
+        self._used = 0
+        self._waiters: dict[str, deque[asyncio.Future[None]]] = {
+            name: deque() for name in self.lanes
+        }
+        self._vtime = dict.fromkeys(self.lanes, 0.0)
+        self._clock = 0.0
+        self.granted = dict.fromkeys(self.lanes, 0)
+        self._wait_total = dict.fromkeys(self.lanes, 0.0)
+        self._wait_max = dict.fromkeys(self.lanes, 0.0)
+
+    def _trim_reservations(self, capacity: int) -> dict[str, int]:
+        budget = max(capacity - 1, 0)
+        reserved: dict[str, int] = {}
+        for name, lane in self.lanes.items():
+            reserved[name] = min(lane.reserved, budget)
+            budget -= reserved[name]
+        return reserved
+
+    def _eligible(self, name: str) -> bool:
+        limit = self.lanes[name].limit
+        if limit is not None and self._in_use[name] >= limit:
+            return False
+        free = self.capacity - self._used
+        held_for_others = sum(
+            max(self._reserved[other] - self._in_use[other], 0)
+            for other in self.lanes
+            if other != name
+        )
+        return free > held_for_others
+
+    def _grant(self, name: str) -> None:
+        self._in_use[name] += 1
+        self._used += 1
+        self.granted[name] += 1
+        # Lanes that were idle do not bank credit for the time they were idle
+        start = max(self._vtime[name], self._clock)
+        self._clock = start
+        self._vtime[name] = start + 1.0 / self.lanes[name].weight
+
+    def _dispatch(self) -> None:
+        while self._used < self.capacity:
+            best: str | None = None
+            for name, queue in self._waiters.items():
+                while queue and queue[0].done():
+                    queue.popleft()  # cancelled waiter
+                if not queue or not self._eligible(name):
+                    continue
+                if best is None or max(self._vtime[name], self._clock) < max(
+                    self._vtime[best], self._clock
+                ):
+                    best = name
+            if best is None:
+                return
+            self._grant(best)
+            self._waiters[best].popleft().set_result(None)
+
+    async def acquire(self, name: str) -> None:
+        """Wait for a slot in lane *name*."""
+        if name not in self.lanes:
+            raise ValueError(f"Unknown database lane '{name}'")
+        if not self._waiters[name] and self._eligible(name):
+            self._grant(name)
+            return
+
+        start = time.monotonic()
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters[name].append(fut)
+        self._dispatch()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release(name)  # granted, but the waiter went away
+            else:
+                try:
+                    self._waiters[name].remove(fut)
+                except ValueError:
+                    pass
+            raise
+        waited = time.monotonic() - start
+        self._wait_total[name] += waited
+        self._wait_max[name] = max(self._wait_max[name], waited)
+
+    def release(self, name: str) -> None:
+        self._in_use[name] -= 1
+        self._used -= 1
+        self._dispatch()
+
+    def resize(self, capacity: int) -> None:
+        """Follow a pool resize. Slots in use above a lower capacity drain on release."""
+        self.capacity = capacity
+        self._reserved = self._trim_reservations(capacity)
+        self._dispatch()
+
+    def waiting(self) -> int:
+        return sum(1 for queue in self._waiters.values() for f in queue if not f.done())
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            name: {
+                "in_use": self._in_use[name],
+                "waiting": sum(1 for f in self._waiters[name] if not f.done()),
+                "reserved": self._reserved[name],
+                "granted": self.granted[name],
+                "wait_avg_ms": (
+                    round(self._wait_total[name] / self.granted[name] * 1000, 2)
+                    if self.granted[name]
+                    else 0.0
+                ),
+                "wait_max_ms": round(self._wait_max[name] * 1000, 2),
+            }
+            for name in self.lanes
+        }
+
+
+# ── Instrumentation ─────────────────────────────────────────────────
+
+
+class Histogram:
+    """Fixed-bucket latency histogram, cheap enough to update on every query."""
+
+    BOUNDS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[bisect_left(self.BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, q: float) -> float | None:
+        """Upper bound (ms) of the bucket holding the *q* quantile."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return float(self.BOUNDS_MS[i]) if i < len(self.BOUNDS_MS) else self.max
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        buckets = {
+            (f"le_{self.BOUNDS_MS[i]}ms" if i < len(self.BOUNDS_MS) else "inf"): n
+            for i, n in enumerate(self.counts)
+            if n
+        }
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max, 2),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": buckets,
+        }
+
+
+_SQL_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SQL_SPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_sql(query: str) -> str:
+    """Statement key for metrics: literals become ``?``, whitespace collapses.
+
+    Parameters (``$1``) are kept; queries are built from fixed strings, so
+    the cache makes this a dict lookup after the first call.
+    """
+    sql = _SQL_LITERAL.sub("?", query)
+    sql = sql.replace("$?", "$n")
+    return _SQL_SPACE.sub(" ", sql).strip()[:300]
+
+
+class _StatementStats:
+    __slots__ = ("latency", "errors", "timeouts")
+
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.errors = 0
+        self.timeouts = 0
+
+
+class QueryMetrics:
+    """Acquire-wait and per-statement latency metrics for one pool.
+
+    Fed by SupervisedPool (acquire waits and timeouts) and by an asyncpg
+    query logger on every connection (statement latency, errors, timeouts).
+    Statements are keyed by ``normalize_sql``; past MAX_STATEMENTS distinct
+    keys, new ones are counted under ``<other>``.
+    """
+
+    MAX_STATEMENTS = 200
+    _OTHER = "<other>"
+
+    def __init__(self, *, slow_query_ms: float = 500.0):
+        self.slow_query_ms = slow_query_ms
+        self.acquire_wait = Histogram()
+        self.acquire_timeouts = 0
+        self.latency = Histogram()
+        self.query_errors = 0
+        self.query_timeouts = 0
+        self.slow_queries = 0
+        self.recent_slow: deque[dict[str, Any]] = deque(maxlen=20)
+        self._statements: dict[str, _StatementStats] = {}
+        # Housekeeping statements (keepalive, connection reset) are not counted
+        self._ignored: set[str] = {"SELECT 1"}
+
+    def ignore(self, query: str) -> None:
+        self._ignored.add(query)
+
+    def on_acquire(self, seconds: float) -> None:
+        self.acquire_wait.observe(seconds)
+
+    def on_query(self, record: Any) -> None:
+        """asyncpg query logger callback (``LoggedQuery``)."""
+        if record.query in self._ignored:
+            return
+        key = normalize_sql(record.query)
+        stats = self._statements.get(key)
+        if stats is None:
+            if len(self._statements) >= self.MAX_STATEMENTS:
+                key = self._OTHER
+            stats = self._statements.setdefault(key, _StatementStats())
+
+        self.latency.observe(record.elapsed)
+        stats.latency.observe(record.elapsed)
+        exc = record.exception
+        if exc is not None:
+            if isinstance(exc, (TimeoutError, asyncpg.QueryCanceledError)):
+                self.query_timeouts += 1
+                stats.timeouts += 1
+            else:
+                self.query_errors += 1
+                stats.errors += 1
+
+        ms = record.elapsed * 1000
+        if self.slow_query_ms and ms >= self.slow_query_ms:
+            self.slow_queries += 1
+            self.recent_slow.append(
+                {
+                    "at": round(time.time(), 3),
+                    "ms": round(ms, 1),
+                    "statement": key,
+                    "error": type(exc).__name__ if exc is not None else None,
+                }
+            )
+            slow_query_logger.warning(f"Slow query ({ms:.0f}ms): {key}")
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "acquire_wait": self.acquire_wait.as_dict(),
+            "acquire_timeouts": self.acquire_timeouts,
+            "queries": self.latency.as_dict(),
+            "query_errors": self.query_errors,
+            "query_timeouts": self.query_timeouts,
+            "slow_queries": self.slow_queries,
+            "slow_query_ms": self.slow_query_ms,
+            "statements": len(self._statements),
+        }
+
+    def statement_stats(self, limit: int = 50) -> list[dict[str, Any]]:
+        """Statements by total time spent, slowest first."""
+        ranked = sorted(
+            self._statements.items(), key=lambda item: item[1].latency.total, reverse=True
+        )
+        return [
+            {
+                "statement": key,
+                "total_ms": round(stats.latency.total, 1),
+                "errors": stats.errors,
+                "timeouts": stats.timeouts,
+                **stats.latency.as_dict(),
+            }
+            for key, stats in ranked[:limit]
+        ]
+
+    def report(self, limit: int = 50) -> dict[str, Any]:
+        """Full metrics: summary, top statements and recent slow queries."""
+        return {
+            **self.summary(),
+            "top_statements": self.statement_stats(limit),
+            "recent_slow": list(self.recent_slow),
+        }
+
+
+class SupervisedPool:
+    """asyncpg pool behind priority lanes that reports how long acquires wait.
+
+    Wraps a pool from ``asyncpg.create_pool`` and only uses its public API.
+    The wrapped pool is created at the sizing ceiling; the lane scheduler's
+    capacity is the effective ``max_size``, so ``resize`` (see PoolSizer) only
+    moves that capacity. Connections above it go idle and are closed by
+    ``max_inactive_connection_lifetime``.
+
+    Each acquire first takes a slot in the current ``db_lane``; acquires
+    outside any lane (``db_lane(None)``, pool housekeeping) go straight to the
+    wrapped pool and may use its spare connections.
+
+    ``on_wait(pool_wait, total_wait, lane)`` gets the wait for a pool
+    connection and the whole wait including the lane queue; ``on_timeout``
+    is called when an acquire times out in either. Everything else (``close``,
+    ``get_size``, ...) is delegated to the wrapped pool.
+    """
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        *,
+        on_wait: Callable[[float, float, str | None], None],
+        on_timeout: Callable[[], None] | None = None,
+        lanes: LaneScheduler,
+    ):
+        self._pool = pool
+        self._on_wait = on_wait
+        self._on_timeout = on_timeout
+        self._lanes = lanes
+        self._in_use = 0
+        # id(connection proxy) -> lane it holds a slot in (None: no lane)
+        self._lane_of: dict[int, str | None] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
+
+    # ── Acquire / release ────────────────────────────────────────────
+
+    def acquire(self, *, timeout: float | None = None) -> _SupervisedAcquire:
+        """Like ``asyncpg.Pool.acquire``: await it, or use ``async with``."""
+        return _SupervisedAcquire(self, timeout)
+
+    async def _acquire(self, timeout: float | None) -> Any:
+        try:
+            return await self._acquire_in_lane(timeout)
+        except TimeoutError:
+            if self._on_timeout is not None:
+                self._on_timeout()
+            raise
+
+    async def _acquire_in_lane(self, timeout: float | None) -> Any:
+        lane = _current_lane.get()
+        queued = time.monotonic()
+        if lane is not None:
+            async with asyncio.timeout(timeout):
+                await self._lanes.acquire(lane)
+        try:
+            start = time.monotonic()
+            remaining = None if timeout is None else max(queued + timeout - start, 0.001)
+            conn = await self._pool.acquire(timeout=remaining)
+        except BaseException:
+            if lane is not None:
+                self._lanes.release(lane)
+            raise
+        now = time.monotonic()
+        self._in_use += 1
+        self._lane_of[id(conn)] = lane
+        self._on_wait(now - start, now - queued, lane)
+        return conn
+
+    async def release(self, connection: Any, *, timeout: float | None = None) -> None:
+        lane = self._lane_of.pop(id(connection), None)
+        try:
+            await self._pool.release(connection, timeout=timeout)
+        finally:
+            self._in_use -= 1
+            if lane is not None:
+                self._lanes.release(lane)
+
+    # ── Pool-level queries (asyncpg.Pool API) ────────────────────────
+
+    async def execute(self, query: str, *args: Any, timeout: float | None = None) -> str:
+        async with self.acquire() as conn:
+            return await conn.execute(query, *args, timeout=timeout)
+
+    async def executemany(self, command: str, args: Any, *, timeout: float | None = None) -> None:
+        async with self.acquire() as conn:
+            await conn.executemany(command, args, timeout=timeout)
+
+    async def fetch(self, query: str, *args: Any, timeout: float | None = None) -> list[Any]:
+        async with self.acquire() as conn:
+            return await conn.fetch(query, *args, timeout=timeout)
+
+    async def fetchrow(self, query: str, *args: Any, timeout: float | None = None) -> Any:
+        async with self.acquire() as conn:
+            return await conn.fetchrow(query, *args, timeout=timeout)
+
+    async def fetchval(
+        self, query: str, *args: Any, column: int = 0, timeout: float | None = None
+    ) -> Any:
+        async with self.acquire() as conn:
+            return await conn.fetchval(query, *args, column=column, timeout=timeout)
+
+    # ── Sizing ───────────────────────────────────────────────────────
+
+    def get_max_size(self) -> int:
+        """Effective max size: lane capacity, at most the wrapped pool's size."""
+        return self._lanes.capacity
+
+    def get_in_use(self) -> int:
+        """Connections currently checked out."""
+        return self._in_use
+
+    def resize(self, max_size: int) -> int:
+        """Set the effective ``max_size`` within ``[min_size, wrapped max_size]``.
+
+        Returns the new size. Slots in use above a lower size drain on release.
+        """
+        max_size = min(max(max_size, self._pool.get_min_size(), 1), self._pool.get_max_size())
+        self._lanes.resize(max_size)
+        return max_size
+
+
+class _SupervisedAcquire:
+    """``SupervisedPool.acquire()`` result, mirroring asyncpg's PoolAcquireContext."""
+
+    __slots__ = ("_pool", "_timeout", "_conn")
+
+    def __init__(self, pool: SupervisedPool, timeout: float | None):
+        self._pool = pool
+        self._timeout = timeout
+        self._conn: Any = None
+
+    async def __aenter__(self) -> Any:
+        if self._conn is not None:
+            raise asyncpg.InterfaceError("a connection is already acquired")
+        self._conn = await self._pool._acquire(self._timeout)
+        return self._conn
+
+    async def __aexit__(self, *exc: object) -> None:
+        conn, self._conn = self._conn, None
+        await self._pool.release(conn)
+
+    def __await__(self) -> Any:
+        return self._pool._acquire(self._timeout).__await__()
+
+
+class PoolSupervisor:
+    """Activity-aware keepalive and warm-up for one DatabaseManager's pool.
+
+    Replaces fixed-interval ``SELECT 1`` heartbeats:
+
+    - Every connection's last release is recorded; a connection is pinged
+      only when it is idle, close to ``max_inactive_connection_lifetime`` and
+      needed to keep the pool at ``min_size``. Connections above the floor
+      are left to expire, and a busy pool sends no keepalive queries at all.
+    - When acquires start waiting (no idle connection, average wait over a
+      tick above *wait_threshold*), one more connection is opened ahead of
+      demand, up to ``max_size``.
+    - PoolSizer moves ``max_size`` itself, once per tick.
+    - Pings are skipped while the circuit breaker is open (its probe takes
+      over) and outage errors are reported to it.
+    """
+
+    def __init__(
+        self,
+        manager: DatabaseManager,
+        *,
+        interval: float = 5.0,
+        wait_threshold: float = 0.05,
+    ):
+        self._manager = manager
+        self.interval = interval
+        self.wait_threshold = wait_threshold
+        lifetime = manager.config.max_inactive_connection_lifetime
+        # Ping with two ticks to spare before the inactivity deadline
+        self.idle_limit = max(lifetime - 2 * interval, interval) if lifetime > 0 else 0.0
+        self._last_used: weakref.WeakKeyDictionary[asyncpg.Connection, float] = (
+            weakref.WeakKeyDictionary()
+        )
+        # (monotonic time, seconds waited) of recent acquires
+        self._waits: deque[tuple[float, float]] = deque(maxlen=1000)
+        self._task: asyncio.Task | None = None
+        # Sizing can wait on a lease round trip; it runs beside the tick so
+        # keepalive and pre-open are never held up by it
+        self._sizing: asyncio.Task | None = None
+        self._fail_count = 0
+        self.acquires = 0
+        self.pings = 0
+        self.ping_failures = 0
+        self.preopened = 0
+
+    # ── Pool hooks ───────────────────────────────────────────────────
+
+    def on_connect(self, conn: asyncpg.Connection) -> None:
+        self._last_used[conn] = time.monotonic()
+
+    def on_release(self, conn: asyncpg.Connection) -> None:
+        self._last_used[conn] = time.monotonic()
+
+    def on_wait(self, seconds: float) -> None:
+        self.acquires += 1
+        self._waits.append((time.monotonic(), seconds))
+
+    # ── Lifecycle ────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._sizing):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._sizing = None
+
+    async def _run(self) -> None:
+        # Housekeeping acquires only touch idle capacity: keep them out of the lanes
+        _current_lane.set(None)
+        while True:
+            await asyncio.sleep(self.interval)
+            pool = self._manager._pool
+            if pool is None or self._manager.breaker.is_open:
+                continue
+            if self._sizing is None or self._sizing.done():
+                self._sizing = asyncio.create_task(self._adjust_size(pool))
+            try:
+                await self._maybe_preopen(pool)
+                await self._keepalive(pool)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Pool supervisor error: {type(e).__name__}: {e}")
+
+    async def _adjust_size(self, pool: SupervisedPool) -> None:
+        try:
+            await self._manager.sizer.adjust(pool, self.interval)
+        except Exception as e:
+            logger.debug(f"Pool sizing error: {type(e).__name__}: {e}")
+
+    # ── Keepalive ────────────────────────────────────────────────────
+
+    def _idle_ages(self) -> list[float]:
+        now = time.monotonic()
+        return [now - t for conn, t in list(self._last_used.items()) if not conn.is_closed()]
+
+    async def _keepalive(self, pool: asyncpg.Pool) -> None:
+        if not self.idle_limit:
+            return
+        idle = pool.get_idle_size()
+        if not idle:
+            return  # everything is checked out: nothing to keep alive
+        ages = self._idle_ages()
+        stale = min(sum(1 for age in ages if age >= self.idle_limit), idle)
+        # Stale connections needed to stay at the floor; the rest may expire
+        needed = min(pool.get_min_size() - (len(ages) - stale), stale)
+        if needed <= 0:
+            return
+        # Idle connections come out most-recently-used first, so take the
+        # fresh ones too to reach the stale ones
+        await self._ping(pool, min(idle - stale + needed, idle))
+
+    async def _ping(self, pool: asyncpg.Pool, count: int) -> None:
+        async def _one() -> None:
+            async with pool.acquire(timeout=self._manager.config.timeout) as conn:
+                await conn.fetchval("SELECT 1")
+
+        results = await asyncio.gather(*(_one() for _ in range(count)), return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        self.pings += count - len(errors)
+        if not errors:
+            if self._fail_count > 0:
+                logger.info(f"Pool keepalive recovered after {self._fail_count} failures")
+            self._fail_count = 0
+            return
+
+        e = errors[0]
+        self.ping_failures += len(errors)
+        self._fail_count += 1
+        if is_outage_error(e):
+            self._manager.breaker.record_failure(e)
+        if self._fail_count <= 3:
+            logger.warning(f"Pool keepalive failed ({self._fail_count}): {type(e).__name__}: {e}")
+        elif self._fail_count == 4:
+            logger.warning(
+                f"Pool keepalive still failing ({self._fail_count}x), suppressing until recovery"
+            )
+
+    # ── Warm-up ──────────────────────────────────────────────────────
+
+    def _recent_waits(self, window: float) -> list[float]:
+        cutoff = time.monotonic() - window
+        return [w for t, w in self._waits if t >= cutoff]
+
+    async def _maybe_preopen(self, pool: asyncpg.Pool) -> None:
+        waits = self._recent_waits(self.interval)
+        if not waits or pool.get_idle_size() or pool.get_size() >= pool.get_max_size():
+            return
+        if sum(waits) / len(waits) < self.wait_threshold:
+            return
+        # With no idle connection, an acquire opens a new one; releasing it
+        # leaves it idle for the next caller
+        async with pool.acquire(timeout=self._manager.config.timeout):
+            pass
+        self.preopened += 1
+        logger.info(
+            f"Pool pre-opened a connection (avg acquire wait "
+            f"{sum(waits) / len(waits) * 1000:.0f}ms, size {pool.get_size()}/{pool.get_max_size()})"
+        )
+
+    # ── Reporting ────────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, Any]:
+        pool = self._manager._pool
+        waits = self._recent_waits(60.0)
+        ages = self._idle_ages()
+        return {
+            "size": pool.get_size() if pool is not None else 0,
+            "idle": pool.get_idle_size() if pool is not None else 0,
+            "min_size": pool.get_min_size() if pool is not None else 0,
+            "max_size": pool.get_max_size() if pool is not None else 0,
+            "acquires": self.acquires,
+            "acquire_wait_avg_ms_1m": round(sum(waits) / len(waits) * 1000, 2) if waits else 0.0,
+            "acquire_wait_max_ms_1m": round(max(waits) * 1000, 2) if waits else 0.0,
+            "oldest_idle_s": round(max(ages), 1) if ages else None,
+            "keepalive_idle_limit_s": self.idle_limit,
+            "keepalive_pings": self.pings,
+            "keepalive_failures": self.ping_failures,
+            "preopened": self.preopened,
+        }
+
+
+class PoolSizer:
+    """Adaptive ``max_size`` between the configured size and a ceiling.
+
+    Enabled by ``PoolConfig.adaptive_max_size`` and driven by the
+    PoolSupervisor tick:
+
+    - grow: when acquires over the last tick waited longer than
+      ``grow_wait_ms`` on average and none are left over, add one slot per
+      waiting acquire, up to the ceiling
+    - shrink: after ``shrink_idle_seconds`` in which the top slot was never
+      used, give one back, down to ``max_size``
+
+    Only waits in lanes without a ``limit`` count: a lane queueing behind
+    its own limit gains nothing from a larger pool.
+
+    With a ``connection_budget``, an adaptive instance leases the
+    connections it grows by from the ``db_pool_leases`` table (migration
+    024), so growth across all services stays within the pooler's spare
+    client slots. The configured ``max_size`` is never leased and never
+    given up; only capacity above it is. A grown instance renews its lease
+    and gives connections back if the budget has been overcommitted since.
+    Leases expire if a process dies without releasing.
+
+    Lease queries run on the pool in the housekeeping lane
+    (``db_lane(None)``): the wrapped pool is opened at the ceiling, so
+    while the instance is below it there is a connection outside the lane
+    capacity for the lease even when every lane slot is busy.
+    """
+
+    LEASE_TTL = 180
+    LEASE_RENEW = 60.0
+
+    def __init__(self, manager: DatabaseManager):
+        self._manager = manager
+        cfg = manager.config
+        self.floor = cfg.max_size
+        self.ceiling = max(cfg.adaptive_max_size or cfg.max_size, cfg.max_size)
+        self.instance = f"{cfg.service}:{socket.gethostname()}:{os.getpid()}"
+        self._waits: deque[tuple[float, float]] = deque(maxlen=1000)
+        self._last_full = time.monotonic()
+        self._leased = 0
+        self._lease_at = 0.0
+        self._leases_unavailable = False
+        self.grown = 0
+        self.shrunk = 0
+        self.lease_denied = 0
+
+    @property
+    def adaptive(self) -> bool:
+        return self.ceiling > self.floor
+
+    @property
+    def uses_leases(self) -> bool:
+        return (
+            self.adaptive
+            and self._manager.config.connection_budget is not None
+            and not self._leases_unavailable
+        )
+
+    # ── Pool hooks ───────────────────────────────────────────────────
+
+    def on_acquire(self, seconds: float, lane: str | None) -> None:
+        if lane is None:
+            return  # housekeeping
+        if self._manager.lanes.lanes[lane].limit is None:
+            self._waits.append((time.monotonic(), seconds))
+        pool = self._manager._pool
+        if pool is not None and pool.get_in_use() >= pool.get_max_size():
+            self._last_full = time.monotonic()
+
+    # ── Tick ─────────────────────────────────────────────────────────
+
+    async def adjust(self, pool: SupervisedPool, interval: float) -> None:
+        size = pool.get_max_size()
+        now = time.monotonic()
+        cutoff = now - interval
+        waits = [w for t, w in self._waits if t >= cutoff]
+        slow = bool(waits) and sum(waits) / len(waits) * 1000 >= self._manager.config.grow_wait_ms
+        backlog = self._manager.lanes.waiting()
+
+        if (
+            self.adaptive
+            and slow
+            and size < self.ceiling
+            and (backlog or pool.get_idle_size() == 0)
+        ):
+            await self._resize(pool, min(size + max(backlog, 1), self.ceiling))
+        elif (
+            size > self.floor and now - self._last_full >= self._manager.config.shrink_idle_seconds
+        ):
+            # Restart the idle clock so the next step waits a full period
+            self._last_full = now
+            await self._resize(pool, size - 1)
+        elif self._leased and self.uses_leases and now - self._lease_at >= self.LEASE_RENEW:
+            granted = await self._lease(size - self.floor)
+            if granted is not None and granted < size - self.floor:
+                new_size = pool.resize(self.floor + granted)
+                self.shrunk += 1
+                logger.info(f"Pool max_size {size} -> {new_size} (lease cut to {granted})")
+
+    async def _resize(self, pool: SupervisedPool, want: int) -> None:
+        size = pool.get_max_size()
+        want = max(want, self.floor)
+        if want > size:
+            if self._leases_unavailable:
+                return  # budget configured but the lease table is missing: stay put
+            if self.uses_leases:
+                extra = await self._lease(want - self.floor)
+                if extra is None:
+                    return
+                if self.floor + extra < want:
+                    self.lease_denied += 1
+                want = self.floor + extra
+        new_size = pool.resize(want)
+        if new_size == size:
+            return
+        if new_size > size:
+            self.grown += 1
+        else:
+            self.shrunk += 1
+            if self.uses_leases:
+                await self._lease(new_size - self.floor)
+        logger.info(f"Pool max_size {size} -> {new_size} (ceiling {self.ceiling})")
+
+    # ── Leases ───────────────────────────────────────────────────────
+
+    async def _lease_query(self, query: str, *args: Any) -> Any:
+        """Run one lease statement in the housekeeping lane (see class docstring)."""
+        pool = self._manager._pool
+        if pool is None:
+            raise asyncpg.InterfaceError("pool is closed")
+        with db_lane(None):
+            async with pool.acquire(timeout=self._manager.config.timeout) as conn:
+                return await conn.fetchval(query, *args)
+
+    async def _lease(self, extra: int) -> int | None:
+        """Lease *extra* connections above max_size. None if the lease failed."""
+        cfg = self._manager.config
+        try:
+            granted = await self._lease_query(
+                "SELECT fn_lease_pool_connections($1, $2, $3, $4, $5)",
+                self.instance,
+                cfg.service,
+                extra,
+                cfg.connection_budget,
+                self.LEASE_TTL,
+            )
+        except asyncpg.UndefinedFunctionError:
+            self._leases_unavailable = True
+            logger.warning(
+                "fn_lease_pool_connections missing (migration 024 not applied); "
+                "adaptive pool sizing disabled"
+            )
+            return None
+        except Exception as e:
+            logger.debug(f"Pool lease failed: {type(e).__name__}: {e}")
+            return None
+        self._leased = granted
+        self._lease_at = time.monotonic()
+        return granted
+
+    async def release(self) -> None:
+        """Give the lease back so other services can use it right away."""
+        if not self._leased:
+            return
+        try:
+            await self._lease_query("SELECT fn_release_pool_lease($1)", self.instance)
+            self._leased = 0
+        except Exception as e:
+            logger.debug(f"Pool lease release failed: {type(e).__name__}: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "adaptive": self.adaptive,
+            "floor": self.floor,
+            "ceiling": self.ceiling,
+            "budget": self._manager.config.connection_budget,
+            "leased": self._leased,
+            "leases_unavailable": self._leases_unavailable,
+            "grown": self.grown,
+            "shrunk": self.shrunk,
+            "lease_denied": self.lease_denied,
+        }
+
+
 class DatabaseManager:
     """Manages PostgreSQL connection pool lifecycle.
 
@@ -68,8 +1192,15 @@ class DatabaseManager:
     def __init__(self, database_url: str, config: PoolConfig | None = None):
         self.database_url = database_url
         self.config = config or PoolConfig()
-        self._pool: asyncpg.Pool | None = None
+        self._pool: SupervisedPool | None = None
         self._pooler_mode: str = "transaction" if ":6543" in database_url else "session"
+        self.breaker = CircuitBreaker(
+            urlparse(database_url).hostname or "database", probe=self.check_health
+        )
+        self.supervisor = PoolSupervisor(self)
+        self.lanes = LaneScheduler(self.config.max_size, self.config.lanes)
+        self.metrics = QueryMetrics(slow_query_ms=self.config.slow_query_ms)
+        self.sizer = PoolSizer(self)
 
     # ── Pool builders (separate code paths, no if/else) ──────────────
 
@@ -81,6 +1212,36 @@ class DatabaseManager:
         """
         timeout_ms = int(self.config.command_timeout * 1000)
         await conn.execute(f"SET statement_timeout = {timeout_ms}")
+        self._instrument_connection(conn)
+
+    async def _init_transaction_connection(self, conn: asyncpg.Connection) -> None:
+        """Initialize new connections for Transaction Pooler (instrumentation only)."""
+        self._instrument_connection(conn)
+
+    def _instrument_connection(self, conn: asyncpg.Connection) -> None:
+        """Register a new connection with the supervisor and query metrics."""
+        self.supervisor.on_connect(conn)
+        # Logged after each statement completes; reset_query is the same
+        # string for every connection of a pool
+        self.metrics.ignore(conn.get_reset_query())
+        conn.add_query_logger(self.metrics.on_query)
+
+    def _on_acquire_wait(self, pool_wait: float, total_wait: float, lane: str | None) -> None:
+        # Pre-open decisions look at pool starvation only; lane queueing is
+        # deliberate back-pressure, but a reason to grow the pool
+        self.supervisor.on_wait(pool_wait)
+        self.sizer.on_acquire(total_wait, lane)
+        self.metrics.on_acquire(total_wait)
+
+    def _on_acquire_timeout(self) -> None:
+        self.metrics.acquire_timeouts += 1
+
+    async def _reset_connection(self, conn: asyncpg.Connection) -> None:
+        """Reset a released connection (asyncpg's default) and record its use."""
+        self.supervisor.on_release(conn)
+        reset_query = conn.get_reset_query()
+        if reset_query:
+            await conn.execute(reset_query)
 
     def _session_pool_kwargs(self) -> dict[str, Any]:
         """Build asyncpg.create_pool kwargs for Session Pooler (port 5432).
@@ -90,7 +1251,7 @@ class DatabaseManager:
         - Maintains min_size idle connections
         - No server_settings: Supavisor proxy does not forward them to
           the real PostgreSQL backend, so tcp_keepalives_* have no effect.
-          Use application-level heartbeat loops instead.
+          PoolSupervisor keeps idle connections alive instead.
         """
         cfg = self.config
         return {
@@ -103,6 +1264,7 @@ class DatabaseManager:
             "statement_cache_size": 100,
             "max_inactive_connection_lifetime": cfg.max_inactive_connection_lifetime,
             "init": self._init_session_connection,
+            "reset": self._reset_connection,
         }
 
     def _transaction_pool_kwargs(self) -> dict[str, Any]:
@@ -111,7 +1273,8 @@ class DatabaseManager:
         PgBouncer in transaction mode:
         - No prepared statements (cache=0)
         - No server_settings (PgBouncer doesn't forward them)
-        - No init callback (SET commands don't persist across queries)
+        - Init only registers instrumentation (SET commands don't persist
+          across queries)
         - min_size=0: don't hold idle connections (PgBouncer kills them)
         - max_inactive=0: release connections immediately after use
         """
@@ -125,6 +1288,8 @@ class DatabaseManager:
             "ssl": "require",
             "statement_cache_size": 0,
             "max_inactive_connection_lifetime": 0,
+            "init": self._init_transaction_connection,
+            "reset": self._reset_connection,
         }
 
     # ── Diagnostics ──────────────────────────────────────────────────
@@ -193,7 +1358,7 @@ class DatabaseManager:
         for attempt in range(1, cfg.max_retries + 1):
             pool: asyncpg.Pool | None = None
             try:
-                pool = await asyncpg.create_pool(**pool_kwargs)
+                pool = await self._create_pool(pool_kwargs)
 
                 # Verify pool is usable before exposing it
                 async with pool.acquire() as conn:
@@ -202,13 +1367,17 @@ class DatabaseManager:
                 # Only assign after verification passes — prevents race
                 # where requests see a pool that gets closed during retry.
                 self._pool = pool
+                _breakers[id(pool)] = self.breaker
+                _managers[id(pool)] = self
+                self.supervisor.start()
 
                 effective_min = pool_kwargs.get("min_size", 0)
                 effective_cache = pool_kwargs.get("statement_cache_size", 0)
                 logger.info(
                     f"Database pool created and verified "
                     f"(mode={self._pooler_mode}, "
-                    f"size={effective_min}-{cfg.max_size}, "
+                    f"size={effective_min}-{cfg.max_size}"
+                    f"{f' (adaptive to {self.sizer.ceiling})' if self.sizer.adaptive else ''}, "
                     f"cache={effective_cache})"
                 )
                 return
@@ -238,11 +1407,46 @@ class DatabaseManager:
                     )
                     raise
 
+    async def _create_pool(self, pool_kwargs: dict[str, Any]) -> SupervisedPool:
+        """Create the asyncpg pool at the sizing ceiling and wrap it in a SupervisedPool.
+
+        The lanes start at the configured ``max_size``; PoolSizer moves them
+        between that and the ceiling.
+        """
+        kwargs = {**pool_kwargs, "max_size": max(pool_kwargs["max_size"], self.sizer.ceiling)}
+        pool = await asyncpg.create_pool(**kwargs)
+        self.lanes.resize(pool_kwargs["max_size"])
+        return SupervisedPool(
+            pool,
+            on_wait=self._on_acquire_wait,
+            on_timeout=self._on_acquire_timeout,
+            lanes=self.lanes,
+        )
+
+    def pool_stats(self) -> dict[str, Any]:
+        """Pool health for status endpoints."""
+        return {
+            "mode": self._pooler_mode,
+            **self.supervisor.stats(),
+            "lanes": self.lanes.stats(),
+            "sizing": self.sizer.stats(),
+            "metrics": self.metrics.summary(),
+        }
+
+    def metrics_report(self, limit: int = 50) -> dict[str, Any]:
+        """Detailed query metrics (per-statement latency, slow queries)."""
+        return {"mode": self._pooler_mode, **self.metrics.report(limit)}
+
     async def disconnect(self) -> None:
         """Close database connection pool."""
         if self._pool is None:
             return
 
+        _breakers.pop(id(self._pool), None)
+        _managers.pop(id(self._pool), None)
+        self.breaker.close()
+        await self.supervisor.stop()
+        await self.sizer.release()
         try:
             await self._pool.close()
             self._pool = None
@@ -255,18 +1459,26 @@ class DatabaseManager:
         if self._pool is None:
             return False
         try:
-            async with self._pool.acquire(timeout=2.0) as conn:
-                await conn.fetchval("SELECT 1")
+            # Reachability, not lane capacity, is what is being checked
+            with db_lane(None):
+                async with self._pool.acquire(timeout=2.0) as conn:
+                    await conn.fetchval("SELECT 1")
             return True
+        except TimeoutError:
+            # Every connection checked out: the database is busy, not unreachable
+            return self._pool.get_in_use() >= self._pool.get_max_size()
         except Exception:
             return False
 
     @property
     def pool(self) -> asyncpg.Pool:
-        """Get the database connection pool. Raises if not initialized."""
+        """Get the database connection pool. Raises if not initialized.
+
+        A SupervisedPool, which implements the ``asyncpg.Pool`` API used here.
+        """
         if self._pool is None:
             raise RuntimeError("Database pool not initialized. Call connect() first.")
-        return self._pool
+        return self._pool  # type: ignore[return-value]
 
     async def get_connection(self) -> AsyncGenerator[asyncpg.Connection, None]:
         """Yield a connection from the pool (for dependency injection)."""
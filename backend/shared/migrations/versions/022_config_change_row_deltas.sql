@@ -0,0 +1,108 @@
+-- Migration 022: Row-level delta payloads for config_change
+-- Description: config_change notifications now carry the operation, the
+--              primary key and the changed row (row_to_json), so the bot can
+--              patch its in-memory tables without a reload query.
+--              When the payload would exceed the NOTIFY size limit (8000
+--              bytes), the row is left out and 'truncated' is set; the
+--              listener then fetches the row by id.
+--              'table' and 'channel_id' are kept for existing listeners.
+--
+-- Payload: {table, channel_id, op: INSERT|UPDATE|DELETE, id, row | truncated}
+--          DELETE carries the deleted (OLD) row.
+
+CREATE OR REPLACE FUNCTION fn_notify_config_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SET search_path = public
+AS $$
+DECLARE
+    rec     RECORD;
+    payload TEXT;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        rec := OLD;
+    ELSE
+        rec := NEW;
+    END IF;
+
+    payload := json_build_object(
+        'table',      TG_TABLE_NAME,
+        'channel_id', rec.channel_id,
+        'op',         TG_OP,
+        'id',         rec.id,
+        'row',        row_to_json(rec)
+    )::text;
+
+    IF octet_length(payload) > 7900 THEN
+        payload := json_build_object(
+            'table',      TG_TABLE_NAME,
+            'channel_id', rec.channel_id,
+            'op',         TG_OP,
+            'id',         rec.id,
+            'truncated',  TRUE
+        )::text;
+    END IF;
+
+    PERFORM pg_notify('config_change', payload);
+    RETURN rec;
+END;
+$$;
+
+-- channels: only default_cooldown changes are of interest to the bot
+CREATE OR REPLACE FUNCTION fn_notify_channel_defaults_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SET search_path = public
+AS $$
+BEGIN
+    IF NEW.default_cooldown IS DISTINCT FROM OLD.default_cooldown THEN
+        PERFORM pg_notify('config_change', json_build_object(
+            'table',      'channels',
+            'channel_id', NEW.channel_id,
+            'op',         TG_OP,
+            'id',         NEW.channel_id,
+            'row',        json_build_object(
+                'channel_id',       NEW.channel_id,
+                'channel_name',     NEW.channel_name,
+                'enabled',          NEW.enabled,
+                'default_cooldown', NEW.default_cooldown,
+                'created_at',       NEW.created_at,
+                'updated_at',       NEW.updated_at
+            )
+        )::text);
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+-- One trigger per table for INSERT, UPDATE and DELETE
+DROP TRIGGER IF EXISTS trg_command_configs_notify ON command_configs;
+DROP TRIGGER IF EXISTS trg_command_configs_notify_delete ON command_configs;
+CREATE TRIGGER trg_command_configs_notify
+    AFTER INSERT OR UPDATE OR DELETE ON command_configs
+    FOR EACH ROW EXECUTE FUNCTION fn_notify_config_change();
+
+DROP TRIGGER IF EXISTS trg_event_configs_notify ON event_configs;
+CREATE TRIGGER trg_event_configs_notify
+    AFTER INSERT OR UPDATE OR DELETE ON event_configs
+    FOR EACH ROW EXECUTE FUNCTION fn_notify_config_change();
+
+DROP TRIGGER IF EXISTS trg_redemption_configs_notify ON redemption_configs;
+CREATE TRIGGER trg_redemption_configs_notify
+    AFTER INSERT OR UPDATE OR DELETE ON redemption_configs
+    FOR EACH ROW EXECUTE FUNCTION fn_notify_config_change();
+
+DROP TRIGGER IF EXISTS trg_timers_notify_change ON timers;
+DROP TRIGGER IF EXISTS trg_timers_notify_delete ON timers;
+CREATE TRIGGER trg_timers_notify_change
+    AFTER INSERT OR UPDATE OR DELETE ON timers
+    FOR EACH ROW EXECUTE FUNCTION fn_notify_config_change();
+
+DROP TRIGGER IF EXISTS trg_message_triggers_notify_change ON message_triggers;
+DROP TRIGGER IF EXISTS trg_message_triggers_notify_delete ON message_triggers;
+CREATE TRIGGER trg_message_triggers_notify_change
+    AFTER INSERT OR UPDATE OR DELETE ON message_triggers
+    FOR EACH ROW EXECUTE FUNCTION fn_notify_config_change();
+
+-- No triggers use it any more
+DROP FUNCTION IF EXISTS fn_notify_config_delete();
@@ -0,0 +1,65 @@
+-- Migration 023: Tombstones and updated_at indexes for incremental config sync
+-- Description: The bot's safety-net sync asks for config rows with
+--              updated_at past its watermark instead of reloading every
+--              channel. Deletes leave no row to find, so an AFTER DELETE
+--              trigger records them in config_tombstones. Tombstones are only
+--              needed for one sync interval; the bot purges old ones.
+
+CREATE TABLE IF NOT EXISTS config_tombstones (
+    id          BIGSERIAL PRIMARY KEY,
+    table_name  TEXT NOT NULL,
+    row_id      TEXT NOT NULL,
+    channel_id  TEXT NOT NULL,
+    deleted_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_config_tombstones_deleted_at ON config_tombstones(deleted_at);
+
+CREATE OR REPLACE FUNCTION fn_record_config_tombstone()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SET search_path = public
+AS $$
+BEGIN
+    INSERT INTO config_tombstones (table_name, row_id, channel_id)
+    VALUES (TG_TABLE_NAME, OLD.id::text, OLD.channel_id);
+    RETURN OLD;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_command_configs_tombstone ON command_configs;
+CREATE TRIGGER trg_command_configs_tombstone
+    AFTER DELETE ON command_configs
+    FOR EACH ROW EXECUTE FUNCTION fn_record_config_tombstone();
+
+DROP TRIGGER IF EXISTS trg_event_configs_tombstone ON event_configs;
+CREATE TRIGGER trg_event_configs_tombstone
+    AFTER DELETE ON event_configs
+    FOR EACH ROW EXECUTE FUNCTION fn_record_config_tombstone();
+
+DROP TRIGGER IF EXISTS trg_redemption_configs_tombstone ON redemption_configs;
+CREATE TRIGGER trg_redemption_configs_tombstone
+    AFTER DELETE ON redemption_configs
+    FOR EACH ROW EXECUTE FUNCTION fn_record_config_tombstone();
+
+DROP TRIGGER IF EXISTS trg_timers_tombstone ON timers;
+CREATE TRIGGER trg_timers_tombstone
+    AFTER DELETE ON timers
+    FOR EACH ROW EXECUTE FUNCTION fn_record_config_tombstone();
+
+DROP TRIGGER IF EXISTS trg_message_triggers_tombstone ON message_triggers;
+CREATE TRIGGER trg_message_triggers_tombstone
+    AFTER DELETE ON message_triggers
+    FOR EACH ROW EXECUTE FUNCTION fn_record_config_tombstone();
+
+-- Watermark lookups (updated_at > $1)
+CREATE INDEX IF NOT EXISTS idx_command_configs_updated_at    ON command_configs(updated_at);
+CREATE INDEX IF NOT EXISTS idx_event_configs_updated_at      ON event_configs(updated_at);
+CREATE INDEX IF NOT EXISTS idx_redemption_configs_updated_at ON redemption_configs(updated_at);
+CREATE INDEX IF NOT EXISTS idx_timers_updated_at             ON timers(updated_at);
+CREATE INDEX IF NOT EXISTS idx_message_triggers_updated_at   ON message_triggers(updated_at);
+CREATE INDEX IF NOT EXISTS idx_channels_updated_at           ON channels(updated_at);
+
+ALTER TABLE config_tombstones ENABLE ROW LEVEL SECURITY;
+GRANT ALL ON config_tombstones TO anon, authenticated, service_role;
+GRANT USAGE, SELECT ON SEQUENCE config_tombstones_id_seq TO anon, authenticated, service_role;
@@ -0,0 +1,73 @@
+-- Migration 024: Connection leases for adaptive pool sizing
+-- Description: The Supabase pooler caps total client connections, shared by
+--              the api, discord and twitch services. An adaptive instance
+--              leases the connections it grows by above its configured
+--              max_size here; fn_lease_pool_connections grants growth only
+--              out of what the budget (the spare client slots) has left
+--              after the other live leases, and drops the lease when nothing
+--              is held. Leases expire after p_ttl_seconds unless renewed,
+--              so a crashed instance frees its share.
+
+CREATE TABLE IF NOT EXISTS db_pool_leases (
+    instance_id  TEXT PRIMARY KEY,
+    service      TEXT NOT NULL,
+    extra        INTEGER NOT NULL,
+    expires_at   TIMESTAMPTZ NOT NULL,
+    updated_at   TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION fn_lease_pool_connections(
+    p_instance    TEXT,
+    p_service     TEXT,
+    p_extra       INTEGER,
+    p_budget      INTEGER,
+    p_ttl_seconds INTEGER
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SET search_path = public
+AS $$
+DECLARE
+    others  INTEGER;
+    granted INTEGER;
+BEGIN
+    -- Serialize lease changes so two instances cannot both take the last slots
+    PERFORM pg_advisory_xact_lock(hashtext('db_pool_leases'));
+
+    DELETE FROM db_pool_leases WHERE expires_at < NOW();
+
+    SELECT COALESCE(SUM(extra), 0) INTO others
+    FROM db_pool_leases
+    WHERE instance_id <> p_instance;
+
+    granted := GREATEST(0, LEAST(p_extra, p_budget - others));
+
+    IF granted = 0 THEN
+        DELETE FROM db_pool_leases WHERE instance_id = p_instance;
+        RETURN 0;
+    END IF;
+
+    INSERT INTO db_pool_leases (instance_id, service, extra, expires_at, updated_at)
+    VALUES (p_instance, p_service, granted, NOW() + make_interval(secs => p_ttl_seconds), NOW())
+    ON CONFLICT (instance_id) DO UPDATE
+        SET service    = EXCLUDED.service,
+            extra      = EXCLUDED.extra,
+            expires_at = EXCLUDED.expires_at,
+            updated_at = NOW();
+
+    RETURN granted;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION fn_release_pool_lease(p_instance TEXT)
+RETURNS VOID
+LANGUAGE plpgsql
+SET search_path = public
+AS $$
+BEGIN
+    DELETE FROM db_pool_leases WHERE instance_id = p_instance;
+END;
+$$;
+
+ALTER TABLE db_pool_leases ENABLE ROW LEVEL SECURITY;
+GRANT ALL ON db_pool_leases TO anon, authenticated, service_role;
@@ -0,0 +1,170 @@
+"""Reusable PostgreSQL LISTEN/NOTIFY helper with auto-reconnect.
+
+Uses a dedicated connection (asyncpg.connect) instead of borrowing from
+the shared pool, so LISTEN channels don't consume pool slots. One
+``PgListener`` multiplexes any number of NOTIFY channels over that single
+connection and shares one keepalive; the cache bus (``shared.cache_bus``)
+registers its channel on the same listener as the service's own handlers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[..., Coroutine[Any, Any, None] | None]
+ResyncHook = Callable[[], Coroutine[Any, Any, None] | None]
+
+
+class PgListener:
+    """One LISTEN connection dispatching to per-channel handlers.
+
+    Handlers are asyncpg listener callbacks ``(connection, pid, channel,
+    payload)``, sync or async. Resync hooks run after every reconnect, in
+    registration order, because notifications sent while the connection was
+    down are lost; each hook should reload only what those could have
+    changed.
+
+    Args:
+        dsn: PostgreSQL connection string.
+        keepalive_interval: Seconds between keepalive pings (default 15).
+            Shorter than Supavisor's client_heartbeat_interval to prevent
+            the proxy from marking LISTEN connections as dead.
+        reconnect_delay: Seconds to wait before reconnect after error.
+    """
+
+    def __init__(self, dsn: str, *, keepalive_interval: int = 15, reconnect_delay: int = 10):
+        self._dsn = dsn
+        self._keepalive_interval = keepalive_interval
+        self._reconnect_delay = reconnect_delay
+        self._handlers: list[tuple[str, Handler]] = []
+        self._resync_hooks: list[ResyncHook] = []
+        self._connection: asyncpg.Connection | None = None
+        self._task: asyncio.Task | None = None
+        self._resync_task: asyncio.Task | None = None
+        self.connects = 0
+        self.resyncs = 0
+
+    @property
+    def channels(self) -> list[str]:
+        return list(dict.fromkeys(channel for channel, _ in self._handlers))
+
+    @property
+    def connected(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+
+    def add(self, channel: str, handler: Handler) -> PgListener:
+        """Register *handler* for NOTIFY *channel* (also while already connected)."""
+        self._handlers.append((channel, handler))
+        if self.connected:
+            asyncio.create_task(self._connection.add_listener(channel, handler))  # type: ignore[union-attr]
+        return self
+
+    def on_reconnect(self, hook: ResyncHook) -> PgListener:
+        """Register a hook that re-reads state after a reconnect gap."""
+        self._resync_hooks.append(hook)
+        return self
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> None:
+        """Listen until cancelled, reconnecting on error."""
+        # Set once any connect attempt failed or a connection dropped
+        gap = False
+        while True:
+            try:
+                self._connection = await asyncpg.connect(self._dsn, ssl="require")
+                for channel, handler in self._handlers:
+                    await self._connection.add_listener(channel, handler)
+                self.connects += 1
+                logger.info(f"PostgreSQL LISTEN active on {self.channels}")
+                if gap and (self._resync_task is None or self._resync_task.done()):
+                    # In the background, so the keepalive keeps running
+                    self._resync_task = asyncio.create_task(self._resync())
+
+                while True:
+                    await asyncio.sleep(self._keepalive_interval)
+                    await self._connection.execute("SELECT 1")
+
+            except asyncio.CancelledError:
+                logger.info(f"PostgreSQL LISTEN {self.channels} shutting down...")
+                break
+            except Exception as e:
+                gap = True
+                logger.error(f"Error in PostgreSQL LISTEN {self.channels}: {e}")
+                logger.warning(f"Reconnecting to PostgreSQL LISTEN in {self._reconnect_delay}s...")
+                try:
+                    await asyncio.sleep(self._reconnect_delay)
+                except asyncio.CancelledError:
+                    break
+            finally:
+                await self._close()
+
+    async def _resync(self) -> None:
+        self.resyncs += 1
+        for hook in self._resync_hooks:
+            try:
+                result = hook()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"LISTEN resync hook {hook.__qualname__} failed: {e}")
+
+    async def _close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        for channel, handler in self._handlers:
+            try:
+                await connection.remove_listener(channel, handler)
+            except Exception:
+                pass
+        try:
+            await connection.close()
+        except Exception:
+            pass
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "channels": self.channels,
+            "connects": self.connects,
+            "resyncs": self.resyncs,
+        }
+
+
+async def pg_listen(
+    dsn: str,
+    channel: str,
+    handler: Handler,
+    *,
+    keepalive_interval: int = 15,
+    reconnect_delay: int = 10,
+) -> None:
+    """Listen on a single PostgreSQL NOTIFY channel with auto-reconnect.
+
+    Shorthand for a ``PgListener`` with one channel; prefer one shared
+    ``PgListener`` when a process listens on several channels.
+    """
+    listener = PgListener(
+        dsn, keepalive_interval=keepalive_interval, reconnect_delay=reconnect_delay
+    )
+    await listener.add(channel, handler).run()
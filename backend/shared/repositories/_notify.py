@@ -0,0 +1,26 @@
+"""Helpers for row payloads carried by ``config_change`` notifications (migration 022)."""
+
+from __future__ import annotations
+
+from dataclasses import fields
+from datetime import datetime
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def model_from_json_row(model: type[T], row: dict[str, Any]) -> T:
+    """Build a dataclass model from ``row_to_json`` output.
+
+    Columns the model does not declare are dropped, and ISO timestamps in
+    ``*_at`` fields are parsed back into datetimes.
+    """
+    values: dict[str, Any] = {}
+    for f in fields(model):  # type: ignore[arg-type]
+        if f.name not in row:
+            continue
+        value = row[f.name]
+        if f.name.endswith("_at") and isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        values[f.name] = value
+    return model(**values)
@@ -2,20 +2,21 @@
 
 from __future__ import annotations
 
+import json
 import logging
 from datetime import datetime, timedelta
 
 import asyncpg
 
-from shared.cache import AsyncTTLCache, cached
+from shared.cache import AsyncTTLCache, cached, channel_tag, channel_tags
 
 logger = logging.getLogger(__name__)
 
 # --- In-process caches ---
-_session_cache = AsyncTTLCache(maxsize=32, ttl=10)
-_summary_cache = AsyncTTLCache(maxsize=32, ttl=120)
-_top_commands_cache = AsyncTTLCache(maxsize=32, ttl=120)
-_top_chatters_cache = AsyncTTLCache(maxsize=32, ttl=120)
+_session_cache = AsyncTTLCache(maxsize=32, ttl=10, name="active_session")
+_summary_cache = AsyncTTLCache(maxsize=32, ttl=120, name="analytics_summary")
+_top_commands_cache = AsyncTTLCache(maxsize=32, ttl=120, name="top_commands")
+_top_chatters_cache = AsyncTTLCache(maxsize=32, ttl=120, name="top_chatters")
 
 
 class AnalyticsRepository:
@@ -58,7 +59,11 @@ class AnalyticsRepository:
             _session_cache.invalidate(f"active:{channel_id}")
             return int(session_id)
 
-    @cached(cache=_session_cache, key_func=lambda self, channel_id: f"active:{channel_id}")
+    @cached(
+        cache=_session_cache,
+        key_func=lambda self, channel_id: f"active:{channel_id}",
+        tags_func=channel_tags,
+    )
     async def get_active_session(self, channel_id: str) -> dict | None:
         """Get the currently active (un-ended) session for a channel."""
         async with self.pool.acquire() as conn:
@@ -77,12 +82,13 @@ class AnalyticsRepository:
     async def end_session(self, session_id: int, ended_at: datetime) -> None:
         """Mark a session as ended."""
         async with self.pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE stream_sessions SET ended_at = $1 WHERE id = $2",
+            channel_id = await conn.fetchval(
+                "UPDATE stream_sessions SET ended_at = $1 WHERE id = $2 RETURNING channel_id",
                 ended_at,
                 session_id,
             )
-        _session_cache.clear()
+        if channel_id is not None:
+            _session_cache.invalidate_tag(channel_tag(channel_id))
 
     async def close_stale_sessions(self, max_hours: int = 12) -> int:
         """Close sessions that have been running longer than max_hours without ended_at.
@@ -108,77 +114,66 @@ class AnalyticsRepository:
 
     # ==================== Event Recording ====================
 
-    async def record_command_usage(
-        self, session_id: int, channel_id: str, command_name: str
+    async def record_command_usage_batch(
+        self, rows: list[tuple[int, str, str, int, datetime]]
     ) -> None:
-        """Increment (or create) a command usage counter for a session."""
+        """Upsert aggregated command usage counters in a single statement.
+
+        Args:
+            rows: (session_id, channel_id, command_name, count, last_used_at) tuples,
+                unique per (session_id, command_name).
+        """
+        if not rows:
+            return
+
         async with self.pool.acquire() as conn:
             await conn.execute(
                 """
                 INSERT INTO command_stats (session_id, channel_id, command_name, usage_count, last_used_at)
-                VALUES ($1, $2, $3, 1, NOW())
+                SELECT * FROM unnest($1::int[], $2::text[], $3::text[], $4::int[], $5::timestamptz[])
                 ON CONFLICT (session_id, command_name)
                 DO UPDATE SET
-                    usage_count  = command_stats.usage_count + 1,
-                    last_used_at = NOW()
+                    usage_count  = command_stats.usage_count + EXCLUDED.usage_count,
+                    last_used_at = GREATEST(command_stats.last_used_at, EXCLUDED.last_used_at)
                 """,
-                session_id,
-                channel_id,
-                command_name,
+                [r[0] for r in rows],
+                [r[1] for r in rows],
+                [r[2] for r in rows],
+                [r[3] for r in rows],
+                [r[4] for r in rows],
             )
 
-    async def record_follow_event(
+    async def record_stream_events_batch(
         self,
-        session_id: int,
-        channel_id: str,
-        user_id: str,
-        username: str,
-        display_name: str | None,
-        occurred_at: datetime,
+        rows: list[tuple[int, str, str, str, str, str | None, dict | None, datetime]],
     ) -> None:
-        """Record a follow event."""
-        async with self.pool.acquire() as conn:
-            await conn.execute(
-                """
-                INSERT INTO stream_events
-                    (session_id, channel_id, event_type, user_id, username, display_name, occurred_at)
-                VALUES ($1, $2, 'follow', $3, $4, $5, $6)
-                """,
-                session_id,
-                channel_id,
-                user_id,
-                username,
-                display_name,
-                occurred_at,
-            )
+        """Insert follow / subscribe events in a single statement.
+
+        Args:
+            rows: (session_id, channel_id, event_type, user_id, username,
+                display_name, metadata, occurred_at) tuples.
+        """
+        if not rows:
+            return
 
-    async def record_subscribe_event(
-        self,
-        session_id: int,
-        channel_id: str,
-        user_id: str,
-        username: str,
-        display_name: str | None,
-        tier: str,
-        is_gift: bool,
-        occurred_at: datetime,
-    ) -> None:
-        """Record a subscribe event."""
-        metadata = {"tier": tier, "is_gift": is_gift}
         async with self.pool.acquire() as conn:
             await conn.execute(
                 """
                 INSERT INTO stream_events
                     (session_id, channel_id, event_type, user_id, username, display_name, metadata, occurred_at)
-                VALUES ($1, $2, 'subscribe', $3, $4, $5, $6, $7)
+                SELECT s, c, t, u, n, d, m::jsonb, o
+                FROM unnest($1::int[], $2::text[], $3::text[], $4::text[], $5::text[],
+                            $6::text[], $7::text[], $8::timestamptz[])
+                    AS x(s, c, t, u, n, d, m, o)
                 """,
-                session_id,
-                channel_id,
-                user_id,
-                username,
-                display_name,
-                metadata,
-                occurred_at,
+                [r[0] for r in rows],
+                [r[1] for r in rows],
+                [r[2] for r in rows],
+                [r[3] for r in rows],
+                [r[4] for r in rows],
+                [r[5] for r in rows],
+                [json.dumps(r[6]) if r[6] is not None else None for r in rows],
+                [r[7] for r in rows],
             )
 
     async def record_raid_event(
@@ -216,6 +211,7 @@ class AnalyticsRepository:
     @cached(
         cache=_summary_cache,
         key_func=lambda self, channel_id, days=30: f"summary:{channel_id}:{days}",
+        tags_func=channel_tags,
     )
     async def get_summary(self, channel_id: str, days: int = 30) -> dict:
         """Get analytics summary for a channel over the given time window."""
@@ -348,6 +344,7 @@ class AnalyticsRepository:
         key_func=lambda self, channel_id, days=30, limit=10: (
             f"top_cmds:{channel_id}:{days}:{limit}"
         ),
+        tags_func=channel_tags,
     )
     async def list_top_commands(
         self, channel_id: str, days: int = 30, limit: int = 10
@@ -388,42 +385,48 @@ class AnalyticsRepository:
         self,
         session_id: int,
         channel_id: str,
-        chatters: dict[str, dict],
+        chatters: list[tuple[str, str, int, datetime]],
     ) -> None:
-        """Batch-insert chatter stats for a completed session.
+        """Upsert incremental chatter stats for a session in a single statement.
+
+        Counts are deltas since the previous flush and are added to the stored
+        totals, so the bot can checkpoint periodically during a stream.
 
         Args:
-            chatters: {user_id: {"username": str, "count": int, "last_at": datetime}}
+            chatters: (user_id, username, count, last_at) tuples
         """
         if not chatters:
             return
 
-        rows = [
-            (session_id, channel_id, user_id, data["username"], data["count"], data["last_at"])
-            for user_id, data in chatters.items()
-        ]
-
         async with self.pool.acquire() as conn:
-            await conn.executemany(
+            await conn.execute(
                 """
                 INSERT INTO chatter_stats
                     (session_id, channel_id, user_id, username, message_count, last_message_at)
-                VALUES ($1, $2, $3, $4, $5, $6)
+                SELECT $1, $2, u.user_id, u.username, u.message_count, u.last_message_at
+                FROM unnest($3::text[], $4::text[], $5::int[], $6::timestamptz[])
+                    AS u(user_id, username, message_count, last_message_at)
                 ON CONFLICT (session_id, user_id) DO UPDATE SET
-                    username       = EXCLUDED.username,
-                    message_count  = EXCLUDED.message_count,
-                    last_message_at = EXCLUDED.last_message_at
+                    username        = EXCLUDED.username,
+                    message_count   = chatter_stats.message_count + EXCLUDED.message_count,
+                    last_message_at = GREATEST(chatter_stats.last_message_at, EXCLUDED.last_message_at)
                 """,
-                rows,
+                session_id,
+                channel_id,
+                [c[0] for c in chatters],
+                [c[1] for c in chatters],
+                [c[2] for c in chatters],
+                [c[3] for c in chatters],
             )
 
-        logger.info(f"Flushed chatter stats for session {session_id}: {len(rows)} chatters")
+        logger.debug(f"Flushed chatter stats for session {session_id}: {len(chatters)} chatters")
 
     @cached(
         cache=_top_chatters_cache,
         key_func=lambda self, channel_id, days=30, limit=10: (
             f"top_chatters:{channel_id}:{days}:{limit}"
         ),
+        tags_func=channel_tags,
     )
     async def list_top_chatters(
         self, channel_id: str, days: int = 30, limit: int = 10
@@ -523,8 +526,8 @@ class AnalyticsRepository:
                     updated += 1
 
         if updated:
-            _session_cache.clear()
-            _summary_cache.clear()
+            _session_cache.invalidate_tag(channel_tag(channel_id))
+            _summary_cache.invalidate_tag(channel_tag(channel_id))
         return updated
 
     # ==================== VOD Sync ====================
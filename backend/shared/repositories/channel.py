@@ -6,17 +6,18 @@ import logging
 
 import asyncpg
 
-from shared.cache import AsyncTTLCache, cached
+from shared.cache import AsyncTTLCache, BatchLoader, cached, channel_tags
 from shared.models.channel import Channel, DiscordUser, Token
 
 logger = logging.getLogger(__name__)
 
 # --- In-process caches ---
 # Long TTL for memory-first reads; freshness via pg_notify + periodic refresh.
-_token_cache = AsyncTTLCache(maxsize=64, ttl=3600)
-_channel_cache = AsyncTTLCache(maxsize=64, ttl=3600)
-_enabled_channels_cache = AsyncTTLCache(maxsize=1, ttl=3600)
-_discord_user_cache = AsyncTTLCache(maxsize=64, ttl=300)
+# Tokens are never written to the on-disk cache snapshot
+_token_cache = AsyncTTLCache(maxsize=64, ttl=3600, name="token", persist=False)
+_channel_cache = AsyncTTLCache(maxsize=64, ttl=3600, name="channel")
+_enabled_channels_cache = AsyncTTLCache(maxsize=1, ttl=3600, name="enabled_channels")
+_discord_user_cache = AsyncTTLCache(maxsize=64, ttl=300, name="discord_user")
 
 
 class ChannelRepository:
@@ -24,6 +25,7 @@ class ChannelRepository:
 
     def __init__(self, pool: asyncpg.Pool) -> None:
         self.pool = pool
+        self._channel_loader: BatchLoader[str, Channel] = BatchLoader(self._fetch_channels)
 
     # ==================== Token Operations ====================
 
@@ -115,18 +117,24 @@ class ChannelRepository:
 
     # ==================== Channel Operations ====================
 
-    @cached(cache=_channel_cache, key_func=lambda self, channel_id: f"channel:{channel_id}")
+    @cached(
+        cache=_channel_cache,
+        key_func=lambda self, channel_id: f"channel:{channel_id}",
+        tags_func=channel_tags,
+        soft_ttl=1800,
+    )
     async def get_channel(self, channel_id: str) -> Channel | None:
-        """Get a single channel by ID."""
+        """Get a single channel by ID (concurrent misses share one query)."""
+        return await self._channel_loader.load(channel_id)
+
+    async def _fetch_channels(self, channel_ids: list[str]) -> dict[str, Channel]:
         async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                "SELECT channel_id, channel_name, enabled, default_cooldown,created_at, updated_at "
-                "FROM channels WHERE channel_id = $1",
-                channel_id,
+            rows = await conn.fetch(
+                "SELECT channel_id, channel_name, enabled, default_cooldown, created_at, updated_at "
+                "FROM channels WHERE channel_id = ANY($1::text[])",
+                channel_ids,
             )
-            if not row:
-                return None
-            return Channel(**dict(row))
+        return {row["channel_id"]: Channel(**dict(row)) for row in rows}
 
     @cached(
         cache=_enabled_channels_cache,
@@ -148,9 +156,16 @@ class ChannelRepository:
         get_channel() has stale data for fallback during DB outages.
         """
         for ch in channels:
-            _channel_cache.set(f"channel:{ch.channel_id}", ch)
+            _channel_cache.set(f"channel:{ch.channel_id}", ch, channel_tags(self, ch.channel_id))
         return len(channels)
 
+    def apply_change(self, channel: Channel) -> None:
+        """Install a channel row from a config_change delta (no query)."""
+        _channel_cache.set(
+            f"channel:{channel.channel_id}", channel, channel_tags(self, channel.channel_id)
+        )
+        _enabled_channels_cache.clear(publish=False)
+
     async def list_all_channels(self) -> list[Channel]:
         """Return all channels (including disabled)."""
         async with self.pool.acquire() as conn:
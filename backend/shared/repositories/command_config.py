@@ -4,20 +4,42 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from dataclasses import dataclass
 from typing import TypeAlias
 
 import asyncpg
 
-from shared.cache import AsyncTTLCache, cached
+from shared.cache import (
+    BatchLoader,
+    PartitionedTTLCache,
+    cached,
+    channel_tag,
+    channel_tags,
+)
 from shared.models.command_config import CommandConfig, RedemptionConfig
 
 logger = logging.getLogger(__name__)
 
 # In-process caches — long TTL for memory-first reads.
 # Freshness is maintained by pg_notify (instant) + periodic refresh (5 min safety net).
-_cmd_cache = AsyncTTLCache(maxsize=128, ttl=3600)
-_cmd_list_cache = AsyncTTLCache(maxsize=32, ttl=3600)
-_redemption_cache = AsyncTTLCache(maxsize=64, ttl=3600)
+# Partitioned per channel under a byte budget, so warming one channel's
+# commands never evicts another channel's.
+_cmd_cache = PartitionedTTLCache(max_bytes=8 * 1024 * 1024, ttl=3600, name="cmd_config")
+_cmd_list_cache = PartitionedTTLCache(max_bytes=8 * 1024 * 1024, ttl=3600, name="cmd_list")
+_redemption_cache = PartitionedTTLCache(max_bytes=2 * 1024 * 1024, ttl=3600, name="redemption")
+
+
+@dataclass(frozen=True, slots=True)
+class CommandRoute:
+    """Routing table entry: a command config with its effective cooldown resolved."""
+
+    config: CommandConfig
+    cooldown: int  # command override, or the channel default when unset
+
+
+# Per-channel routing tables: {channel_id: {name_or_alias: CommandRoute}}.
+# Built by warm_cache() and replaced wholesale, so readers never see a partial table.
+_routes: dict[str, dict[str, CommandRoute]] = {}
 
 _CMD_COLUMNS = (
     "id, channel_id, command_name, command_type, enabled, "
@@ -78,23 +100,37 @@ class CommandConfigRepository:
 
     def __init__(self, pool: asyncpg.Pool) -> None:
         self.pool = pool
+        self._config_loader: BatchLoader[tuple[str, str], CommandConfig] = BatchLoader(
+            self._fetch_configs
+        )
 
     @cached(
         cache=_cmd_cache,
         key_func=lambda self, channel_id, command_name: f"cmd_config:{channel_id}:{command_name}",
+        tags_func=channel_tags,
+        soft_ttl=1800,
     )
     async def get_config(self, channel_id: str, command_name: str) -> CommandConfig | None:
-        """Get a single command config by exact name (with cache). Used by the bot at command time."""
+        """Get a single command config by exact name (with cache). Used by the bot at command time.
+
+        Concurrent misses, across channels, are batched into one query.
+        """
+        return await self._config_loader.load((channel_id, command_name))
+
+    async def _fetch_configs(
+        self, keys: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], CommandConfig]:
         async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                f"SELECT {_CMD_COLUMNS} "
-                "FROM command_configs WHERE channel_id = $1 AND command_name = $2",
-                channel_id,
-                command_name,
+            rows = await conn.fetch(
+                f"SELECT {_CMD_COLUMNS} FROM command_configs "
+                "WHERE (channel_id, command_name) IN "
+                "(SELECT * FROM unnest($1::text[], $2::text[]))",
+                [channel_id for channel_id, _ in keys],
+                [command_name for _, command_name in keys],
             )
-            if not row:
-                return None
-            return CommandConfig(**dict(row))
+        return {
+            (row["channel_id"], row["command_name"]): CommandConfig(**dict(row)) for row in rows
+        }
 
     async def find_by_name_or_alias(self, channel_id: str, name: str) -> CommandConfig | None:
         """Find a command config by command_name OR by alias match.
@@ -113,6 +149,8 @@ class CommandConfigRepository:
     @cached(
         cache=_cmd_cache,
         key_func=lambda self, channel_id, name: f"cmd_alias:{channel_id}:{name}",
+        tags_func=channel_tags,
+        soft_ttl=1800,
     )
     async def _find_by_alias(self, channel_id: str, name: str) -> CommandConfig | None:
         """Search for a command config by alias."""
@@ -132,6 +170,7 @@ class CommandConfigRepository:
     @cached(
         cache=_cmd_list_cache,
         key_func=lambda self, channel_id: f"cmd_list:{channel_id}",
+        tags_func=channel_tags,
     )
     async def list_configs(self, channel_id: str) -> list[CommandConfig]:
         """Get all command configs for a channel."""
@@ -189,20 +228,16 @@ class CommandConfigRepository:
                     cd_provided,
                 )
                 result = CommandConfig(**dict(row))
-                # Invalidate name, alias, and list caches
-                _cmd_cache.invalidate(f"cmd_config:{channel_id}:{command_name}")
+                # Invalidate the channel's name/alias entries (including aliases
+                # this update removed) and its list cache
+                _cmd_cache.invalidate_tag(channel_tag(channel_id))
                 _cmd_list_cache.invalidate(f"cmd_list:{channel_id}")
-                if aliases:
-                    for alias in aliases.split(","):
-                        _cmd_cache.invalidate(f"cmd_alias:{channel_id}:{alias.strip()}")
                 return result
 
         return await _retry_on_db_error(_query)
 
     async def delete_config(self, channel_id: str, command_name: str) -> bool:
         """Delete a command config (custom commands only). Returns True if deleted."""
-        # Get config first for cache invalidation
-        config = await self.get_config(channel_id, command_name)
 
         async def _query():
             async with self.pool.acquire() as conn:
@@ -212,11 +247,8 @@ class CommandConfigRepository:
                     channel_id,
                     command_name,
                 )
-                _cmd_cache.invalidate(f"cmd_config:{channel_id}:{command_name}")
+                _cmd_cache.invalidate_tag(channel_tag(channel_id))
                 _cmd_list_cache.invalidate(f"cmd_list:{channel_id}")
-                if config and config.aliases:
-                    for alias in config.aliases.split(","):
-                        _cmd_cache.invalidate(f"cmd_alias:{channel_id}:{alias.strip()}")
                 return result == "DELETE 1"
 
         return await _retry_on_db_error(_query)
@@ -250,25 +282,123 @@ class CommandConfigRepository:
 
         return await self.list_configs(channel_id)
 
-    async def warm_cache(self, channel_id: str) -> int:
+    async def warm_cache(self, channel_id: str, *, default_cooldown: int = 0) -> int:
         """Proactively load all command configs for a channel into the in-memory cache.
 
         Populates both exact-name keys and alias keys so that runtime lookups
-        are O(1) memory access with zero DB dependency.
+        are O(1) memory access with zero DB dependency, and swaps in a fresh
+        routing table for ``resolve()``. *default_cooldown* is the channel
+        default applied to configs without a cooldown override.
 
         Returns the number of configs warmed.
         """
+        _cmd_list_cache.invalidate(f"cmd_list:{channel_id}", publish=False)
         configs = await self.list_configs(channel_id)
+        self._install(channel_id, configs, default_cooldown, refresh_entries=False)
+        return len(configs)
+
+    def _install(
+        self,
+        channel_id: str,
+        configs: list[CommandConfig],
+        default_cooldown: int,
+        *,
+        refresh_entries: bool = True,
+    ) -> None:
+        """Swap in the channel's routing table and name/alias cache entries for *configs*.
+
+        With *refresh_entries*, the channel's cached list and previous
+        name/alias entries (including removed aliases) are replaced too.
+        """
+        tags = (channel_tag(channel_id),)
+        if refresh_entries:
+            _cmd_list_cache.set(f"cmd_list:{channel_id}", configs, tags)
+            _cmd_cache.invalidate_tag(channel_tag(channel_id), publish=False)
+
+        table: dict[str, CommandRoute] = {}
+        for cfg in configs:
+            route = CommandRoute(
+                config=cfg,
+                cooldown=cfg.cooldown if cfg.cooldown is not None else default_cooldown,
+            )
+            # Exact names take precedence over aliases of other commands
+            table[cfg.command_name] = route
+            if cfg.aliases:
+                for alias in cfg.aliases.split(","):
+                    alias = alias.strip()
+                    if alias:
+                        table.setdefault(alias, route)
+        _routes[channel_id] = table
+
         for cfg in configs:
             # Populate exact name cache
-            _cmd_cache.set(f"cmd_config:{channel_id}:{cfg.command_name}", cfg)
+            _cmd_cache.set(f"cmd_config:{channel_id}:{cfg.command_name}", cfg, tags)
             # Populate alias cache entries
             if cfg.aliases:
                 for alias in cfg.aliases.split(","):
                     alias = alias.strip()
                     if alias:
-                        _cmd_cache.set(f"cmd_alias:{channel_id}:{alias}", cfg)
-        return len(configs)
+                        _cmd_cache.set(f"cmd_alias:{channel_id}:{alias}", cfg, tags)
+
+    def apply_change(
+        self,
+        channel_id: str,
+        config_id: int,
+        config: CommandConfig | None,
+        *,
+        default_cooldown: int,
+    ) -> bool:
+        """Patch a warmed channel in place from a config_change delta (no query).
+
+        *config* is the new row, or None when it was deleted. Returns False
+        when the channel's config list is not cached; the caller should
+        ``warm_cache()`` instead.
+        """
+        current = _cmd_list_cache.get(f"cmd_list:{channel_id}")
+        if not isinstance(current, list):
+            return False
+        configs = [c for c in current if c.id != config_id]
+        if config is not None:
+            configs.append(config)
+            configs.sort(key=lambda c: (c.command_type, c.command_name))
+        self._install(channel_id, configs, default_cooldown)
+        return True
+
+    def reroute(self, channel_id: str, *, default_cooldown: int) -> bool:
+        """Rebuild the routing table after a channel default cooldown change (no query)."""
+        current = _cmd_list_cache.get(f"cmd_list:{channel_id}")
+        if not isinstance(current, list):
+            return False
+        self._install(channel_id, current, default_cooldown, refresh_entries=False)
+        return True
+
+    async def get_config_by_id(self, config_id: int) -> CommandConfig | None:
+        """Fetch one config by primary key, bypassing the cache (NOTIFY fallback)."""
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                f"SELECT {_CMD_COLUMNS} FROM command_configs WHERE id = $1", config_id
+            )
+            return CommandConfig(**dict(row)) if row else None
+
+    @staticmethod
+    def resolve(channel_id: str, name: str) -> CommandRoute | None:
+        """Look up a command by name or alias in the channel's routing table.
+
+        Pure memory access (no await, no DB fallback). Returns None when the
+        name is unknown or the channel has not been warmed yet.
+        """
+        table = _routes.get(channel_id)
+        return table.get(name) if table is not None else None
+
+    @staticmethod
+    def has_routes(channel_id: str) -> bool:
+        """Return True once warm_cache() has built a routing table for the channel."""
+        return channel_id in _routes
+
+    @staticmethod
+    def drop_routes(channel_id: str) -> None:
+        """Discard the routing table for a channel (e.g. after unsubscribing)."""
+        _routes.pop(channel_id, None)
 
 
 class RedemptionConfigRepository:
@@ -297,6 +427,7 @@ class RedemptionConfigRepository:
         key_func=lambda self, channel_id, reward_name: (
             f"redemption:{channel_id}:{reward_name.lower()}"
         ),
+        tags_func=channel_tags,
     )
     async def find_by_reward_name(
         self, channel_id: str, reward_name: str
@@ -345,7 +476,7 @@ class RedemptionConfigRepository:
                     enabled,
                 )
                 result = RedemptionConfig(**dict(row))
-                _redemption_cache.clear()
+                _redemption_cache.invalidate_tag(channel_tag(channel_id))
                 return result
 
         return await _retry_on_db_error(_query)
@@ -0,0 +1,124 @@
+"""Incremental config change feed: rows past an updated_at watermark plus tombstones."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+import asyncpg
+
+from shared.models.channel import Channel
+from shared.models.command_config import CommandConfig
+from shared.repositories.command_config import _CMD_COLUMNS
+from shared.repositories.event_config import _SELECT_COLS as _EVENT_COLUMNS
+from shared.repositories.event_config import _row_to_config as _event_from_row
+
+# Writers stamp updated_at with their transaction's start time, so a row can
+# become visible after a sync has already moved past its timestamp. Each pass
+# re-reads this much history; applying a change twice is harmless.
+WATERMARK_OVERLAP = timedelta(seconds=60)
+
+# Tables whose changes are applied per row; the others only need to know
+# which channels changed.
+_ROW_QUERIES: dict[str, tuple[str, Any]] = {
+    "command_configs": (
+        f"SELECT {_CMD_COLUMNS} FROM command_configs",
+        lambda row: CommandConfig(**dict(row)),
+    ),
+    "event_configs": (f"SELECT {_EVENT_COLUMNS} FROM event_configs", _event_from_row),
+    "channels": (
+        "SELECT channel_id, channel_name, enabled, default_cooldown, created_at, updated_at "
+        "FROM channels",
+        lambda row: Channel(**dict(row)),
+    ),
+}
+_ID_ONLY_TABLES = ("redemption_configs", "timers", "message_triggers")
+
+
+@dataclass
+class ConfigChange:
+    """One changed config row.
+
+    ``op`` is ``UPSERT`` (row inserted or updated; ``row`` holds the model, or
+    None for tables applied per channel) or ``DELETE`` (from a tombstone;
+    ``row`` is None).
+    """
+
+    table: str
+    channel_id: str
+    op: str
+    row_id: Any
+    row: Any = None
+
+
+class ConfigSyncRepository:
+    """Pure SQL reads for the bot's incremental config sync."""
+
+    def __init__(self, pool: asyncpg.Pool) -> None:
+        self.pool = pool
+
+    async def now(self) -> datetime:
+        """Database clock, used as the initial watermark."""
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval("SELECT NOW()")
+
+    async def changes_since(
+        self, since: datetime, channel_ids: list[str]
+    ) -> tuple[list[ConfigChange], datetime]:
+        """Return changes for *channel_ids* after *since*, and the next watermark.
+
+        All tables are read in one repeatable-read snapshot whose start time
+        becomes the next watermark, so nothing committed in between is missed.
+        """
+        after = since - WATERMARK_OVERLAP
+        changes: list[ConfigChange] = []
+        async with self.pool.acquire() as conn:
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                watermark = await conn.fetchval("SELECT NOW()")
+                for table, (select, to_model) in _ROW_QUERIES.items():
+                    rows = await conn.fetch(
+                        f"{select} WHERE updated_at > $1 AND channel_id = ANY($2::text[])",
+                        after,
+                        channel_ids,
+                    )
+                    changes.extend(
+                        ConfigChange(
+                            table,
+                            row["channel_id"],
+                            "UPSERT",
+                            row["channel_id"] if table == "channels" else row["id"],
+                            to_model(row),
+                        )
+                        for row in rows
+                    )
+                for table in _ID_ONLY_TABLES:
+                    rows = await conn.fetch(
+                        f"SELECT id, channel_id FROM {table} "
+                        "WHERE updated_at > $1 AND channel_id = ANY($2::text[])",
+                        after,
+                        channel_ids,
+                    )
+                    changes.extend(
+                        ConfigChange(table, row["channel_id"], "UPSERT", row["id"]) for row in rows
+                    )
+                rows = await conn.fetch(
+                    "SELECT table_name, row_id, channel_id FROM config_tombstones "
+                    "WHERE deleted_at > $1 AND channel_id = ANY($2::text[]) ORDER BY id",
+                    after,
+                    channel_ids,
+                )
+                changes.extend(
+                    ConfigChange(row["table_name"], row["channel_id"], "DELETE", int(row["row_id"]))
+                    for row in rows
+                )
+        return changes, watermark
+
+    async def purge_tombstones(self, older_than: timedelta) -> int:
+        """Delete tombstones no sync pass can still need. Returns rows removed."""
+        async with self.pool.acquire() as conn:
+            result = await conn.execute(
+                "DELETE FROM config_tombstones WHERE deleted_at < NOW() - $1::interval",
+                older_than,
+            )
+        return int(result.split()[-1])
@@ -7,14 +7,15 @@ import logging
 
 import asyncpg
 
-from shared.cache import AsyncTTLCache, cached
+from shared.cache import BatchLoader, PartitionedTTLCache, cached, channel_tag, channel_tags
 from shared.models.event_config import EventConfig
 
 logger = logging.getLogger(__name__)
 
 # In-process cache for bot-side lookups — long TTL for memory-first reads.
-_config_cache = AsyncTTLCache(maxsize=64, ttl=3600)
-_config_list_cache = AsyncTTLCache(maxsize=16, ttl=3600)
+# Partitioned per channel under a byte budget (see PartitionedTTLCache).
+_config_cache = PartitionedTTLCache(max_bytes=2 * 1024 * 1024, ttl=3600, name="event_config")
+_config_list_cache = PartitionedTTLCache(max_bytes=2 * 1024 * 1024, ttl=3600, name="event_list")
 _seeded_events: set[str] = set()
 
 # Default templates per event type
@@ -53,27 +54,40 @@ class EventConfigRepository:
 
     def __init__(self, pool: asyncpg.Pool) -> None:
         self.pool = pool
+        self._config_loader: BatchLoader[tuple[str, str], EventConfig] = BatchLoader(
+            self._fetch_configs
+        )
 
     @cached(
         cache=_config_cache,
         key_func=lambda self, channel_id, event_type: f"event_config:{channel_id}:{event_type}",
+        tags_func=channel_tags,
+        soft_ttl=1800,
     )
     async def get_config(self, channel_id: str, event_type: str) -> EventConfig | None:
-        """Get a single event config (with cache). Used by the bot at event time."""
+        """Get a single event config (with cache). Used by the bot at event time.
+
+        Concurrent misses, across channels, are batched into one query.
+        """
+        return await self._config_loader.load((channel_id, event_type))
+
+    async def _fetch_configs(
+        self, keys: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], EventConfig]:
         async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                f"SELECT {_SELECT_COLS} "
-                "FROM event_configs WHERE channel_id = $1 AND event_type = $2",
-                channel_id,
-                event_type,
+            rows = await conn.fetch(
+                f"SELECT {_SELECT_COLS} FROM event_configs "
+                "WHERE (channel_id, event_type) IN "
+                "(SELECT * FROM unnest($1::text[], $2::text[]))",
+                [channel_id for channel_id, _ in keys],
+                [event_type for _, event_type in keys],
             )
-            if not row:
-                return None
-            return _row_to_config(row)
+        return {(row["channel_id"], row["event_type"]): _row_to_config(row) for row in rows}
 
     @cached(
         cache=_config_list_cache,
         key_func=lambda self, channel_id: f"event_list:{channel_id}",
+        tags_func=channel_tags,
     )
     async def list_configs(self, channel_id: str) -> list[EventConfig]:
         """Get all event configs for a channel."""
@@ -116,6 +130,35 @@ class EventConfigRepository:
             _config_list_cache.invalidate(f"event_list:{channel_id}")
             return result
 
+    async def get_config_by_id(self, config_id: int) -> EventConfig | None:
+        """Fetch one config by primary key, bypassing the cache (NOTIFY fallback)."""
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                f"SELECT {_SELECT_COLS} FROM event_configs WHERE id = $1", config_id
+            )
+            return _row_to_config(row) if row else None
+
+    def apply_change(self, channel_id: str, op: str, config: EventConfig | None) -> None:
+        """Apply a config_change delta to this process's caches (no query).
+
+        Without *config* (row unavailable) the whole channel is invalidated.
+        """
+        if config is None:
+            _config_cache.invalidate_tag(channel_tag(channel_id), publish=False)
+        elif op == "DELETE":
+            _config_cache.invalidate(
+                f"event_config:{channel_id}:{config.event_type}", publish=False
+            )
+        else:
+            if config.options is None:
+                config.options = {}
+            _config_cache.set(
+                f"event_config:{channel_id}:{config.event_type}",
+                config,
+                channel_tags(self, channel_id),
+            )
+        _config_list_cache.invalidate(f"event_list:{channel_id}", publish=False)
+
     async def ensure_defaults(self, channel_id: str) -> list[EventConfig]:
         """Ensure default configs exist for a channel, then return all configs."""
         if channel_id not in _seeded_events:
@@ -6,7 +6,7 @@ import logging
 
 import asyncpg
 
-from shared.cache import AsyncTTLCache, cached
+from shared.cache import AsyncTTLCache, cached, channel_tags
 from shared.models.game_queue import GameQueueEntry, GameQueueSettings
 
 logger = logging.getLogger(__name__)
@@ -18,7 +18,7 @@ _ENTRY_COLUMNS = (
 _SETTINGS_COLUMNS = "id, channel_id, group_size, enabled, created_at, updated_at"
 
 # Short TTL cache for settings only (entries change too frequently)
-_settings_cache = AsyncTTLCache(maxsize=32, ttl=300)
+_settings_cache = AsyncTTLCache(maxsize=32, ttl=300, name="gq_settings")
 
 
 class GameQueueRepository:
@@ -141,6 +141,8 @@ class GameQueueSettingsRepository:
     @cached(
         cache=_settings_cache,
         key_func=lambda self, channel_id: f"gq_settings:{channel_id}",
+        tags_func=channel_tags,
+        soft_ttl=60,
     )
     async def get_or_create(self, channel_id: str) -> GameQueueSettings:
         """Get settings for a channel, creating defaults if not exists."""
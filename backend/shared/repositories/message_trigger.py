@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import re
+from collections import deque
+
 import asyncpg
 
-from shared.cache import AsyncTTLCache, cached
+from shared.cache import AsyncTTLCache, cached, channel_tags
 from shared.models.message_trigger import MessageTriggerConfig
 
-_trigger_list_cache = AsyncTTLCache(maxsize=32, ttl=3600)
+_trigger_list_cache = AsyncTTLCache(maxsize=32, ttl=3600, name="trigger_list")
+
+# Compiled matchers keyed by channel_id, paired with the trigger list they were
+# built from. Rebuilt only when list_enabled() hands back a different list object.
+_matchers: dict[str, tuple[list[MessageTriggerConfig], TriggerMatcher]] = {}
 
 _COLUMNS = (
     "id, channel_id, trigger_name, match_type, pattern, case_sensitive, "
@@ -15,6 +22,120 @@ _COLUMNS = (
 )
 
 
+class _Automaton:
+    """Aho-Corasick automaton over (pattern, trigger index, match type) entries.
+
+    A single scan of the message reports every ``contains`` hit, and every
+    ``startswith`` hit whose occurrence begins at offset 0.
+    """
+
+    __slots__ = ("_goto", "_fail", "_out")
+
+    def __init__(self, entries: list[tuple[str, int, str]]) -> None:
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[tuple[int, int, str]]] = [[]]
+        for pattern, idx, match_type in entries:
+            node = 0
+            for ch in pattern:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append((idx, len(pattern), match_type))
+
+        # BFS to build failure links and merge outputs along them
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def scan(self, text: str, hits: set[int]) -> None:
+        """Add the index of every trigger matched in *text* to *hits*."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for pos, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for idx, length, match_type in out[node]:
+                if match_type == "contains" or pos + 1 == length:
+                    hits.add(idx)
+
+
+class TriggerMatcher:
+    """Per-channel compiled form of the enabled trigger list.
+
+    - ``contains`` / ``startswith``: one Aho-Corasick automaton per case mode
+    - ``exact``: dict lookup per case mode
+    - ``regex``: precompiled patterns (invalid patterns never match)
+
+    ``match()`` lowercases the message at most once and yields matching
+    triggers in the original priority order.
+    """
+
+    def __init__(self, triggers: list[MessageTriggerConfig]) -> None:
+        self._triggers = triggers
+        self._always: list[int] = []
+        self._exact: dict[str, list[int]] = {}
+        self._exact_ci: dict[str, list[int]] = {}
+        self._regex: list[tuple[int, re.Pattern[str], bool]] = []
+        entries: list[tuple[str, int, str]] = []
+        entries_ci: list[tuple[str, int, str]] = []
+
+        for idx, trigger in enumerate(triggers):
+            cs = trigger.case_sensitive
+            pattern = trigger.pattern if cs else trigger.pattern.lower()
+            if trigger.match_type in ("contains", "startswith"):
+                if not pattern:
+                    self._always.append(idx)
+                else:
+                    (entries if cs else entries_ci).append((pattern, idx, trigger.match_type))
+            elif trigger.match_type == "exact":
+                (self._exact if cs else self._exact_ci).setdefault(pattern, []).append(idx)
+            elif trigger.match_type == "regex":
+                try:
+                    self._regex.append((idx, re.compile(pattern), cs))
+                except re.error:
+                    continue
+
+        self._automaton = _Automaton(entries) if entries else None
+        self._automaton_ci = _Automaton(entries_ci) if entries_ci else None
+        self._needs_lower = bool(
+            self._automaton_ci or self._exact_ci or any(not cs for _, _, cs in self._regex)
+        )
+
+    def match(self, text: str) -> list[MessageTriggerConfig]:
+        """Return all triggers matching *text*, ordered by priority DESC then id."""
+        lowered = text.lower() if self._needs_lower else text
+        hits: set[int] = set(self._always)
+
+        if self._automaton is not None:
+            self._automaton.scan(text, hits)
+        if self._automaton_ci is not None:
+            self._automaton_ci.scan(lowered, hits)
+        hits.update(self._exact.get(text, ()))
+        hits.update(self._exact_ci.get(lowered, ()))
+        for idx, pattern, cs in self._regex:
+            if idx not in hits and pattern.search(text if cs else lowered):
+                hits.add(idx)
+
+        return [self._triggers[i] for i in sorted(hits)]
+
+
 class MessageTriggerRepository:
     def __init__(self, pool: asyncpg.Pool) -> None:
         self.pool = pool
@@ -22,6 +143,8 @@ class MessageTriggerRepository:
     @cached(
         cache=_trigger_list_cache,
         key_func=lambda self, channel_id: f"trigger_list:{channel_id}",
+        tags_func=channel_tags,
+        soft_ttl=1800,
     )
     async def list_enabled(self, channel_id: str) -> list[MessageTriggerConfig]:
         """Return all enabled triggers for a channel, ordered by priority DESC then id."""
@@ -34,6 +157,19 @@ class MessageTriggerRepository:
             )
             return [MessageTriggerConfig(**dict(row)) for row in rows]
 
+    async def get_matcher(self, channel_id: str) -> TriggerMatcher:
+        """Return the compiled matcher for a channel's enabled triggers.
+
+        The matcher is rebuilt only when the cached trigger list changes.
+        """
+        triggers = await self.list_enabled(channel_id)
+        entry = _matchers.get(channel_id)
+        if entry is not None and entry[0] is triggers:
+            return entry[1]
+        matcher = TriggerMatcher(triggers)
+        _matchers[channel_id] = (triggers, matcher)
+        return matcher
+
     async def list_all(self, channel_id: str) -> list[MessageTriggerConfig]:
         """Return all triggers for a channel (enabled + disabled)."""
         async with self.pool.acquire() as conn:
@@ -116,5 +252,14 @@ class MessageTriggerRepository:
             )
 
     def invalidate_cache(self, channel_id: str) -> None:
-        """Invalidate list cache for a channel (called by pg_notify handler)."""
-        _trigger_list_cache.invalidate(f"trigger_list:{channel_id}")
+        """Invalidate list cache for a channel (called by pg_notify handler).
+
+        Local only: the notification already reached every process.
+        """
+        _trigger_list_cache.invalidate(f"trigger_list:{channel_id}", publish=False)
+        _matchers.pop(channel_id, None)
+
+    @staticmethod
+    def drop_matcher(channel_id: str) -> None:
+        """Discard the compiled matcher for a channel (e.g. after unsubscribing)."""
+        _matchers.pop(channel_id, None)
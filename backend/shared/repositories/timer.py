@@ -4,10 +4,10 @@ from __future__ import annotations
 
 import asyncpg
 
-from shared.cache import AsyncTTLCache, cached
+from shared.cache import AsyncTTLCache, cached, channel_tags
 from shared.models.timer import TimerConfig
 
-_timer_list_cache = AsyncTTLCache(maxsize=32, ttl=3600)
+_timer_list_cache = AsyncTTLCache(maxsize=32, ttl=3600, name="timer_list")
 
 _COLUMNS = (
     "id, channel_id, timer_name, interval_seconds, min_lines, "
@@ -22,6 +22,7 @@ class TimerConfigRepository:
     @cached(
         cache=_timer_list_cache,
         key_func=lambda self, channel_id: f"timer_list:{channel_id}",
+        tags_func=channel_tags,
     )
     async def list_enabled(self, channel_id: str) -> list[TimerConfig]:
         """Return all enabled timers for a channel, ordered by id."""
@@ -88,5 +89,8 @@ class TimerConfigRepository:
             return result == "DELETE 1"
 
     def invalidate_cache(self, channel_id: str) -> None:
-        """Invalidate list cache for a channel (called by pg_notify handler)."""
-        _timer_list_cache.invalidate(f"timer_list:{channel_id}")
+        """Invalidate list cache for a channel (called by pg_notify handler).
+
+        Local only: the notification already reached every process.
+        """
+        _timer_list_cache.invalidate(f"timer_list:{channel_id}", publish=False)
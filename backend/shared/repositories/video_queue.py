@@ -13,7 +13,7 @@ import re
 import aiohttp
 import asyncpg
 
-from shared.cache import AsyncTTLCache, cached
+from shared.cache import AsyncTTLCache, cached, channel_tags
 from shared.models.video_queue import VideoQueueEntry, VideoQueueSettings
 
 logger = logging.getLogger(__name__)
@@ -105,7 +105,7 @@ _SETTINGS_COLUMNS = (
     "created_at, updated_at"
 )
 
-_settings_cache = AsyncTTLCache(maxsize=32, ttl=300)
+_settings_cache = AsyncTTLCache(maxsize=32, ttl=300, name="vq_settings")
 
 
 # ---------------------------------------------------------------------------
@@ -263,6 +263,8 @@ class VideoQueueSettingsRepository:
     @cached(
         cache=_settings_cache,
         key_func=lambda self, channel_id: f"vq_settings:{channel_id}",
+        tags_func=channel_tags,
+        soft_ttl=60,
     )
     async def get_or_create(self, channel_id: str) -> VideoQueueSettings:
         """Get settings for a channel, creating defaults if not exists."""
@@ -0,0 +1,9 @@
+"""Import paths for tests: ``shared`` from backend/, ``core`` from backend/twitch/."""
+
+import os
+import sys
+
+_backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in (_backend_dir, os.path.join(_backend_dir, "twitch")):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
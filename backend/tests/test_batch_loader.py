@@ -0,0 +1,90 @@
+"""Tests for shared.cache.BatchLoader."""
+
+import asyncio
+
+import pytest
+
+from shared.cache import AsyncTTLCache, BatchLoader, cached
+
+
+def make_loader(max_batch: int = 100, fail: BaseException | None = None):
+    batches = []
+
+    async def load_many(keys):
+        batches.append(keys)
+        await asyncio.sleep(0)
+        if fail is not None:
+            raise fail
+        return {key: key * 2 for key in keys if key != 0}
+
+    return BatchLoader(load_many, max_batch=max_batch), batches
+
+
+def test_coalesces_one_tick_into_one_batch():
+    async def run():
+        loader, batches = make_loader()
+        results = await asyncio.gather(*(loader.load(k) for k in [1, 2, 1, 0]))
+        assert results == [2, 4, 2, None]  # missing keys resolve to None
+        assert batches == [[1, 2, 0]]
+
+        assert await loader.load(3) == 6  # next tick, next batch
+        assert loader.batches == 2
+        assert loader.keys_loaded == 4
+
+    asyncio.run(run())
+
+
+def test_max_batch_splits():
+    async def run():
+        loader, batches = make_loader(max_batch=2)
+        results = await asyncio.gather(*(loader.load(k) for k in [1, 2, 3, 4, 5]))
+        assert results == [2, 4, 6, 8, 10]
+        assert batches == [[1, 2], [3, 4], [5]]
+
+    asyncio.run(run())
+
+
+def test_failed_batch_raises_in_every_waiter():
+    async def run():
+        error = OSError("down")
+        loader, _ = make_loader(fail=error)
+        results = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+        assert results == [error, error]
+
+    asyncio.run(run())
+
+
+def test_cancelled_caller_does_not_cancel_the_batch():
+    async def run():
+        loader, _ = make_loader()
+        first = asyncio.create_task(loader.load(1))
+        second = asyncio.create_task(loader.load(1))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == 2
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    asyncio.run(run())
+
+
+def test_under_cached_each_key_stored_separately():
+    async def run():
+        loader, batches = make_loader()
+        cache = AsyncTTLCache(ttl=60)
+
+        class Repo:
+            pool = None
+
+            @cached(cache=cache, key_func=lambda self, key: f"k:{key}")
+            async def get(self, key):
+                return await loader.load(key)
+
+        repo = Repo()
+        assert await asyncio.gather(repo.get(1), repo.get(2)) == [2, 4]
+        assert batches == [[1, 2]]
+        assert cache.get("k:1") == 2
+        assert await repo.get(2) == 4  # cache hit
+        assert batches == [[1, 2]]
+
+    asyncio.run(run())
@@ -0,0 +1,100 @@
+"""Tests for shared.cache tier and tag-index coherence and soft-TTL refresh."""
+
+import asyncio
+
+import pytest
+
+from shared.cache import _MISSING, AsyncTTLCache, PartitionedTTLCache, cached, channel_tag
+
+
+def test_invalidate_tag_reaches_hot_key_after_stale_eviction():
+    cache = AsyncTTLCache(maxsize=2, ttl=3600)
+    cache.set("a", 1, tags=(channel_tag("a"),))
+    cache.set("b", 2, tags=(channel_tag("b"),))
+    assert cache.get("a") == 1  # hot key, read through the fresh tier
+    cache.set("c", 3, tags=(channel_tag("c"),))
+
+    cache.invalidate_tag(channel_tag("a"))
+
+    assert cache.get("a") is _MISSING
+
+
+def test_hot_key_keeps_age_and_stale_fallback():
+    cache = AsyncTTLCache(maxsize=2, ttl=3600)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get_stale("a") == 1
+    assert cache.age("a") > 0.0
+    assert cache.get_stale("b") is _MISSING
+
+
+def make_loader(cache):
+    """A cached loader whose loads block until released, returning the current version."""
+    state = {"version": 1, "gate": None}
+
+    class Repo:
+        @cached(
+            cache=cache,
+            key_func=lambda self, key: key,
+            tags_func=lambda self, key: (channel_tag(key),),
+            soft_ttl=0,
+        )
+        async def load(self, key):
+            version = state["version"]
+            if state["gate"] is not None:
+                await state["gate"].wait()
+            return f"{key}-v{version}"
+
+    return Repo(), state
+
+
+@pytest.mark.parametrize("make_cache", [AsyncTTLCache, PartitionedTTLCache])
+def test_refresh_survives_invalidation_of_other_keys(make_cache):
+    async def run():
+        cache = make_cache()
+        repo, state = make_loader(cache)
+        assert await repo.load("a") == "a-v1"
+        await asyncio.sleep(0.001)
+        state["version"], state["gate"] = 2, asyncio.Event()
+        assert await repo.load("a") == "a-v1"  # stale hit, refresh scheduled
+        refresh = cache._refreshing["a"]
+
+        cache.invalidate("b", publish=False)
+        cache.invalidate_tag(channel_tag("b"), publish=False)
+        state["gate"].set()
+        await refresh
+        assert cache.get("a") == "a-v2"
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "invalidate",
+    [
+        lambda cache: cache.invalidate("a", publish=False),
+        lambda cache: cache.invalidate_tag(channel_tag("a"), publish=False),
+        lambda cache: cache.clear(publish=False),
+    ],
+)
+@pytest.mark.parametrize("make_cache", [AsyncTTLCache, PartitionedTTLCache])
+def test_refresh_discarded_when_its_key_is_invalidated(make_cache, invalidate):
+    async def run():
+        cache = make_cache()
+        repo, state = make_loader(cache)
+        await repo.load("a")
+        await asyncio.sleep(0.001)
+        state["version"], state["gate"] = 2, asyncio.Event()
+        await repo.load("a")
+        refresh = cache._refreshing["a"]
+
+        invalidate(cache)
+        assert "a" not in cache._refreshing
+        state["gate"].set()
+        await refresh
+        assert cache.get("a") is _MISSING
+
+    asyncio.run(run())
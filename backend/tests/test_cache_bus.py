@@ -0,0 +1,66 @@
+"""Tests for shared.cache_bus message handling and resync."""
+
+import asyncio
+import json
+
+from shared.cache import _MISSING, AsyncTTLCache, channel_tag
+from shared.cache_bus import CHANNEL, CacheBus
+from shared.pg_listener import PgListener
+
+
+def test_apply_invalidations_from_other_processes():
+    cache = AsyncTTLCache(name="test_bus_apply")
+    cache.set("a", 1)
+    cache.set("b", 2, tags=(channel_tag("1"),))
+    cache.set("c", 3)
+    bus = CacheBus()
+
+    bus.apply(json.dumps({"o": bus.origin, "c": cache.name, "k": ["a"]}))
+    assert cache.get("a") == 1  # own message
+
+    bus.apply(json.dumps({"o": "other", "c": cache.name, "k": ["a"]}))
+    bus.apply(json.dumps({"o": "other", "c": cache.name, "t": [channel_tag("1")]}))
+    assert cache.get("a") is _MISSING
+    assert cache.get("b") is _MISSING
+    assert cache.get("c") == 3
+    assert cache.get_stale("a") == 1
+
+    bus.apply(json.dumps({"o": "other", "c": cache.name, "all": True}))
+    assert cache.get("c") is _MISSING
+    assert bus.applied == 3
+
+
+def test_registers_on_a_shared_listener():
+    listener = PgListener("postgresql://unused")
+    bus = CacheBus()
+
+    async def run():
+        bus.start("postgresql://unused", pool=object(), listener=listener)
+        await bus.stop()
+
+    asyncio.run(run())
+    assert listener.channels == [CHANNEL]
+    assert listener._resync_hooks == [bus.resync]
+    assert listener._task is None  # started and stopped by its owner
+
+
+def test_resyncs_close_together_are_folded():
+    cache = AsyncTTLCache(name="test_bus_resync")
+    bus = CacheBus()
+    bus.RESYNC_MIN_INTERVAL = 0.05
+
+    async def run():
+        cache.set("a", 1)
+        bus.resync()
+        assert cache.get("a") is _MISSING
+        assert bus.resyncs == 1
+
+        cache.set("a", 2)
+        bus.resync()
+        bus.resync()
+        assert cache.get("a") == 2  # deferred
+        await asyncio.sleep(0.1)
+        assert cache.get("a") is _MISSING
+        assert bus.resyncs == 2
+
+    asyncio.run(run())
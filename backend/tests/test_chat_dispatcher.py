@@ -0,0 +1,121 @@
+"""Tests for the twitch bot's outbound ChatDispatcher."""
+
+import asyncio
+import logging
+
+from core.chat_dispatcher import ChatDispatcher, SendPriority
+
+
+class FakeBroadcaster:
+    def __init__(self, bot, channel_id):
+        self.bot = bot
+        self.channel_id = channel_id
+
+    async def send_message(self, *, message, sender, token_for, reply_to_message_id):
+        if message in self.bot.failing:
+            raise RuntimeError("send failed")
+        self.bot.sent.append((self.channel_id, message, reply_to_message_id))
+
+
+class FakeBot:
+    bot_id = "bot"
+
+    def __init__(self):
+        self.sent = []
+        self.failing = set()
+
+    def create_partialuser(self, *, user_id):
+        return FakeBroadcaster(self, user_id)
+
+
+async def drain(dispatcher: ChatDispatcher) -> None:
+    await asyncio.gather(*(q.task for q in dispatcher._queues.values() if q.task))
+
+
+def test_sends_in_priority_order():
+    async def run():
+        bot = FakeBot()
+        dispatcher = ChatDispatcher(bot)
+        dispatcher.enqueue("1", "event", SendPriority.EVENT)
+        dispatcher.enqueue("1", "timer", SendPriority.TIMER)
+        dispatcher.enqueue("1", "command", SendPriority.COMMAND)
+        await drain(dispatcher)
+        assert [m for _, m, _ in bot.sent] == ["command", "timer", "event"]
+
+    asyncio.run(run())
+
+
+def test_coalesces_same_text_and_reply_target_only():
+    async def run():
+        bot = FakeBot()
+        dispatcher = ChatDispatcher(bot)
+        assert dispatcher.enqueue("1", "hi", SendPriority.EVENT)
+        assert not dispatcher.enqueue("1", "hi", SendPriority.COMMAND)
+        assert dispatcher.enqueue("1", "hi", reply_to="m1")
+        assert dispatcher.enqueue("1", "hi", reply_to="m2")
+        assert not dispatcher.enqueue("1", "hi", reply_to="m2")
+        await drain(dispatcher)
+        assert sorted(bot.sent, key=str) == sorted(
+            [("1", "hi", None), ("1", "hi", "m1"), ("1", "hi", "m2")], key=str
+        )
+        assert dispatcher.coalesced == 2
+
+    asyncio.run(run())
+
+
+def test_on_sent_runs_only_after_delivery():
+    async def run():
+        bot = FakeBot()
+        bot.failing.add("broken")
+        dispatcher = ChatDispatcher(bot)
+        calls = []
+
+        async def record(name):
+            calls.append(name)
+
+        dispatcher.enqueue("1", "ok", on_sent=lambda: calls.append("sync"))
+        dispatcher.enqueue("1", "ok", on_sent=lambda: record("coalesced"))
+        dispatcher.enqueue("1", "broken", on_sent=lambda: calls.append("broken"))
+        assert calls == []
+        await drain(dispatcher)
+        await asyncio.sleep(0)
+        assert sorted(calls) == ["coalesced", "sync"]
+        assert dispatcher.failed == 1
+
+    asyncio.run(run())
+
+
+def test_failed_async_on_sent_is_kept_and_logged(caplog):
+    async def run():
+        dispatcher = ChatDispatcher(FakeBot())
+        release = asyncio.Event()
+
+        async def callback():
+            await release.wait()
+            raise ValueError("db down")
+
+        dispatcher.enqueue("1", "ok", on_sent=callback)
+        await drain(dispatcher)
+        assert len(dispatcher._callbacks) == 1
+        release.set()
+        await dispatcher.close()
+        assert not dispatcher._callbacks
+
+    with caplog.at_level(logging.WARNING, logger="ChatDispatcher"):
+        asyncio.run(run())
+    assert "on_sent callback failed: db down" in caplog.text
+
+
+def test_stale_messages_expire_without_callbacks():
+    async def run():
+        bot = FakeBot()
+        dispatcher = ChatDispatcher(bot)
+        calls = []
+        dispatcher.enqueue("1", "late", SendPriority.COMMAND, on_sent=lambda: calls.append(1))
+        dispatcher._queues["1"].heap[0][2] -= 31  # enqueued 31s ago
+        await drain(dispatcher)
+        assert bot.sent == []
+        assert calls == []
+        assert dispatcher.expired == 1
+
+    asyncio.run(run())
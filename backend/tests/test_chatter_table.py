@@ -0,0 +1,83 @@
+"""Tests for the twitch bot's per-channel ChatterTable."""
+
+from datetime import timedelta
+
+from core import chatter_table
+from core.chatter_table import ChatterTable
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(chatter_table.time, "monotonic", clock)
+    return clock
+
+
+def rows(table: ChatterTable) -> dict:
+    return {user_id: (name, count, last) for user_id, name, count, last in table.rows()}
+
+
+def test_record_counts_and_last_seen(monkeypatch):
+    clock = make_clock(monkeypatch)
+    table = ChatterTable()
+    table.record("1", "alice")
+    clock.now += 30
+    table.record("1", "alice")
+    table.record("2", "bob")
+
+    assert len(table) == 2
+    result = rows(table)
+    assert result["1"][:2] == ("alice", 2)
+    assert result["1"][2] == table._epoch_wall + timedelta(seconds=30)
+    assert result["2"][:2] == ("bob", 1)
+
+
+def test_rename_keeps_slot():
+    table = ChatterTable()
+    table.record("1", "alice")
+    table.record("1", "alice2")
+    assert len(table) == 1
+    assert rows(table)["1"][:2] == ("alice2", 2)
+
+
+def test_merge_newer_table(monkeypatch):
+    clock = make_clock(monkeypatch)
+    older = ChatterTable()
+    older.record("1", "alice")
+    older.record("2", "bob")
+    clock.now += 60
+    newer = ChatterTable()
+    clock.now += 5
+    newer.record("1", "alice_renamed")
+    newer.record("3", "carol")
+
+    older.merge(newer)
+
+    result = rows(older)
+    assert len(older) == 3
+    assert result["1"][:2] == ("alice_renamed", 2)
+    assert result["1"][2] == older._epoch_wall + timedelta(seconds=65)
+    assert result["2"][:2] == ("bob", 1)
+    assert result["3"][:2] == ("carol", 1)
+
+
+def test_usernames_are_interned():
+    a, b = ChatterTable(), ChatterTable()
+    # Built at runtime so the two strings start out as distinct objects
+    name1 = "".join(["ali", "ce"])
+    name2 = "".join(["al", "ice"])
+    assert name1 is not name2
+    a.record("1", name1)
+    b.record("1", name2)
+    assert a._names[0] is b._names[0]
+
+    c = ChatterTable()
+    c.merge(b)
+    assert c._names[0] is a._names[0]
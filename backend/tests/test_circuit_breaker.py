@@ -0,0 +1,133 @@
+"""Tests for shared.database.CircuitBreaker and its use by shared.cache.cached."""
+
+import asyncio
+
+import asyncpg
+import pytest
+
+from shared import database
+from shared.cache import AsyncTTLCache, cached
+from shared.database import CircuitBreaker, CircuitOpenError, is_outage_error
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(database.time, "monotonic", clock)
+    return clock
+
+
+def test_opens_after_threshold_of_distinct_failures(clock):
+    breaker = CircuitBreaker("db", failure_threshold=3)
+    same = OSError("down")
+    for _ in range(3):
+        breaker.record_failure(same)  # one batched query's waiters
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure(OSError("down"))
+    breaker.record_failure(OSError("down"))
+    assert breaker.is_open
+    assert not breaker.allow_request()
+    assert breaker.times_opened == 1
+    assert breaker.rejected == 1
+
+
+def test_success_resets_the_count(clock):
+    breaker = CircuitBreaker("db", failure_threshold=2)
+    breaker.record_failure(OSError())
+    breaker.record_success()
+    breaker.record_failure(OSError())
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_single_trial_then_close(clock):
+    breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout=5)
+    breaker.record_failure(OSError())
+    clock.now += 5
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # trial in flight
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_trial_doubles_timeout_up_to_max(clock):
+    breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout=5, max_reset_timeout=15)
+    breaker.record_failure(OSError())
+    for expected in (10, 15, 15):
+        clock.now += breaker._reset_timeout
+        assert breaker.allow_request()
+        breaker.record_failure(OSError())
+        assert breaker._reset_timeout == expected
+    breaker.record_success()
+    assert breaker._reset_timeout == 5
+
+
+def test_abandoned_trial_frees_the_slot(clock):
+    breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout=5)
+    breaker.record_failure(OSError())
+    clock.now += 5
+    assert breaker.allow_request()  # trial never reports back
+    clock.now += 5
+    assert breaker.allow_request()
+
+
+def test_probe_closes_without_traffic():
+    async def run():
+        results = iter([False, True])
+
+        async def probe():
+            return next(results)
+
+        breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout=0.01, probe=probe)
+        breaker.record_failure(OSError())
+        await asyncio.wait_for(breaker._probe_task, 1)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(run())
+
+
+def test_outage_errors():
+    assert is_outage_error(OSError())
+    assert is_outage_error(asyncpg.CannotConnectNowError())
+    assert not is_outage_error(TimeoutError())
+    assert not is_outage_error(asyncpg.UniqueViolationError())
+
+
+def test_cached_serves_stale_or_raises_while_open(monkeypatch):
+    breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout=60)
+    pool = object()
+    monkeypatch.setitem(database._breakers, id(pool), breaker)
+    cache = AsyncTTLCache(ttl=60)
+    calls = []
+
+    class Repo:
+        def __init__(self):
+            self.pool = pool
+
+        @cached(cache=cache, key_func=lambda self, key: key, retry=1)
+        async def load(self, key):
+            calls.append(key)
+            return key.upper()
+
+    async def run():
+        repo = Repo()
+        assert await repo.load("a") == "A"
+        cache.invalidate("a", publish=False)
+        breaker.record_failure(OSError())
+
+        assert await repo.load("a") == "A"  # stale, no query
+        with pytest.raises(CircuitOpenError):
+            await repo.load("b")
+        assert calls == ["a"]
+
+    asyncio.run(run())
@@ -0,0 +1,105 @@
+"""Tests for shared.repositories.config_sync against a scripted connection."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+
+from shared.models.channel import Channel
+from shared.models.command_config import CommandConfig
+from shared.repositories.config_sync import (
+    WATERMARK_OVERLAP,
+    ConfigChange,
+    ConfigSyncRepository,
+)
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=UTC)
+
+
+class FakeConnection:
+    """Answers each query from the rows scripted for the table it reads."""
+
+    def __init__(self, rows: dict[str, list[dict]]):
+        self.rows = rows
+        self.queries: list[tuple[str, tuple]] = []
+        self.transactions: list[dict] = []
+
+    @asynccontextmanager
+    async def _transaction(self, **options):
+        self.transactions.append(options)
+        yield
+
+    def transaction(self, **options):
+        return self._transaction(**options)
+
+    async def fetchval(self, query, *args):
+        return NOW
+
+    async def fetch(self, query, *args):
+        self.queries.append((query, args))
+        table = query.split(" FROM ")[1].split()[0]
+        return self.rows.get(table, [])
+
+    async def execute(self, query, *args):
+        self.queries.append((query, args))
+        return "DELETE 3"
+
+
+class FakePool:
+    def __init__(self, conn: FakeConnection):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def test_changes_since_reads_every_table_in_one_snapshot():
+    conn = FakeConnection(
+        {
+            "command_configs": [
+                {
+                    "id": 7,
+                    "channel_id": "1",
+                    "command_name": "hi",
+                    "command_type": "custom",
+                    "enabled": True,
+                    "custom_response": "hello",
+                    "cooldown": None,
+                    "min_role": "everyone",
+                    "aliases": None,
+                    "created_at": None,
+                    "updated_at": None,
+                }
+            ],
+            "channels": [{"channel_id": "1", "channel_name": "one", "default_cooldown": 9}],
+            "timers": [{"id": 3, "channel_id": "1"}],
+            "config_tombstones": [
+                {"table_name": "command_configs", "row_id": "8", "channel_id": "1"}
+            ],
+        }
+    )
+    repo = ConfigSyncRepository(FakePool(conn))
+    since = NOW - timedelta(minutes=5)
+
+    changes, watermark = asyncio.run(repo.changes_since(since, ["1", "2"]))
+
+    assert watermark == NOW
+    assert conn.transactions == [{"isolation": "repeatable_read", "readonly": True}]
+    assert all(args == (since - WATERMARK_OVERLAP, ["1", "2"]) for _, args in conn.queries)
+
+    command, channel, timer, tombstone = changes
+    assert command == ConfigChange("command_configs", "1", "UPSERT", 7, command.row)
+    assert isinstance(command.row, CommandConfig)
+    assert command.row.custom_response == "hello"
+    assert channel.table == "channels"
+    assert channel.row_id == "1"
+    assert channel.row == Channel(channel_id="1", channel_name="one", default_cooldown=9)
+    assert timer == ConfigChange("timers", "1", "UPSERT", 3)
+    assert tombstone == ConfigChange("command_configs", "1", "DELETE", 8)
+
+
+def test_purge_tombstones_returns_rows_removed():
+    conn = FakeConnection({})
+    repo = ConfigSyncRepository(FakePool(conn))
+    assert asyncio.run(repo.purge_tombstones(timedelta(days=1))) == 3
+    assert conn.queries[0][1] == (timedelta(days=1),)
@@ -0,0 +1,98 @@
+"""Tests for the twitch bot's CooldownStore and cooldown guards."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from core import cooldowns, guards
+from core.cooldowns import CooldownStore
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(cooldowns.time, "monotonic", clock)
+    return clock
+
+
+def test_acquire_then_deny_until_expiry(clock):
+    store = CooldownStore()
+    assert store.acquire(("1", "hi"), 10)
+    assert not store.acquire(("1", "hi"), 10)
+    assert store.remaining(("1", "hi")) == 10
+    clock.now += 9.9
+    assert store.is_active(("1", "hi"))
+    clock.now += 0.1
+    assert not store.is_active(("1", "hi"))
+    assert store.acquire(("1", "hi"), 10)
+
+
+def test_zero_seconds_never_cools_down(clock):
+    store = CooldownStore()
+    assert store.acquire(("1", "hi"), 0)
+    assert store.acquire(("1", "hi"), 0)
+    assert len(store) == 0
+
+
+def test_keys_are_independent(clock):
+    store = CooldownStore()
+    assert store.acquire(("1", "hi"), 10)
+    assert store.acquire(("2", "hi"), 10)
+    assert store.acquire(("1", "hi", "user"), 10)
+    assert not store.acquire(("1", "hi", "user"), 10)
+    assert store.acquire(("1", "hi", "other"), 10)
+
+
+def test_purge_drops_expired_keys_and_superseded_heap_entries(clock):
+    store = CooldownStore()
+    for i in range(100):
+        store.record(("1", str(i)), 5)
+    store.record(("1", "0"), 20)  # extends: its first heap entry is now stale
+    assert len(store._heap) == 101
+
+    clock.now += 5
+    assert len(store) == 100  # expired, but purged only on the next call
+    store.is_active(("1", "0"))
+    assert len(store) == 1
+    assert len(store._heap) == 1
+    assert store.remaining(("1", "0")) == 15
+
+    clock.now += 15
+    store.is_active(("1", "0"))
+    assert len(store) == 0
+    assert store._heap == []
+
+
+def test_record_never_shortens(clock):
+    store = CooldownStore()
+    store.record(("1", "hi"), 30)
+    store.record(("1", "hi"), 5)
+    assert store.remaining(("1", "hi")) == 30
+
+
+def test_acquire_cooldown_guard(clock, monkeypatch):
+    monkeypatch.setattr(guards, "_cooldowns", CooldownStore())
+    config = SimpleNamespace(cooldown=None)
+    channel = SimpleNamespace(default_cooldown=15)
+
+    assert guards.acquire_cooldown("1", "hi", config)  # no cooldown at all
+    assert guards.acquire_cooldown("1", "hi", config)
+
+    assert guards.acquire_cooldown("1", "hi", config, channel)
+    assert not guards.acquire_cooldown("1", "hi", config, channel)
+    assert guards.is_on_cooldown("1", "hi", config, channel)
+    assert guards.acquire_cooldown("1", "bye", config, channel)
+
+    override = SimpleNamespace(cooldown=0)  # command-level override beats the default
+    assert guards.acquire_cooldown("1", "hi", override, channel)
+
+    clock.now += 15
+    assert guards.acquire_cooldown("1", "hi", config, channel)
@@ -0,0 +1,360 @@
+"""Tests for shared.database lanes, the SupervisedPool wrapper and PoolSizer."""
+
+import asyncio
+
+import pytest
+
+from shared.database import (
+    BACKGROUND,
+    BULK,
+    INTERACTIVE,
+    DatabaseManager,
+    LaneScheduler,
+    PoolConfig,
+    SupervisedPool,
+    _current_lane,
+    db_lane,
+)
+
+
+class FakePool:
+    """Public asyncpg.Pool surface SupervisedPool relies on."""
+
+    def __init__(self, min_size: int = 1, max_size: int = 4):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.free = asyncio.Queue()
+        for i in range(max_size):
+            self.free.put_nowait(f"conn{i}")
+
+    async def acquire(self, *, timeout=None):
+        return await asyncio.wait_for(self.free.get(), timeout)
+
+    async def release(self, conn, *, timeout=None):
+        self.free.put_nowait(conn)
+
+    def get_min_size(self):
+        return self.min_size
+
+    def get_max_size(self):
+        return self.max_size
+
+
+def make_pool(capacity: int = 2, max_size: int = 4):
+    waits = []
+    timeouts = []
+    lanes = LaneScheduler(capacity)
+    pool = SupervisedPool(
+        FakePool(max_size=max_size),
+        on_wait=lambda pool_wait, total_wait, lane: waits.append(lane),
+        on_timeout=lambda: timeouts.append(1),
+        lanes=lanes,
+    )
+    return pool, lanes, waits, timeouts
+
+
+# ── LaneScheduler ───────────────────────────────────────────────────
+
+
+def test_reservation_keeps_a_slot_for_interactive():
+    async def run():
+        lanes = LaneScheduler(2)
+        await lanes.acquire(BACKGROUND)
+        waiter = asyncio.create_task(lanes.acquire(BACKGROUND))
+        await asyncio.sleep(0)
+        assert not waiter.done()  # the last free slot is reserved
+        await lanes.acquire(INTERACTIVE)
+        waiter.cancel()
+
+    asyncio.run(run())
+
+
+def test_lane_limit():
+    async def run():
+        lanes = LaneScheduler(4)
+        await lanes.acquire(BULK)
+        waiter = asyncio.create_task(lanes.acquire(BULK))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        lanes.release(BULK)
+        await asyncio.wait_for(waiter, 1)
+
+    asyncio.run(run())
+
+
+def test_weighted_order_when_contended():
+    async def run():
+        lanes = LaneScheduler(1)
+        await lanes.acquire(INTERACTIVE)
+        order = []
+
+        async def take(name):
+            await lanes.acquire(name)
+            order.append(name)
+            lanes.release(name)
+
+        tasks = [asyncio.create_task(take(BACKGROUND)) for _ in range(3)]
+        tasks += [asyncio.create_task(take(INTERACTIVE)) for _ in range(6)]
+        await asyncio.sleep(0)
+        lanes.release(INTERACTIVE)
+        await asyncio.gather(*tasks)
+        # interactive (weight 6) gets twice background's (weight 3) share,
+        # and background is not starved
+        assert order[:6].count(INTERACTIVE) == 4
+        assert order[:6].count(BACKGROUND) == 2
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def run():
+        lanes = LaneScheduler(1)
+        await lanes.acquire(INTERACTIVE)
+        waiter = asyncio.create_task(lanes.acquire(INTERACTIVE))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        lanes.release(INTERACTIVE)
+        await asyncio.wait_for(lanes.acquire(INTERACTIVE), 1)
+
+    asyncio.run(run())
+
+
+def test_reservations_trimmed_to_leave_a_shared_slot():
+    lanes = LaneScheduler(1)
+    assert lanes.stats()[INTERACTIVE]["reserved"] == 0
+
+    async def run():
+        await asyncio.wait_for(lanes.acquire(BACKGROUND), 1)
+
+    asyncio.run(run())
+
+
+def test_unknown_lane():
+    with pytest.raises(ValueError):
+        asyncio.run(LaneScheduler(2).acquire("nope"))
+
+
+def test_resize_admits_waiters_and_retrims():
+    async def run():
+        lanes = LaneScheduler(1)
+        await lanes.acquire(BACKGROUND)
+        waiters = [asyncio.create_task(lanes.acquire(BACKGROUND)) for _ in range(2)]
+        await asyncio.sleep(0)
+        assert lanes.waiting() == 2
+
+        lanes.resize(4)  # one slot now reserved for interactive
+        await asyncio.sleep(0)
+        assert all(w.done() for w in waiters)
+        assert lanes.stats()[INTERACTIVE]["reserved"] == 1
+        assert not lanes._eligible(BACKGROUND)
+        await asyncio.wait_for(lanes.acquire(INTERACTIVE), 1)
+
+    asyncio.run(run())
+
+
+def test_idle_lane_banks_no_credit():
+    async def run():
+        lanes = LaneScheduler(1)
+        for _ in range(10):  # background runs alone for a while
+            await lanes.acquire(BACKGROUND)
+            lanes.release(BACKGROUND)
+        await lanes.acquire(BACKGROUND)
+        order = []
+
+        async def take(name):
+            await lanes.acquire(name)
+            order.append(name)
+            lanes.release(name)
+
+        tasks = [asyncio.create_task(take(INTERACTIVE)) for _ in range(4)]
+        tasks += [asyncio.create_task(take(BACKGROUND)) for _ in range(2)]
+        await asyncio.sleep(0)
+        lanes.release(BACKGROUND)
+        await asyncio.gather(*tasks)
+        # interactive does not get the first 10 grants for having been idle
+        assert BACKGROUND in order[:4]
+
+    asyncio.run(run())
+
+
+def test_db_lane_context_and_decorator():
+    assert _current_lane.get() == INTERACTIVE
+    with db_lane(BULK):
+        assert _current_lane.get() == BULK
+        with db_lane(None):
+            assert _current_lane.get() is None
+        assert _current_lane.get() == BULK
+    assert _current_lane.get() == INTERACTIVE
+
+    @db_lane(BACKGROUND)
+    async def job():
+        return _current_lane.get()
+
+    assert asyncio.run(job()) == BACKGROUND
+
+
+# ── SupervisedPool ──────────────────────────────────────────────────
+
+
+def test_acquire_and_release_through_lane():
+    async def run():
+        pool, lanes, waits, _ = make_pool()
+        async with pool.acquire() as conn:
+            assert conn.startswith("conn")
+            assert pool.get_in_use() == 1
+            assert lanes.stats()[INTERACTIVE]["in_use"] == 1
+        assert pool.get_in_use() == 0
+        assert lanes.stats()[INTERACTIVE]["in_use"] == 0
+        assert waits == [INTERACTIVE]
+
+    asyncio.run(run())
+
+
+def test_grow_admits_waiting_acquire():
+    async def run():
+        pool, _, _, _ = make_pool(capacity=2)
+        held = [await pool.acquire(), await pool.acquire()]
+        waiter = asyncio.create_task(pool._acquire(None))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        assert pool.resize(3) == 3
+        conn = await asyncio.wait_for(waiter, 1)
+        for c in [*held, conn]:
+            await pool.release(c)
+
+    asyncio.run(run())
+
+
+def test_shrink_drains_and_clamps():
+    async def run():
+        pool, _, _, _ = make_pool(capacity=3)
+        held = [await pool.acquire() for _ in range(3)]
+        assert pool.resize(1) == 1
+        await pool.release(held.pop())
+        await pool.release(held.pop())
+        waiter = asyncio.create_task(pool._acquire(None))
+        await asyncio.sleep(0)
+        assert not waiter.done()  # still one slot in use at capacity 1
+        await pool.release(held.pop())
+        await pool.release(await asyncio.wait_for(waiter, 1))
+
+        assert pool.resize(0) == 1  # min_size
+        assert pool.resize(99) == 4  # wrapped pool's max_size
+
+    asyncio.run(run())
+
+
+def test_lane_timeout_is_counted_and_releases_nothing():
+    async def run():
+        pool, lanes, _, timeouts = make_pool(capacity=1)
+        conn = await pool.acquire()
+        with pytest.raises(TimeoutError):
+            await pool.acquire(timeout=0.01)
+        assert timeouts == [1]
+        await pool.release(conn)
+        assert lanes.stats()[INTERACTIVE]["in_use"] == 0
+
+    asyncio.run(run())
+
+
+def test_housekeeping_bypasses_lanes():
+    async def run():
+        pool, lanes, waits, _ = make_pool(capacity=1)
+        conn = await pool.acquire()
+        with db_lane(None):
+            spare = await asyncio.wait_for(pool.acquire(), 1)
+        assert waits[-1] is None
+        await pool.release(spare)
+        await pool.release(conn)
+        assert lanes.stats()[INTERACTIVE]["in_use"] == 0
+
+    asyncio.run(run())
+
+
+# ── PoolSizer ───────────────────────────────────────────────────────
+
+
+def make_manager(service: str = "twitch", budget_left: int = 7):
+    """Manager on a FakePool whose lease function grants up to *budget_left*."""
+    manager = DatabaseManager(
+        "postgresql://u@db.example:5432/postgres", PoolConfig.for_service(service)
+    )
+    manager.lanes.resize(manager.config.max_size)
+    manager._pool = SupervisedPool(
+        FakePool(max_size=manager.sizer.ceiling),
+        on_wait=manager._on_acquire_wait,
+        lanes=manager.lanes,
+    )
+    leases = []
+
+    async def lease_query(query, *args):
+        if "fn_release_pool_lease" in query:
+            leases.append(None)
+            return None
+        _, _, extra, _, _ = args
+        leases.append(extra)
+        return max(0, min(extra, budget_left))
+
+    manager.sizer._lease_query = lease_query
+    return manager, leases
+
+
+def test_sizer_leases_only_growth_above_max_size():
+    async def run():
+        manager, leases = make_manager()
+        pool, sizer = manager._pool, manager.sizer
+        await sizer._resize(pool, 5)
+        assert pool.get_max_size() == 5
+        assert leases == [2]
+        assert sizer.stats()["leased"] == 2
+
+        await sizer._resize(pool, 4)
+        await sizer._resize(pool, 1)  # never below max_size
+        assert pool.get_max_size() == 3
+        assert leases == [2, 1, 0]
+        assert sizer.stats()["leased"] == 0
+
+    asyncio.run(run())
+
+
+def test_sizer_grows_only_by_what_the_budget_grants():
+    async def run():
+        manager, leases = make_manager(budget_left=1)
+        await manager.sizer._resize(manager._pool, 8)
+        assert manager._pool.get_max_size() == 4
+        assert manager.sizer.lease_denied == 1
+
+    asyncio.run(run())
+
+
+def test_sizer_renews_with_a_pooled_housekeeping_connection():
+    async def run():
+        manager, _ = make_manager()
+        sizer = manager.sizer
+        del sizer._lease_query  # the real one, on the pool
+        pool = manager._pool
+        held = [await pool.acquire() for _ in range(3)]  # every lane slot busy
+
+        calls = []
+
+        async def fetchval(query, *args):
+            calls.append(args)
+            return 1
+
+        pool._pool.free = asyncio.Queue()
+        conn = type("Conn", (), {"fetchval": staticmethod(fetchval)})()
+        pool._pool.free.put_nowait(conn)
+        assert await asyncio.wait_for(sizer._lease(1), 1) == 1
+        assert calls and calls[0][2] == 1
+        for c in held:
+            await pool.release(c)
+
+    asyncio.run(run())
+
+
+def test_fixed_size_pool_never_leases():
+    manager, _ = make_manager("discord")
+    assert not manager.sizer.adaptive
+    assert not manager.sizer.uses_leases
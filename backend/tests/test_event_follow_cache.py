@@ -0,0 +1,48 @@
+"""Tests for the EventComponent follow-notification cooldown cache."""
+
+import asyncio
+from types import SimpleNamespace
+
+from components import event
+from components.event import EventComponent
+
+
+def make_component(monkeypatch, cap: int = 3):
+    monkeypatch.setattr(EventComponent, "FOLLOW_CACHE_MAX", cap)
+    return EventComponent(SimpleNamespace(token_database=None))
+
+
+def test_refollow_is_suppressed_per_channel(monkeypatch):
+    component = make_component(monkeypatch)
+    assert component._should_notify("1", "u")
+    assert not component._should_notify("1", "u")
+    assert component._should_notify("2", "u")
+
+
+def test_cooldown_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(event.time, "monotonic", lambda: now[0])
+    component = make_component(monkeypatch)
+    assert component._should_notify("1", "u")
+    now[0] += EventComponent.COOLDOWN_HOURS * 3600
+    assert component._should_notify("1", "u")
+
+
+def test_cap_is_per_channel(monkeypatch):
+    component = make_component(monkeypatch, cap=3)
+    for i in range(3):
+        component._should_notify("quiet", f"u{i}")
+    for i in range(10):  # a follow storm elsewhere
+        component._should_notify("busy", f"u{i}")
+
+    assert len(component._follow_cache["busy"]) == 3
+    assert list(component._follow_cache["quiet"]) == ["u0", "u1", "u2"]
+    assert not component._should_notify("quiet", "u0")
+
+
+def test_cache_dropped_when_leaving_channel(monkeypatch):
+    component = make_component(monkeypatch)
+    component._should_notify("1", "u")
+    component._should_notify("2", "u")
+    asyncio.run(component.event_channel_leave("1"))
+    assert list(component._follow_cache) == ["2"]
@@ -0,0 +1,140 @@
+"""Tests for the compiled message trigger matcher."""
+
+import random
+import re
+
+from shared.models.message_trigger import MessageTriggerConfig
+from shared.repositories import message_trigger
+from shared.repositories.message_trigger import MessageTriggerRepository, TriggerMatcher
+
+
+def make_trigger(
+    id: int, match_type: str, pattern: str, *, case_sensitive=False, priority=0
+) -> MessageTriggerConfig:
+    return MessageTriggerConfig(
+        id=id,
+        channel_id="1",
+        trigger_name=f"t{id}",
+        match_type=match_type,
+        pattern=pattern,
+        case_sensitive=case_sensitive,
+        response="",
+        min_role="everyone",
+        cooldown=None,
+        priority=priority,
+    )
+
+
+def ordered(triggers: list[MessageTriggerConfig]) -> list[MessageTriggerConfig]:
+    """Order as list_enabled() does: priority DESC, then id."""
+    return sorted(triggers, key=lambda t: (-t.priority, t.id))
+
+
+def linear_match(trigger: MessageTriggerConfig, text: str) -> bool:
+    """The per-trigger check the matcher replaced."""
+    pattern = trigger.pattern if trigger.case_sensitive else trigger.pattern.lower()
+    compare = text if trigger.case_sensitive else text.lower()
+    if trigger.match_type == "contains":
+        return pattern in compare
+    if trigger.match_type == "startswith":
+        return compare.startswith(pattern)
+    if trigger.match_type == "exact":
+        return compare == pattern
+    if trigger.match_type == "regex":
+        try:
+            return bool(re.search(pattern, compare))
+        except re.error:
+            return False
+    return False
+
+
+def ids(triggers: list[MessageTriggerConfig]) -> list[int]:
+    return [t.id for t in triggers]
+
+
+def test_match_types():
+    matcher = TriggerMatcher(
+        [
+            make_trigger(1, "contains", "hello"),
+            make_trigger(2, "startswith", "!hi"),
+            make_trigger(3, "exact", "gg"),
+            make_trigger(4, "regex", r"^\d+$"),
+        ]
+    )
+    assert ids(matcher.match("well hello there")) == [1]
+    assert ids(matcher.match("!hi all")) == [2]
+    assert ids(matcher.match("say !hi")) == []
+    assert ids(matcher.match("gg")) == [3]
+    assert ids(matcher.match("gg wp")) == []
+    assert ids(matcher.match("1234")) == [4]
+
+
+def test_case_folding():
+    matcher = TriggerMatcher(
+        [
+            make_trigger(1, "contains", "Hello"),
+            make_trigger(2, "contains", "Kappa", case_sensitive=True),
+            make_trigger(3, "exact", "GG"),
+            make_trigger(4, "regex", "ABC"),
+        ]
+    )
+    assert ids(matcher.match("HELLO kappa gg")) == [1]
+    assert ids(matcher.match("Kappa")) == [2]
+    assert ids(matcher.match("gG")) == [3]
+    assert ids(matcher.match("xabcx")) == [4]
+
+
+def test_overlapping_patterns():
+    matcher = TriggerMatcher(
+        [
+            make_trigger(1, "contains", "he"),
+            make_trigger(2, "contains", "she"),
+            make_trigger(3, "contains", "hers"),
+            make_trigger(4, "startswith", "sh"),
+            make_trigger(5, "startswith", "he"),
+        ]
+    )
+    assert ids(matcher.match("ushers")) == [1, 2, 3]
+    assert ids(matcher.match("shers")) == [1, 2, 3, 4]
+    assert ids(matcher.match("hershe")) == [1, 2, 3, 5]
+
+
+def test_empty_pattern_and_invalid_regex():
+    matcher = TriggerMatcher(
+        [make_trigger(1, "contains", ""), make_trigger(2, "regex", "(unclosed")]
+    )
+    assert ids(matcher.match("anything")) == [1]
+
+
+def test_priority_order_matches_linear_matcher():
+    rng = random.Random(7)
+    alphabet = "abAB "
+    types = ["contains", "startswith", "exact", "regex"]
+    triggers = ordered(
+        [
+            make_trigger(
+                i,
+                rng.choice(types),
+                "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 3))),
+                case_sensitive=rng.random() < 0.5,
+                priority=rng.randint(0, 3),
+            )
+            for i in range(1, 60)
+        ]
+    )
+    matcher = TriggerMatcher(triggers)
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+        expected = [t for t in triggers if linear_match(t, text)]
+        assert matcher.match(text) == expected, text
+
+
+def test_matcher_dropped_on_invalidate_and_leave():
+    repo = MessageTriggerRepository(pool=None)
+    message_trigger._matchers["1"] = ([], TriggerMatcher([]))
+    repo.invalidate_cache("1")
+    assert "1" not in message_trigger._matchers
+
+    message_trigger._matchers["1"] = ([], TriggerMatcher([]))
+    MessageTriggerRepository.drop_matcher("1")
+    assert "1" not in message_trigger._matchers
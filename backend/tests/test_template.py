@@ -0,0 +1,37 @@
+"""Tests for the twitch bot's response template compiler."""
+
+from core.template import compile_template, render_template
+
+
+def test_variables():
+    assert render_template("hi $(user) in $(channel)", {"user": "a", "channel": "b"}) == "hi a in b"
+
+
+def test_unknown_variable_kept():
+    assert render_template("$(user) $(nope)", {"user": "a"}) == "a $(nope)"
+    assert render_template("$(user)") == "$(user)"
+
+
+def test_substituted_values_are_not_expanded():
+    assert render_template("$(query)", {"query": "$(user)", "user": "a"}) == "$(user)"
+
+
+def test_random_range():
+    for _ in range(50):
+        assert 3 <= int(render_template("$(random 5,3)")) <= 5
+    assert render_template("$(random 7, 7)") == "7"
+
+
+def test_pick():
+    for _ in range(20):
+        assert render_template("$(pick a, b ,c)") in {"a", "b", "c"}
+    assert render_template("[$(pick , )]") == "[]"
+
+
+def test_compiled_once_and_static_detection():
+    template = compile_template("plain text")
+    assert template is compile_template("plain text")
+    assert template.is_static
+    assert template.render() == "plain text"
+    assert not compile_template("x $(user)").is_static
+    assert not compile_template("$(random 1,2)").is_static
@@ -15,6 +15,7 @@ from openai import (
 from openai.types.chat import ChatCompletionMessageParam
 from twitchio.ext import commands
 
+from core.chat_dispatcher import SendPriority
 from core.config import get_settings
 from core.guards import check_command
 from shared.repositories.command_config import CommandConfigRepository
@@ -81,6 +82,12 @@ class AIComponent(commands.Component):
 
         LOGGER.info(f"AIComponent initialized: primary={model}, fallbacks={len(self.models) - 1}")
 
+    def _reply(self, ctx: commands.Context[Bot], text: str) -> None:
+        """Queue a reply through the bot's outbound chat dispatcher."""
+        self.bot.chat_queue.enqueue(
+            ctx.channel.id, text, SendPriority.COMMAND, reply_to=ctx.message.id
+        )
+
     @commands.command(aliases=["問"])
     async def ai(self, ctx: commands.Context[Bot], *, message: str | None = None) -> None:
         """Ask AI a question (text only).
@@ -97,7 +104,7 @@ class AIComponent(commands.Component):
             return
 
         if not message or not message.strip():
-            await ctx.reply("用法: !ai <問題>")
+            self._reply(ctx, "用法: !ai <問題>")
             return
 
         try:
@@ -156,26 +163,26 @@ class AIComponent(commands.Component):
                 response = response[:497] + "..."
 
             if response:
-                await ctx.reply(response)
+                self._reply(ctx, response)
             elif last_error:
                 raise last_error
             else:
                 LOGGER.warning("Empty content after all models")
-                await ctx.reply("AI 回應為空，請重試")
+                self._reply(ctx, "AI 回應為空，請重試")
         except RateLimitError as e:
-            await ctx.reply("AI 功能目前使用人數過多，請稍後再試")
+            self._reply(ctx, "AI 功能目前使用人數過多，請稍後再試")
             LOGGER.error(f"AI command error: {e}")
         except PermissionDeniedError as e:
-            await ctx.reply("AI 服務暫時無法使用，請聯絡管理員")
+            self._reply(ctx, "AI 服務暫時無法使用，請聯絡管理員")
             LOGGER.error(f"AI command error: {e}")
         except AuthenticationError as e:
-            await ctx.reply("AI 服務設定異常，請聯絡管理員")
+            self._reply(ctx, "AI 服務設定異常，請聯絡管理員")
             LOGGER.error(f"AI command error: {e}")
         except APITimeoutError as e:
-            await ctx.reply("AI 回應逾時，請稍後再試")
+            self._reply(ctx, "AI 回應逾時，請稍後再試")
             LOGGER.error(f"AI command error: {e}")
         except (BadRequestError, Exception) as e:
-            await ctx.reply("AI 服務暫時無法使用，請稍後再試")
+            self._reply(ctx, "AI 服務暫時無法使用，請稍後再試")
             LOGGER.error(f"AI command error: {e}")
 
 
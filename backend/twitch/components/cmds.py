@@ -35,24 +35,6 @@ class GeneralCommands(commands.Component):
         self.cmd_repo = CommandConfigRepository(self.bot.token_database)  # type: ignore[attr-defined]
         self.channel_repo = self.bot.channels  # type: ignore[attr-defined]
 
-    async def _record_command(self, ctx: commands.Context, command_name: str) -> None:
-        """Helper to record command usage to analytics"""
-        try:
-            channel_id = ctx.channel.id
-            if hasattr(self.bot, "_active_sessions") and hasattr(self.bot, "analytics"):
-                session_id = self.bot._active_sessions.get(channel_id)
-                if session_id:
-                    analytics = self.bot.analytics
-                    await analytics.record_command_usage(
-                        session_id=session_id,
-                        channel_id=channel_id,
-                        command_name=f"!{command_name}",
-                    )
-        except Exception as e:
-            from core.bot import LOGGER
-
-            LOGGER.error(f"Failed to record command usage: {e}")
-
     @commands.command(aliases=["hello", "hey"])
     async def hi(self, ctx: commands.Context) -> None:
         """Greet the user.
@@ -73,7 +55,6 @@ class GeneralCommands(commands.Component):
             await ctx.reply(response)
         else:
             await ctx.reply(f"你好，{ctx.chatter.display_name}！")
-        await self._record_command(ctx, "hi")
 
     @commands.command(aliases=["commands"])
     async def help(self, ctx: commands.Context) -> None:
@@ -89,7 +70,6 @@ class GeneralCommands(commands.Component):
 
         channel_name = ctx.channel.name
         await ctx.reply(f"此頻道的指令列表： {FRONTEND_URL}/{channel_name}/commands")
-        await self._record_command(ctx, "help")
 
     @commands.command()
     async def uptime(self, ctx: commands.Context) -> None:
@@ -120,8 +100,6 @@ class GeneralCommands(commands.Component):
         else:
             await ctx.reply("目前未開播")
 
-        await self._record_command(ctx, "uptime")
-
     @commands.command(name="斥責", aliases=["嚴厲斥責"])
     async def condemn(self, ctx: commands.Context) -> None:
         """頻道反惡意言論聲明。
@@ -138,7 +116,6 @@ class GeneralCommands(commands.Component):
             "本頻道實況主不認可並嚴厲斥責聊天室與斗內的任何惡意言論，"
             "包含且不限於種族歧視、性騷擾、色情暴力、涉及親屬等不當內容。"
         )
-        await self._record_command(ctx, "斥責")
 
     @commands.Component.listener()
     async def event_stream_online(self, payload: twitchio.StreamOnline) -> None:
@@ -202,23 +179,14 @@ class GeneralCommands(commands.Component):
             if session_id:
                 analytics = self.bot.analytics
 
-                # Flush chatter stats buffer to database
-                if hasattr(self.bot, "_channel_line_counts"):
-                    self.bot._channel_line_counts.pop(channel_id, None)
-                if hasattr(self.bot, "_chatter_buffers"):
-                    chatter_data = self.bot._chatter_buffers.pop(channel_id, {})
-                    if chatter_data:
-                        try:
-                            await analytics.flush_chatter_stats(
-                                session_id=session_id,
-                                channel_id=channel_id,
-                                chatters=chatter_data,
-                            )
-                            LOGGER.info(
-                                f"Flushed {len(chatter_data)} chatters for session {session_id}"
-                            )
-                        except Exception as e:
-                            LOGGER.error(f"Failed to flush chatter stats: {e}")
+                # Final command usage flush for this session
+                await self.bot.command_usage.flush(session_id)
+
+                # Flush chatters active since the last checkpoint
+                self.bot._channel_line_counts.pop(channel_id, None)
+                flushed = await self.bot.flush_chatters(channel_id, session_id)
+                if flushed:
+                    LOGGER.info(f"Flushed {flushed} chatters for session {session_id}")
 
                 ended_at = datetime.now()
                 for attempt in range(3):
@@ -1,10 +1,15 @@
+import asyncio
 import logging
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from datetime import datetime
 from typing import TYPE_CHECKING
 
 import twitchio
 from twitchio.ext import commands
 
+from core.chat_dispatcher import SendPriority
+from core.template import render_template
 from shared.repositories.event_config import DEFAULT_TEMPLATES, EventConfigRepository
 
 if TYPE_CHECKING:
@@ -14,74 +19,192 @@ if TYPE_CHECKING:
 LOGGER: logging.Logger = logging.getLogger("EventComponent")
 
 
+class _Burst:
+    """Follow / subscribe events of one channel collected during a coalescing window."""
+
+    __slots__ = ("template", "names", "tiers", "rows")
+
+    def __init__(self, template: str) -> None:
+        self.template = template
+        self.names: list[str] = []
+        self.tiers: list[str] = []
+        self.rows: list[tuple] = []
+
+
+def _summarize_names(names: list[str], shown: int = 2) -> str:
+    """'A、B、C' for short lists, 'A、B 等 20 人' for longer ones."""
+    if len(names) <= shown + 1:
+        return "、".join(names)
+    return f"{'、'.join(names[:shown])} 等 {len(names)} 人"
+
+
 class EventComponent(commands.Component):
     """EventSub 事件監聽組件"""
 
     # 防刷機制設定
     COOLDOWN_HOURS = 24  # 冷卻時間（小時）
-    CACHE_CLEANUP_INTERVAL = 100  # 每處理 N 個事件就清理一次過期 cache
+    FOLLOW_CACHE_MAX = 5_000  # 追隨 cache 上限（每個頻道）
+    # 合併視窗（秒）：同頻道同類事件在視窗內合併為一則訊息，可由 event config options.coalesce_seconds 覆寫
+    COALESCE_SECONDS = 5.0
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot: Bot = bot  # type: ignore[assignment]
-        # 追隨事件 cache: {user_id: last_notified_time}
-        self._follow_cache: dict[str, datetime] = {}
-        # 事件計數器，用於定期清理
-        self._event_counter = 0
+        # 追隨事件 cache: {channel_id: {user_id: last_notified_monotonic}}，各頻道依通知時間排序
+        self._follow_cache: dict[str, OrderedDict[str, float]] = {}
+        # 合併中的事件: {(channel_id, event_type): _Burst}
+        self._bursts: dict[tuple[str, str], _Burst] = {}
         # Event config repository (with TTL cache)
         self.event_configs = EventConfigRepository(self.bot.token_database)  # type: ignore[attr-defined]
 
-    def _cleanup_cache(self, cache: dict[str, datetime]) -> None:
-        """清理過期的 cache 項目"""
-        now = datetime.now()
-        cooldown = timedelta(hours=self.COOLDOWN_HOURS)
-        expired_keys = [
-            user_id for user_id, last_time in cache.items() if now - last_time > cooldown
-        ]
-        for key in expired_keys:
-            del cache[key]
-        if expired_keys:
-            LOGGER.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
-
-    def _should_notify(self, user_id: str) -> bool:
+    def _should_notify(self, channel_id: str, user_id: str) -> bool:
         """檢查是否應該發送通知（防刷機制，僅用於追隨事件）"""
-        self._event_counter += 1
-
-        # 定期清理過期 cache
-        if self._event_counter % self.CACHE_CLEANUP_INTERVAL == 0:
-            self._cleanup_cache(self._follow_cache)
-
-        now = datetime.now()
-        cooldown = timedelta(hours=self.COOLDOWN_HOURS)
-
-        if user_id in self._follow_cache:
-            last_time = self._follow_cache[user_id]
-            time_diff = now - last_time
-            if time_diff < cooldown:
-                return False
-
-        # 更新 cache
-        self._follow_cache[user_id] = now
+        now = time.monotonic()
+        cache = self._follow_cache.get(channel_id)
+        if cache is None:
+            cache = self._follow_cache[channel_id] = OrderedDict()
+        cooldown = self.COOLDOWN_HOURS * 3600
+
+        # 依插入順序即到期順序：從最舊一端彈出過期項目（攤銷 O(1)）
+        while cache:
+            oldest_key, oldest_time = next(iter(cache.items()))
+            if now - oldest_time < cooldown:
+                break
+            del cache[oldest_key]
+
+        if user_id in cache:
+            return False
+
+        # 更新 cache（超過上限時丟棄該頻道最舊項目，熱門頻道不會擠掉其他頻道）
+        cache[user_id] = now
+        if len(cache) > self.FOLLOW_CACHE_MAX:
+            cache.popitem(last=False)
         return True
 
+    async def _get_template(self, channel_id: str, event_type: str) -> tuple[str | None, dict]:
+        """Fetch (template, options) for an event type. Template is None if disabled."""
+        config = await self.event_configs.get_config(channel_id, event_type)
+        if config is None:
+            # No config yet — use hardcoded default
+            return DEFAULT_TEMPLATES.get(event_type), {}
+        if not config.enabled:
+            return None, config.options
+        return config.message_template, config.options
+
     async def _get_message(
         self, channel_id: str, event_type: str, variables: dict[str, str]
     ) -> str | None:
         """Fetch template from DB and resolve variables. Returns None if disabled."""
-        config = await self.event_configs.get_config(channel_id, event_type)
-        if config is None:
-            # No config yet — use hardcoded default
-            template = DEFAULT_TEMPLATES.get(event_type)
-            if template is None:
-                return None
-        else:
-            if not config.enabled:
-                return None
-            template = config.message_template
+        template, _ = await self._get_template(channel_id, event_type)
+        if template is None:
+            return None
+        return render_template(template, variables)
+
+    # ------------------------------------------------------------------
+    # Burst coalescing (follow / subscribe)
+    # ------------------------------------------------------------------
+
+    def _analytics_row(
+        self, channel_id: str, event_type: str, user: twitchio.PartialUser, metadata: dict | None
+    ) -> tuple | None:
+        """Build a stream_events row, or None when the channel has no live session."""
+        session_id = self.bot._active_sessions.get(channel_id)
+        if not session_id:
+            return None
+        display_name = getattr(user, "display_name", None)
+        return (
+            session_id,
+            channel_id,
+            event_type,
+            user.id,
+            user.name or display_name or "",
+            display_name,
+            metadata,
+            datetime.now(),
+        )
+
+    def _announce(
+        self,
+        channel_id: str,
+        event_type: str,
+        template: str,
+        options: dict,
+        user_name: str,
+        variables: dict[str, str],
+        row: tuple | None,
+    ) -> None:
+        """Send the first event of a burst at once; merge the rest into one message."""
+        key = (channel_id, event_type)
+        burst = self._bursts.get(key)
+        if burst is not None:
+            # 視窗內：累積，於視窗結束時合併發送
+            burst.template = template
+            burst.names.append(user_name)
+            if "tier" in variables:
+                burst.tiers.append(variables["tier"])
+            if row is not None:
+                burst.rows.append(row)
+            return
 
-        message = template
-        for key, value in variables.items():
-            message = message.replace(f"$({key})", value)
-        return message
+        self.bot.chat_queue.enqueue(
+            channel_id, render_template(template, variables), SendPriority.EVENT
+        )
+        window = float(options.get("coalesce_seconds", self.COALESCE_SECONDS))
+        if window <= 0:
+            if row is not None:
+                asyncio.create_task(self._write_rows([row]))
+            return
+
+        burst = _Burst(template)
+        if row is not None:
+            burst.rows.append(row)
+        self._bursts[key] = burst
+        asyncio.create_task(self._close_window(key, window))
+
+    async def _close_window(self, key: tuple[str, str], window: float) -> None:
+        """At the end of each window, send one merged message and batch-insert its rows."""
+        channel_id, event_type = key
+        while True:
+            await asyncio.sleep(window)
+            burst = self._bursts.get(key)
+            if burst is None:  # component torn down
+                return
+            if not burst.names:
+                del self._bursts[key]
+                await self._write_rows(burst.rows)
+                return
+
+            # Events keep arriving: start the next window before sending this one
+            self._bursts[key] = _Burst(burst.template)
+            variables = {"user": _summarize_names(burst.names)}
+            if burst.tiers:
+                variables["tier"] = "/".join(dict.fromkeys(burst.tiers))
+            self.bot.chat_queue.enqueue(
+                channel_id, render_template(burst.template, variables), SendPriority.EVENT
+            )
+            LOGGER.info(f"[{channel_id}] Coalesced {len(burst.names)} {event_type} events")
+            await self._write_rows(burst.rows)
+
+    async def _write_rows(self, rows: list[tuple]) -> None:
+        if not rows:
+            return
+        try:
+            await self.bot.analytics.record_stream_events_batch(rows)
+        except Exception as e:
+            LOGGER.error(f"Failed to record {len(rows)} stream events: {e}")
+
+    async def component_teardown(self) -> None:
+        """Write rows still held by open coalescing windows."""
+        bursts, self._bursts = self._bursts, {}
+        await self._write_rows([row for burst in bursts.values() for row in burst.rows])
+
+    # ------------------------------------------------------------------
+    # Listeners
+    # ------------------------------------------------------------------
+
+    @commands.Component.listener()
+    async def event_channel_leave(self, channel_id: str) -> None:
+        """Bot 離開頻道：丟棄該頻道的追隨 cache"""
+        self._follow_cache.pop(channel_id, None)
 
     @commands.Component.listener()
     async def event_follow(
@@ -95,36 +218,21 @@ class EventComponent(commands.Component):
         channel_id = payload.broadcaster.id
 
         # 防刷檢查
-        if not self._should_notify(user_id):
+        if not self._should_notify(channel_id, user_id):
             LOGGER.info(f"[{broadcaster_name}] Follow: {user_name} (cooldown)")
             return
 
         try:
-            message = await self._get_message(channel_id, "follow", {"user": user_name})
-            if message is None:
+            template, options = await self._get_template(channel_id, "follow")
+            if template is None:
                 LOGGER.info(f"[{broadcaster_name}] Follow: {user_name} (disabled)")
                 return
 
-            await payload.broadcaster.send_message(
-                message=message,
-                sender=self.bot.bot_id,
-                token_for=self.bot.bot_id,
+            row = self._analytics_row(channel_id, "follow", payload.user, None)
+            self._announce(
+                channel_id, "follow", template, options, user_name, {"user": user_name}, row
             )
             LOGGER.info(f"[{broadcaster_name}] Follow: {user_name}")
-
-            # Record to analytics database
-            if hasattr(self.bot, "_active_sessions") and hasattr(self.bot, "analytics"):
-                session_id = self.bot._active_sessions.get(channel_id)
-                if session_id:
-                    analytics = self.bot.analytics
-                    await analytics.record_follow_event(
-                        session_id=session_id,
-                        channel_id=channel_id,
-                        user_id=user_id,
-                        username=payload.user.name or user_name,
-                        display_name=payload.user.display_name,
-                        occurred_at=datetime.now(),
-                    )
         except Exception as e:
             LOGGER.error(f"[{broadcaster_name}] Follow: {user_name} (error: {e})")
 
@@ -146,37 +254,29 @@ class EventComponent(commands.Component):
         sub_type = "Gift" if payload.gift else "Sub"
 
         try:
-            message = await self._get_message(
-                channel_id, "subscribe", {"user": user_name, "tier": tier_name}
-            )
-            if message is None:
+            template, options = await self._get_template(channel_id, "subscribe")
+            if template is None:
                 LOGGER.info(
                     f"[{broadcaster_name}] {sub_type}: {user_name} ({tier_name}) (disabled)"
                 )
                 return
 
-            await payload.broadcaster.send_message(
-                message=message,
-                sender=self.bot.bot_id,
-                token_for=self.bot.bot_id,
+            row = self._analytics_row(
+                channel_id,
+                "subscribe",
+                payload.user,
+                {"tier": payload.tier, "is_gift": payload.gift},
+            )
+            self._announce(
+                channel_id,
+                "subscribe",
+                template,
+                options,
+                user_name,
+                {"user": user_name, "tier": tier_name},
+                row,
             )
             LOGGER.info(f"[{broadcaster_name}] {sub_type}: {user_name} ({tier_name})")
-
-            # Record to analytics database
-            if hasattr(self.bot, "_active_sessions") and hasattr(self.bot, "analytics"):
-                session_id = self.bot._active_sessions.get(channel_id)
-                if session_id:
-                    analytics = self.bot.analytics
-                    await analytics.record_subscribe_event(
-                        session_id=session_id,
-                        channel_id=channel_id,
-                        user_id=payload.user.id,
-                        username=payload.user.name or user_name,
-                        display_name=payload.user.display_name,
-                        tier=payload.tier,
-                        is_gift=payload.gift,
-                        occurred_at=datetime.now(),
-                    )
         except Exception as e:
             LOGGER.error(f"[{broadcaster_name}] {sub_type}: {user_name} ({tier_name}) (error: {e})")
 
@@ -204,11 +304,7 @@ class EventComponent(commands.Component):
                 broadcaster_id, "raid", {"user": raider_name, "count": str(viewer_count)}
             )
             if message is not None:
-                await payload.to_broadcaster.send_message(
-                    message=message,
-                    sender=self.bot.bot_id,
-                    token_for=self.bot.bot_id,
-                )
+                self.bot.chat_queue.enqueue(broadcaster_id, message, SendPriority.EVENT)
 
             # 執行 Shoutout（依據 config options 控制）
             if auto_shoutout:
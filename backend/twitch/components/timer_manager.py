@@ -4,45 +4,20 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import random
-import re
 from datetime import datetime
 from typing import TYPE_CHECKING
 
 from twitchio.ext import commands
 
+from core.chat_dispatcher import SendPriority
+from core.template import render_template
+from shared.database import BACKGROUND, db_lane
+
 if TYPE_CHECKING:
     from core.bot import Bot
 
 LOGGER = logging.getLogger("TimerManager")
 
-_RANDOM_PATTERN = re.compile(r"\$\(random\s+(\d+)\s*,\s*(\d+)\)")
-_PICK_PATTERN = re.compile(r"\$\(pick\s+(.+?)\)")
-
-
-def _render_message(template: str, channel_name: str) -> str:
-    """Substitute supported variables in a timer message template.
-
-    Supported: $(channel), $(random min,max), $(pick a,b,c)
-    $(user) and $(query) are not applicable for timers and are left as-is.
-    """
-    text = template.replace("$(channel)", channel_name)
-
-    def _random_replace(m: re.Match) -> str:
-        lo, hi = int(m.group(1)), int(m.group(2))
-        if lo > hi:
-            lo, hi = hi, lo
-        return str(random.randint(lo, hi))
-
-    text = _RANDOM_PATTERN.sub(_random_replace, text)
-
-    def _pick_replace(m: re.Match) -> str:
-        items = [i.strip() for i in m.group(1).split(",") if i.strip()]
-        return random.choice(items) if items else ""
-
-    text = _PICK_PATTERN.sub(_pick_replace, text)
-    return text
-
 
 class TimerManagerComponent(commands.Component):
     """Background component that polls timers every 60 seconds and fires them
@@ -64,6 +39,7 @@ class TimerManagerComponent(commands.Component):
         asyncio.create_task(self._timer_poll_loop())
         LOGGER.info("TimerManagerComponent loaded, poll loop started")
 
+    @db_lane(BACKGROUND)
     async def _timer_poll_loop(self) -> None:
         """Main poll loop: checks all channels every 60 seconds."""
         while True:
@@ -94,10 +70,10 @@ class TimerManagerComponent(commands.Component):
                     if current_lines - lines_at_last < timer.min_lines:
                         continue
 
-                    await self._fire_timer(channel_id, timer, current_lines, now)
+                    await self._fire_timer(channel_id, timer)
 
-    async def _fire_timer(self, channel_id: str, timer, current_lines: int, now: datetime) -> None:
-        """Send the timer message and record the fire time/line snapshot."""
+    async def _fire_timer(self, channel_id: str, timer) -> None:
+        """Queue the timer message; the fire time/line snapshot is recorded once it is sent."""
         try:
             channel_record = await self.bot.channels.get_channel(channel_id)
             channel_name = channel_record.channel_name if channel_record else None
@@ -107,18 +83,19 @@ class TimerManagerComponent(commands.Component):
                 )
                 return
 
-            message = _render_message(timer.message_template, channel_name)
-            twitch_channel = self.bot.get_channel(channel_name)
-            if not twitch_channel:
-                LOGGER.warning(
-                    f"Timer '{timer.timer_name}': channel '{channel_name}' not in bot cache"
+            # $(user) and $(query) don't apply to timers and are left as-is
+            message = render_template(timer.message_template, {"channel": channel_name})
+
+            def _record_fire() -> None:
+                self._timer_last_fire[timer.id] = datetime.now()
+                self._timer_last_fire_lines[timer.id] = self.bot._channel_line_counts.get(
+                    channel_id, 0
                 )
-                return
+                LOGGER.info(f"Timer '{timer.timer_name}' fired in #{channel_name}")
 
-            await twitch_channel.send(message)
-            self._timer_last_fire[timer.id] = now
-            self._timer_last_fire_lines[timer.id] = current_lines
-            LOGGER.info(f"Timer '{timer.timer_name}' fired in #{channel_name}")
+            self.bot.chat_queue.enqueue(
+                channel_id, message, SendPriority.TIMER, on_sent=_record_fire
+            )
 
         except Exception as e:
             LOGGER.error(f"Timer '{timer.timer_name}' fire failed: {e}")
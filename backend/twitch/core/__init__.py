@@ -1,5 +1,9 @@
 """Core modules for Twitch bot."""
 
+from shared.pg_listener import pg_listen
+
+from .chat_dispatcher import ChatDispatcher, SendPriority
+from .command_usage import CommandUsageAggregator
 from .config import (
     BOT_SCOPES,
     BROADCASTER_SCOPES,
@@ -10,11 +14,12 @@ from .config import (
     load_env_config,
     validate_env_vars,
 )
-from .guards import check_command, has_role, is_on_cooldown, record_cooldown
+from .cooldowns import CooldownStore
+from .guards import acquire_cooldown, check_command, has_role, is_on_cooldown, record_cooldown
 from .health_server import HealthCheckServer
 from .logging import setup_logging
-from .pg_listener import pg_listen
 from .subscriptions import get_channel_subscriptions
+from .template import compile_template, render_template
 
 __all__ = [
     # Settings
@@ -34,11 +39,21 @@ __all__ = [
     "HealthCheckServer",
     # Twitch specific
     "get_channel_subscriptions",
+    # Outbound chat
+    "ChatDispatcher",
+    "SendPriority",
+    # Analytics
+    "CommandUsageAggregator",
     # Guards
+    "CooldownStore",
+    "acquire_cooldown",
     "check_command",
     "has_role",
     "is_on_cooldown",
     "record_cooldown",
     # PG Listener
     "pg_listen",
+    # Templates
+    "compile_template",
+    "render_template",
 ]
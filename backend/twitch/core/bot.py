@@ -3,11 +3,10 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import logging
-import random
-import re
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import asyncpg
 import twitchio
@@ -15,10 +14,21 @@ from twitchio import eventsub
 from twitchio.ext import commands
 from twitchio.ext.commands import CommandNotFound
 
+from core.chat_dispatcher import ChatDispatcher, SendPriority
+from core.chatter_table import ChatterTable
+from core.command_usage import CommandUsageAggregator
 from core.config import COMPONENTS_DIR
-from core.guards import has_role, is_on_cooldown, record_cooldown
-from core.pg_listener import pg_listen
+from core.guards import acquire_cooldown, has_role
 from core.subscriptions import get_channel_subscriptions
+from core.template import render_template
+from shared.cache import channel_tag
+from shared.cache_bus import cache_bus
+from shared.database import BACKGROUND, BULK, db_lane
+from shared.models.channel import Channel
+from shared.models.command_config import CommandConfig
+from shared.models.event_config import EventConfig
+from shared.pg_listener import PgListener
+from shared.repositories._notify import model_from_json_row
 from shared.repositories.analytics import AnalyticsRepository
 from shared.repositories.channel import ChannelRepository
 from shared.repositories.command_config import (
@@ -26,15 +36,13 @@ from shared.repositories.command_config import (
     RedemptionConfigRepository,
     set_builtin_commands,
 )
+from shared.repositories.config_sync import ConfigSyncRepository
+from shared.repositories.event_config import EventConfigRepository
 from shared.repositories.message_trigger import MessageTriggerRepository
 from shared.repositories.timer import TimerConfigRepository
 
 LOGGER: logging.Logger = logging.getLogger("Bot")
 
-_RANDOM_PATTERN = re.compile(r"\$\(random\s+(\d+)\s*,\s*(\d+)\)")
-_PICK_PATTERN = re.compile(r"\$\(pick\s+(.+?)\)")
-_COUNT_PATTERN = re.compile(r"\$\(count\)")
-
 
 def _substitute_variables(
     text: str,
@@ -42,7 +50,7 @@ def _substitute_variables(
     channel_name: str,
     query: str,
 ) -> str:
-    """Replace response variables in custom command text.
+    """Render response variables in custom command / trigger text.
 
     Supported variables:
         $(user)             Chatter display name
@@ -52,32 +60,29 @@ def _substitute_variables(
         $(pick a,b,c)       Random pick from comma-separated items
         $(count)            Command usage count (placeholder)
     """
-    text = text.replace("$(user)", chatter.display_name or chatter.name or "")
-    text = text.replace("$(query)", query)
-    text = text.replace("$(channel)", channel_name or "")
-
-    # $(random min,max) -> random integer in [min, max]
-    def _random_replace(m: re.Match) -> str:
-        lo, hi = int(m.group(1)), int(m.group(2))
-        if lo > hi:
-            lo, hi = hi, lo
-        return str(random.randint(lo, hi))
-
-    text = _RANDOM_PATTERN.sub(_random_replace, text)
-
-    # $(pick a,b,c) -> random choice from list
-    def _pick_replace(m: re.Match) -> str:
-        items = [i.strip() for i in m.group(1).split(",") if i.strip()]
-        return random.choice(items) if items else ""
-
-    text = _PICK_PATTERN.sub(_pick_replace, text)
-
-    return text
+    return render_template(
+        text,
+        {
+            "user": chatter.display_name or chatter.name or "",
+            "query": query,
+            "channel": channel_name or "",
+        },
+    )
 
 
 class Bot(commands.AutoBot):
     token_database: asyncpg.Pool
 
+    # Seconds between incremental chatter_stats checkpoints during live sessions
+    CHATTER_CHECKPOINT_INTERVAL = 120
+    # Most chatters a channel's buffer keeps across failed checkpoints; past
+    # this, counts from failed checkpoints are dropped (bounds memory in an outage)
+    CHATTER_BUFFER_MAX = 50_000
+    # Seconds between incremental config syncs (safety net for missed NOTIFYs)
+    CONFIG_SYNC_INTERVAL = 300
+    # Tombstones older than this are purged (must exceed one sync interval)
+    TOMBSTONE_RETENTION = timedelta(days=1)
+
     def __init__(
         self,
         *,
@@ -92,6 +97,8 @@ class Bot(commands.AutoBot):
     ) -> None:
         self.token_database = token_database
         self._database_url = database_url
+        # One LISTEN connection shared by every NOTIFY channel this process uses
+        self.pg_listener = PgListener(database_url)
         self._subscribed_channels: set[str] = set()
         self._subscription_ids: dict[str, list[str]] = {}
         self._bot_id = bot_id
@@ -100,13 +107,25 @@ class Bot(commands.AutoBot):
         self.analytics = AnalyticsRepository(token_database)
         self.command_configs = CommandConfigRepository(token_database)
         self.redemption_configs = RedemptionConfigRepository(token_database)
+        self.event_configs = EventConfigRepository(token_database)
         self.timer_configs = TimerConfigRepository(token_database)
         self.message_trigger_configs = MessageTriggerRepository(token_database)
+        self.config_sync = ConfigSyncRepository(token_database)
+        # updated_at watermark of the last config sync (None → next pass reloads all)
+        self._config_watermark: datetime | None = None
+        self._config_sync_lock = asyncio.Lock()
         self._active_sessions: dict[str, int] = {}
-        # In-memory chatter buffers: {channel_id: {user_id: {"username": str, "count": int, "last_at": datetime}}}
-        self._chatter_buffers: dict[str, dict[str, dict]] = {}
+        # Write-behind command usage counters → command_stats
+        self.command_usage = CommandUsageAggregator(self.analytics, self._active_sessions)
+        # Outbound chat: per-channel priority queues under Twitch rate limits
+        self.chat_queue = ChatDispatcher(self)
+        # In-memory chatter buffers: {channel_id: ChatterTable}
+        # Only holds chatters active since the last checkpoint (counts are deltas).
+        self._chatter_buffers: dict[str, ChatterTable] = {}
         # Per-channel cumulative message count during active sessions (for timer min_lines gate)
         self._channel_line_counts: dict[str, int] = {}
+        # Channels with a command routing table build in flight
+        self._warming_channels: set[str] = set()
 
         init_kwargs: dict = dict(
             client_id=client_id,
@@ -165,22 +184,38 @@ class Bot(commands.AutoBot):
             f"{[c['command_name'] for c in builtin_commands]}"
         )
 
+        # Cross-process cache invalidation (API / Discord writes reach this process);
+        # its LISTEN shares the bot's listener connection
+        cache_bus.start(self._database_url, self.token_database, listener=self.pg_listener)
+
+        await self._init_config_watermark()
         asyncio.create_task(self._subscribe_initial_channels())
-        asyncio.create_task(pg_listen(self._database_url, "new_token", self._handle_new_token))
-        asyncio.create_task(
-            pg_listen(self._database_url, "channel_toggle", self._handle_channel_toggle)
-        )
-        asyncio.create_task(
-            pg_listen(self._database_url, "config_change", self._handle_config_change)
+        (
+            self.pg_listener.add("new_token", self._handle_new_token)
+            .add("channel_toggle", self._handle_channel_toggle)
+            .add("config_change", self._handle_config_change)
+            .on_reconnect(self._resync_after_listen_gap)
         )
+        self.pg_listener.start()
         asyncio.create_task(self._recover_active_sessions())
         asyncio.create_task(self._session_verify_loop())
-        asyncio.create_task(self._pool_heartbeat_loop())
-        asyncio.create_task(self._periodic_cache_refresh())
+        asyncio.create_task(self._periodic_config_sync())
+        self.command_usage.start()
+        asyncio.create_task(self._chatter_checkpoint_loop())
 
     async def setup_database(self) -> None:
         pass
 
+    async def close(self, **options) -> None:
+        await self.chat_queue.close()
+        try:
+            await self.command_usage.close()
+        except Exception as e:
+            LOGGER.warning(f"Final command usage flush failed: {e}")
+        await self.pg_listener.stop()
+        await cache_bus.stop()
+        await super().close(**options)
+
     # ------------------------------------------------------------------
     # Events
     # ------------------------------------------------------------------
@@ -239,17 +274,10 @@ class Bot(commands.AutoBot):
             channel_id = payload.broadcaster.id
             chatter_id = payload.chatter.id
             if chatter_id != self.bot_id and channel_id in self._active_sessions:
-                buf = self._chatter_buffers.setdefault(channel_id, {})
-                if chatter_id in buf:
-                    buf[chatter_id]["count"] += 1
-                    buf[chatter_id]["last_at"] = datetime.now()
-                    buf[chatter_id]["username"] = payload.chatter.name
-                else:
-                    buf[chatter_id] = {
-                        "username": payload.chatter.name,
-                        "count": 1,
-                        "last_at": datetime.now(),
-                    }
+                buf = self._chatter_buffers.get(channel_id)
+                if buf is None:
+                    buf = self._chatter_buffers[channel_id] = ChatterTable()
+                buf.record(chatter_id, payload.chatter.name)
                 # Cumulative line count for timer min_lines gate
                 self._channel_line_counts[channel_id] = (
                     self._channel_line_counts.get(channel_id, 0) + 1
@@ -257,14 +285,18 @@ class Bot(commands.AutoBot):
 
             # Normalize command name to lowercase for case-insensitive matching
             # e.g. "!AI question" → "!ai question", "!Help" → "!help"
+            cmd_name = ""
+            query = ""
             if payload.text and payload.text.startswith("!"):
                 parts = payload.text.split(maxsplit=1)
                 if parts:
-                    parts[0] = parts[0].lower()
-                    payload.text = " ".join(parts)
+                    head = parts[0].lower()
+                    query = parts[1] if len(parts) > 1 else ""
+                    cmd_name = head[1:]
+                    payload.text = f"{head} {query}" if query else head
 
             # Custom command handling: text response or redirect
-            handled = await self._handle_custom_command(payload)
+            handled = await self._handle_custom_command(payload, cmd_name, query)
             if handled:
                 return
 
@@ -288,23 +320,6 @@ class Bot(commands.AutoBot):
     # Message trigger handling
     # ------------------------------------------------------------------
 
-    def _match_trigger(self, trigger, text: str) -> bool:
-        """Check if text matches a trigger's pattern."""
-        pattern = trigger.pattern if trigger.case_sensitive else trigger.pattern.lower()
-        compare = text if trigger.case_sensitive else text.lower()
-        if trigger.match_type == "contains":
-            return pattern in compare
-        if trigger.match_type == "startswith":
-            return compare.startswith(pattern)
-        if trigger.match_type == "exact":
-            return compare == pattern
-        if trigger.match_type == "regex":
-            try:
-                return bool(re.search(pattern, compare))
-            except re.error:
-                return False
-        return False
-
     async def _handle_message_trigger(self, payload: twitchio.ChatMessage) -> bool:
         """Check enabled triggers for the channel and respond to first match.
 
@@ -314,21 +329,17 @@ class Bot(commands.AutoBot):
         text = payload.text or ""
 
         try:
-            triggers = await self.message_trigger_configs.list_enabled(channel_id)
+            matcher = await self.message_trigger_configs.get_matcher(channel_id)
         except Exception as e:
             LOGGER.warning(f"[TRIGGER] Failed to load triggers for {channel_id}: {e}")
             return False
 
-        for trigger in triggers:
-            if not self._match_trigger(trigger, text):
-                continue
+        for trigger in matcher.match(text):
             if not has_role(payload.chatter, trigger.min_role):
                 continue
 
-            trigger_key = f"trigger:{trigger.id}"
-            if is_on_cooldown(channel_id, trigger_key, trigger, None):
+            if not acquire_cooldown(channel_id, f"trigger:{trigger.id}", trigger):
                 continue
-            record_cooldown(channel_id, trigger_key)
 
             response = _substitute_variables(
                 trigger.response,
@@ -336,19 +347,18 @@ class Bot(commands.AutoBot):
                 payload.broadcaster.name or "",
                 text,
             )
-            try:
-                await payload.broadcaster.send_message(
-                    message=response,
-                    sender=self.bot_id,
-                    token_for=self.bot_id,
-                    reply_to_message_id=str(payload.id),
-                )
-                LOGGER.info(
-                    f"[TRIGGER] '{trigger.trigger_name}' fired for {payload.chatter.name} in {channel_id}"
-                )
-                asyncio.create_task(self.message_trigger_configs.increment_usage_count(trigger.id))
-            except Exception as e:
-                LOGGER.warning(f"[TRIGGER] Failed to send response: {e}")
+            self.chat_queue.enqueue(
+                channel_id,
+                response,
+                SendPriority.COMMAND,
+                reply_to=str(payload.id),
+                on_sent=functools.partial(
+                    self.message_trigger_configs.increment_usage_count, trigger.id
+                ),
+            )
+            LOGGER.info(
+                f"[TRIGGER] '{trigger.trigger_name}' fired for {payload.chatter.name} in {channel_id}"
+            )
             return True
 
         return False
@@ -357,61 +367,48 @@ class Bot(commands.AutoBot):
     # Custom command handling
     # ------------------------------------------------------------------
 
-    async def _handle_custom_command(self, payload: twitchio.ChatMessage) -> bool:
+    async def _handle_custom_command(
+        self, payload: twitchio.ChatMessage, cmd_name: str, query: str
+    ) -> bool:
         """Handle custom commands: direct text response or redirect to builtin command.
 
+        *cmd_name* is the lowercased command without the ``!`` prefix ("" for
+        non-command messages), *query* the remaining text.
+
         Returns True if fully handled (text response sent, skip builtin pipeline),
         False if message should continue to builtin command pipeline.
         """
-        text = payload.text
-        if not text or not text.startswith("!"):
-            return False
-
-        parts = text[1:].split(maxsplit=1)
-        if not parts or not parts[0]:
+        if not cmd_name:
             return False
 
-        cmd_name = parts[0].lower()
-        query = parts[1] if len(parts) > 1 else ""
-
         channel_id = payload.broadcaster.id
 
-        # --- Exception Isolation: DB lookups ---
-        try:
-            config = await self.command_configs.find_by_name_or_alias(channel_id, cmd_name)
-        except Exception as e:
-            LOGGER.warning(
-                f"[GUARD] DB error looking up command '{cmd_name}': {type(e).__name__}: {e}"
-            )
+        # In-memory routing table — no await, no DB fallback on the hot path
+        route = self.command_configs.resolve(channel_id, cmd_name)
+        if route is None:
+            if not self.command_configs.has_routes(channel_id):
+                self._schedule_command_warm(channel_id)
             return False
 
-        if not config or not config.enabled or config.command_type != "custom":
+        config = route.config
+        if not config.enabled or config.command_type != "custom":
             return False
 
         if not config.custom_response:
             return False
 
-        # Guard checks (role + cooldown)
+        # Guard checks (role + cooldown); route.cooldown already folds in the channel default
         if not has_role(payload.chatter, config.min_role):
             return False
 
-        try:
-            channel = await self.channels.get_channel(channel_id)
-        except Exception as e:
-            LOGGER.warning(
-                f"[GUARD] DB error fetching channel {channel_id}: {type(e).__name__}: {e}"
-            )
-            channel = None
-
-        if is_on_cooldown(channel_id, config.command_name, config, channel):
+        if not acquire_cooldown(channel_id, config.command_name, route):
             return False
 
-        record_cooldown(channel_id, config.command_name)
-
         response = config.custom_response
         if response.startswith("!"):
-            # Redirect: rewrite payload and let builtin pipeline handle it
-            redirect = response[1:].replace("$(query)", query).strip()
+            # Redirect: rewrite payload and let builtin pipeline handle it. Usage is
+            # recorded once, under the builtin's name, if it passes its own checks.
+            redirect = render_template(response[1:], {"query": query}).strip()
             payload.text = f"!{redirect}"
             LOGGER.info(f"Custom command: !{cmd_name} -> !{redirect}")
             return False
@@ -420,15 +417,48 @@ class Bot(commands.AutoBot):
             response = _substitute_variables(
                 response, payload.chatter, payload.broadcaster.name or "", query
             )
-            await payload.broadcaster.send_message(
-                message=response,
-                sender=self.bot_id,
-                token_for=self.bot_id,
-                reply_to_message_id=str(payload.id),
+            self.chat_queue.enqueue(
+                channel_id,
+                response,
+                SendPriority.COMMAND,
+                reply_to=str(payload.id),
+                on_sent=functools.partial(
+                    self.command_usage.record, channel_id, f"!{config.command_name}"
+                ),
             )
             LOGGER.info(f"Custom command: !{cmd_name} -> text response")
             return True
 
+    async def _warm_commands(self, channel_id: str) -> int:
+        """Warm command caches and rebuild the channel's routing table.
+
+        Resolves the channel default cooldown once here so that command
+        lookups in event_message never need to fetch the channel record.
+        If the channel cannot be read, the error propagates and no table is
+        built: the previous table (with its default) stays in place, or a
+        missing one is warmed again on the next command.
+        """
+        channel = await self.channels.get_channel(channel_id)
+        return await self.command_configs.warm_cache(
+            channel_id, default_cooldown=channel.default_cooldown if channel else 0
+        )
+
+    def _schedule_command_warm(self, channel_id: str) -> None:
+        """Build a missing routing table in the background (one warm per channel at a time)."""
+        if channel_id in self._warming_channels:
+            return
+        self._warming_channels.add(channel_id)
+
+        async def _warm() -> None:
+            try:
+                await self._warm_commands(channel_id)
+            except Exception as e:
+                LOGGER.warning(f"Failed to warm command routes for {channel_id}: {e}")
+            finally:
+                self._warming_channels.discard(channel_id)
+
+        asyncio.create_task(_warm())
+
     # ------------------------------------------------------------------
     # Token management
     # ------------------------------------------------------------------
@@ -547,6 +577,9 @@ class Bot(commands.AutoBot):
                 LOGGER.warning(f"No subscription IDs found for channel {broadcaster_user_id}")
 
             self._subscribed_channels.discard(broadcaster_user_id)
+            self.command_configs.drop_routes(broadcaster_user_id)
+            self.message_trigger_configs.drop_matcher(broadcaster_user_id)
+            self.dispatch("channel_leave", broadcaster_user_id)
             LOGGER.info(f"Unsubscribed from events for channel: {broadcaster_user_id}")
 
         except Exception as e:
@@ -574,16 +607,7 @@ class Bot(commands.AutoBot):
 
             if enabled:
                 if channel_id not in self._subscribed_channels:
-                    await self.subscribe_channel_events(channel_id)
-                    try:
-                        await self.command_configs.ensure_defaults(channel_id)
-                        await self.redemption_configs.ensure_defaults(
-                            channel_id, owner_id=self.owner_id
-                        )
-                        count = await self.command_configs.warm_cache(channel_id)
-                        LOGGER.info(f"[NOTIFY] Warmed cache: {count} configs for {channel_id}")
-                    except Exception as e:
-                        LOGGER.warning(f"[NOTIFY] Failed to warm cache for {channel_id}: {e}")
+                    await self._join_channel(channel_id)
                     LOGGER.info(f"[NOTIFY] Instantly subscribed to channel: {channel_id}")
                 else:
                     LOGGER.info(f"[NOTIFY] Channel {channel_id} already subscribed, skipping")
@@ -597,6 +621,43 @@ class Bot(commands.AutoBot):
         except Exception as e:
             LOGGER.exception(f"[NOTIFY] Error handling channel toggle notification: {e}")
 
+    async def _join_channel(self, channel_id: str) -> None:
+        """Subscribe to a channel's events, seed its default configs and warm its caches."""
+        await self.subscribe_channel_events(channel_id)
+        try:
+            await self.command_configs.ensure_defaults(channel_id)
+            await self.redemption_configs.ensure_defaults(channel_id, owner_id=self.owner_id)
+            count = await self._warm_commands(channel_id)
+            LOGGER.info(f"[NOTIFY] Warmed cache: {count} configs for {channel_id}")
+        except Exception as e:
+            LOGGER.warning(f"[NOTIFY] Failed to warm cache for {channel_id}: {e}")
+
+    async def _resync_after_listen_gap(self) -> None:
+        """Catch up on NOTIFYs missed while the listener was reconnecting.
+
+        Registered after cache_bus.resync (by cache_bus.start). Channel toggles are reconciled against
+        the enabled channels, and config changes go through the watermark
+        sync now instead of at its next scheduled pass.
+        """
+        try:
+            enabled = {ch.channel_id for ch in await self.channels.list_enabled_channels()}
+            enabled.discard(self._bot_id)
+            joined = enabled - self._subscribed_channels
+            left = self._subscribed_channels - enabled
+            for channel_id in joined:
+                await self._join_channel(channel_id)
+            for channel_id in left:
+                await self.unsubscribe_channel_events(channel_id)
+            if joined or left:
+                LOGGER.info(f"[NOTIFY] Resync: joined {len(joined)}, left {len(left)} channels")
+        except Exception as e:
+            LOGGER.warning(f"[NOTIFY] Resync of channel toggles failed: {e}")
+        try:
+            count = await self._sync_config_changes()
+            LOGGER.info(f"[NOTIFY] Resync: applied {count} config changes")
+        except Exception as e:
+            LOGGER.warning(f"[NOTIFY] Resync of config changes failed: {e}")
+
     async def _handle_new_token(self, connection, pid, channel, payload) -> None:
         try:
             LOGGER.info(f"[NOTIFY] Received new token notification: {payload}")
@@ -627,7 +688,7 @@ class Bot(commands.AutoBot):
                         await self.redemption_configs.ensure_defaults(
                             user_id, owner_id=self.owner_id
                         )
-                        count = await self.command_configs.warm_cache(user_id)
+                        count = await self._warm_commands(user_id)
                         LOGGER.info(f"[NOTIFY] Warmed cache: {count} configs for {user_id}")
                     except Exception as e:
                         LOGGER.warning(f"[NOTIFY] Failed to warm cache for {user_id}: {e}")
@@ -659,7 +720,11 @@ class Bot(commands.AutoBot):
             LOGGER.exception(f"[NOTIFY] Error handling new token notification: {e}")
 
     async def _handle_config_change(self, connection, pid, channel, payload) -> None:
-        """Reload in-memory cache for the affected channel on config writes."""
+        """Update in-memory caches for the affected channel on config writes.
+
+        Payloads with a row delta (migration 022) are applied in place;
+        anything else falls back to a full reload of the channel.
+        """
         try:
             data = json.loads(payload)
             channel_id = data.get("channel_id")
@@ -667,37 +732,125 @@ class Bot(commands.AutoBot):
             if not channel_id or channel_id not in self._subscribed_channels:
                 return
 
+            op = data.get("op")
+            if op and table:
+                LOGGER.debug(f"[NOTIFY] {op} on {table} id={data.get('id')} for {channel_id}")
+                if await self._apply_config_delta(
+                    table, channel_id, op, data.get("id"), data.get("row")
+                ):
+                    return
+
             LOGGER.info(f"[NOTIFY] Config change on {table} for {channel_id}, refreshing cache")
-            await self._refresh_channel_cache(channel_id)
+            await self._refresh_channel_cache(channel_id, table or None)
         except Exception as e:
             LOGGER.warning(f"[NOTIFY] Error handling config_change: {e}")
 
-    async def _refresh_channel_cache(self, channel_id: str) -> None:
-        """Reload all config caches for a single channel from DB."""
-        try:
-            await self.command_configs.warm_cache(channel_id)
-        except Exception as e:
-            LOGGER.warning(f"Cache refresh (commands) failed for {channel_id}: {e}")
+    async def _apply_config_delta(
+        self, table: str, channel_id: str, op: str, row_id, row: dict | None
+    ) -> bool:
+        """Patch caches from one NOTIFY row delta. Returns False to request a full reload.
+
+        A truncated payload carries no row; it is fetched by id (except for
+        DELETE, where the row is gone and the id is enough).
+        """
+        model = None
+        if row is not None:
+            if table == "command_configs":
+                model = model_from_json_row(CommandConfig, row)
+            elif table == "event_configs":
+                model = model_from_json_row(EventConfig, row)
+            elif table == "channels":
+                model = model_from_json_row(Channel, row)
+        elif op != "DELETE" and row_id is not None:
+            if table == "command_configs":
+                model = await self.command_configs.get_config_by_id(row_id)
+            elif table == "event_configs":
+                model = await self.event_configs.get_config_by_id(row_id)
+        return await self._apply_config_row(table, channel_id, op, row_id, model)
+
+    async def _apply_config_row(self, table: str, channel_id: str, op: str, row_id, model) -> bool:
+        """Apply one changed row to this process's caches (no query for warmed channels).
+
+        *model* is the row as its model, or None when it was deleted or is
+        not needed for *table*. Returns False when the channel needs a full
+        reload instead.
+        """
+        if table == "command_configs":
+            if model is None and row_id is None:
+                return False
+            channel = await self.channels.get_channel(channel_id)
+            return self.command_configs.apply_change(
+                channel_id,
+                model.id if model else row_id,
+                None if op == "DELETE" else model,
+                default_cooldown=channel.default_cooldown if channel else 0,
+            )
+
+        if table == "event_configs":
+            self.event_configs.apply_change(channel_id, op, model)
+            return True
+
+        if table == "redemption_configs":
+            # Redemptions are looked up by reward-title match, not by key,
+            # so the channel's entries are dropped and reloaded lazily
+            from shared.repositories.command_config import _redemption_cache
+
+            _redemption_cache.invalidate_tag(channel_tag(channel_id), publish=False)
+            return True
+
+        if table == "timers":
+            self.timer_configs.invalidate_cache(channel_id)
+            return True
+
+        if table == "message_triggers":
+            self.message_trigger_configs.invalidate_cache(channel_id)
+            return True
+
+        if table == "channels" and model is not None:
+            self.channels.apply_change(model)
+            return self.command_configs.reroute(channel_id, default_cooldown=model.default_cooldown)
+
+        return False
+
+    async def _refresh_channel_cache(self, channel_id: str, table: str | None = None) -> None:
+        """Reload all config caches for a single channel from DB.
+
+        Only entries tagged with this channel are dropped, so other channels
+        keep their warm caches. The cross-channel enabled-channels list is
+        cleared only when *table* is ``channels`` or unknown.
+
+        Invalidations here are local only (publish=False): this reacts to a
+        change that every process is told about, so re-broadcasting it would
+        only echo.
+        """
+        tag = channel_tag(channel_id)
         try:
-            # Invalidate channel record so next read re-fetches
+            # Invalidate channel record first so the routing table picks up
+            # a changed default cooldown
             from shared.repositories.channel import _channel_cache, _enabled_channels_cache
 
-            _channel_cache.invalidate(f"channel:{channel_id}")
-            _enabled_channels_cache.clear()
+            _channel_cache.invalidate_tag(tag, publish=False)
+            if table in (None, "channels"):
+                _enabled_channels_cache.clear(publish=False)
         except Exception as e:
             LOGGER.warning(f"Cache refresh (channel) failed for {channel_id}: {e}")
+        try:
+            # Builds a new routing table and swaps it in as a single assignment
+            await self._warm_commands(channel_id)
+        except Exception as e:
+            LOGGER.warning(f"Cache refresh (commands) failed for {channel_id}: {e}")
         try:
             from shared.repositories.event_config import _config_cache as _evt_cache
             from shared.repositories.event_config import _config_list_cache as _evt_list_cache
 
-            _evt_cache.clear()
-            _evt_list_cache.clear()
+            _evt_cache.invalidate_tag(tag, publish=False)
+            _evt_list_cache.invalidate_tag(tag, publish=False)
         except Exception as e:
             LOGGER.warning(f"Cache refresh (events) failed for {channel_id}: {e}")
         try:
             from shared.repositories.command_config import _redemption_cache
 
-            _redemption_cache.clear()
+            _redemption_cache.invalidate_tag(tag, publish=False)
         except Exception as e:
             LOGGER.warning(f"Cache refresh (redemptions) failed for {channel_id}: {e}")
         try:
@@ -709,24 +862,78 @@ class Bot(commands.AutoBot):
         except Exception as e:
             LOGGER.warning(f"Cache refresh (triggers) failed for {channel_id}: {e}")
 
-    async def _periodic_cache_refresh(self) -> None:
-        """Safety net: reload all config caches every 5 minutes.
+    @db_lane(BACKGROUND)
+    async def _periodic_config_sync(self) -> None:
+        """Safety net: apply config changes missed by NOTIFY (e.g. LISTEN connection dropped).
 
-        Catches any pg_notify misses (e.g. LISTEN connection dropped).
+        Runs every CONFIG_SYNC_INTERVAL seconds and only touches rows changed
+        since the previous pass, so an idle pass costs a handful of indexed
+        queries regardless of the number of channels.
         """
-        await asyncio.sleep(300)
         while True:
+            await asyncio.sleep(self.CONFIG_SYNC_INTERVAL)
             try:
-                for channel_id in list(self._subscribed_channels):
+                await self._sync_config_changes()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                LOGGER.warning(f"Config sync error: {type(e).__name__}: {e}")
+
+    async def _sync_config_changes(self) -> int:
+        """Apply config rows changed since the watermark, plus tombstoned deletes.
+
+        Without a watermark (first pass failed, e.g. DB down at startup) every
+        subscribed channel is reloaded once and a watermark is taken.
+        Returns the number of changes applied.
+        """
+        async with self._config_sync_lock:
+            channel_ids = list(self._subscribed_channels)
+            if self._config_watermark is None:
+                watermark = await self.config_sync.now()
+                for channel_id in channel_ids:
                     await self._refresh_channel_cache(channel_id)
+                self._config_watermark = watermark
+                LOGGER.info(f"Config sync: full reload of {len(channel_ids)} channels")
+                return 0
+
+            changes, watermark = await self.config_sync.changes_since(
+                self._config_watermark, channel_ids
+            )
+            reload: set[str] = set()
+            for change in changes:
+                if change.channel_id in reload:
+                    continue
+                try:
+                    applied = await self._apply_config_row(
+                        change.table, change.channel_id, change.op, change.row_id, change.row
+                    )
+                except Exception as e:
+                    LOGGER.warning(
+                        f"Config sync: {change.op} {change.table}:{change.row_id} failed: {e}"
+                    )
+                    applied = False
+                if not applied:
+                    reload.add(change.channel_id)
+            for channel_id in reload:
+                await self._refresh_channel_cache(channel_id)
+            self._config_watermark = watermark
+
+            if changes:
                 LOGGER.debug(
-                    f"Periodic cache refresh complete for {len(self._subscribed_channels)} channels"
+                    f"Config sync: {len(changes)} changes, {len(reload)} channels reloaded"
                 )
-            except asyncio.CancelledError:
-                break
+            try:
+                await self.config_sync.purge_tombstones(self.TOMBSTONE_RETENTION)
             except Exception as e:
-                LOGGER.warning(f"Periodic cache refresh error: {e}")
-            await asyncio.sleep(300)
+                LOGGER.debug(f"Config sync: tombstone purge failed: {e}")
+            return len(changes)
+
+    async def _init_config_watermark(self) -> None:
+        """Take the sync watermark at startup, before channels are warmed."""
+        try:
+            self._config_watermark = await self.config_sync.now()
+        except Exception as e:
+            LOGGER.warning(f"Config sync: no watermark yet, first pass reloads all: {e}")
 
     # ------------------------------------------------------------------
     # Startup tasks
@@ -754,7 +961,7 @@ class Bot(commands.AutoBot):
                     await self.redemption_configs.ensure_defaults(
                         ch.channel_id, owner_id=self.owner_id
                     )
-                    count = await self.command_configs.warm_cache(ch.channel_id)
+                    count = await self._warm_commands(ch.channel_id)
                     total_warmed += count
                 except Exception as e:
                     LOGGER.warning(f"Failed to ensure defaults for {ch.channel_id}: {e}")
@@ -765,6 +972,7 @@ class Bot(commands.AutoBot):
         except Exception as e:
             LOGGER.exception(f"Error subscribing to initial channels: {e}")
 
+    @db_lane(BACKGROUND)
     async def _recover_active_sessions(self) -> None:
         """Recover sessions for channels that are currently live on bot startup."""
         try:
@@ -831,6 +1039,7 @@ class Bot(commands.AutoBot):
         except Exception as e:
             LOGGER.exception(f"Error recovering active sessions: {e}")
 
+    @db_lane(BACKGROUND)
     async def _session_verify_loop(self) -> None:
         """Poll all enabled channels against Twitch API every 3 min."""
         await asyncio.sleep(120)
@@ -876,9 +1085,9 @@ class Bot(commands.AutoBot):
                     if cid in live_map:
                         continue
                     sid = self._active_sessions.pop(cid)
-                    self._chatter_buffers.pop(cid, None)
                     self._channel_line_counts.pop(cid, None)
                     if sid:
+                        await self.flush_chatters(cid, sid)
                         try:
                             await self.analytics.end_session(sid, datetime.now())
                             LOGGER.info(f"Session {sid} ended for channel {cid} (poll)")
@@ -899,6 +1108,7 @@ class Bot(commands.AutoBot):
                 LOGGER.warning(f"Session verify error: {e}")
             await asyncio.sleep(180)
 
+    @db_lane(BULK)
     async def _reconcile_recent_sessions(self) -> None:
         """Use Twitch VOD data to fix session durations."""
         try:
@@ -936,6 +1146,7 @@ class Bot(commands.AutoBot):
         except Exception as e:
             LOGGER.warning(f"Session reconciliation error: {e}")
 
+    @db_lane(BULK)
     async def _sync_vods_for_channels(
         self, channel_ids: list[str], limit_per_channel: int = 20
     ) -> None:
@@ -991,31 +1202,61 @@ class Bot(commands.AutoBot):
         except Exception as e:
             LOGGER.exception(f"Error during VOD sync: {e}")
 
-    async def _pool_heartbeat_loop(self) -> None:
-        """Periodically ping the DB pool to keep the idle connection alive.
+    # ------------------------------------------------------------------
+    # Chatter stats checkpointing
+    # ------------------------------------------------------------------
 
-        Constraint chain: heartbeat(15s) < max_inactive(25s) < Supavisor(~30-60s).
-        On failure, backs off to avoid flooding logs and wasting connections.
+    async def flush_chatters(self, channel_id: str, session_id: int) -> int:
+        """Write the channel's chatter buffer as one incremental upsert.
+
+        The buffer is detached before the write so chat keeps accumulating into
+        a fresh one; on failure the fresh one is merged into the detached one,
+        which becomes the live buffer again, unless together they exceed
+        CHATTER_BUFFER_MAX: then the failed counts are dropped.
+        Returns the number of chatters written.
+        """
+        buf = self._chatter_buffers.pop(channel_id, None)
+        if not buf:
+            return 0
+        try:
+            await self.analytics.flush_chatter_stats(
+                session_id=session_id, channel_id=channel_id, chatters=list(buf.rows())
+            )
+            return len(buf)
+        except Exception as e:
+            LOGGER.warning(f"Chatter flush failed for session {session_id}: {e}")
+            current = self._chatter_buffers.get(channel_id)
+            if len(buf) + (len(current) if current is not None else 0) > self.CHATTER_BUFFER_MAX:
+                LOGGER.warning(
+                    f"Dropping chatter counts of {len(buf)} chatters for session {session_id}: "
+                    f"buffer would exceed {self.CHATTER_BUFFER_MAX} after repeated flush failures"
+                )
+                return 0
+            if current is not None:
+                buf.merge(current)
+            self._chatter_buffers[channel_id] = buf
+            return 0
+
+    @db_lane(BULK)
+    async def _chatter_checkpoint_loop(self) -> None:
+        """Checkpoint chatters active since the last flush for every live session.
+
+        Bounds both buffer memory and data loss on restart to one interval;
+        the stream-end flush only has to cover the remainder.
         """
-        interval = 15
-        fail_count = 0
         while True:
-            await asyncio.sleep(interval)
+            await asyncio.sleep(self.CHATTER_CHECKPOINT_INTERVAL)
             try:
-                async with self.token_database.acquire(timeout=10.0) as conn:
-                    await conn.fetchval("SELECT 1")
-                if fail_count > 0:
-                    LOGGER.info(f"Pool heartbeat recovered after {fail_count} failures")
-                fail_count = 0
-                interval = 15
+                total = 0
+                for channel_id in list(self._chatter_buffers):
+                    session_id = self._active_sessions.get(channel_id)
+                    if session_id:
+                        total += await self.flush_chatters(channel_id, session_id)
+                    else:
+                        self._chatter_buffers.pop(channel_id, None)
+                if total:
+                    LOGGER.debug(f"Chatter checkpoint: {total} chatters")
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                fail_count += 1
-                if fail_count <= 3:
-                    LOGGER.warning(f"Pool heartbeat failed ({fail_count}): {type(e).__name__}: {e}")
-                elif fail_count == 4:
-                    LOGGER.warning(
-                        f"Pool heartbeat still failing ({fail_count}x), suppressing until recovery"
-                    )
-                interval = min(15 * (2 ** min(fail_count - 1, 3)), 120)
+                LOGGER.warning(f"Chatter checkpoint error: {e}")
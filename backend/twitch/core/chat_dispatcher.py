@@ -0,0 +1,291 @@
+"""Outbound chat dispatcher with per-channel rate-limit budgeting.
+
+Handlers call ``enqueue()`` and return immediately. Each channel with pending
+messages gets a worker task that sends them in priority order, spending from
+a per-channel token bucket and a bot-wide one, so that a follow or raid storm
+never exceeds Twitch's chat limits or stalls the event handler.
+
+Messages with the same text and reply target that are still waiting in a
+channel's queue are coalesced, and stale low-priority messages are dropped instead of being sent
+minutes late.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from core.bot import Bot
+
+LOGGER = logging.getLogger("ChatDispatcher")
+
+# Called once the message has been delivered (sync, or async run as a task)
+OnSent = Callable[[], Awaitable[None] | None]
+
+
+class SendPriority(IntEnum):
+    """Lower value is sent first."""
+
+    COMMAND = 0
+    TIMER = 1
+    EVENT = 2
+
+
+# Seconds a message may wait in the queue before it is dropped
+_MAX_WAIT: dict[SendPriority, float] = {
+    SendPriority.COMMAND: 30.0,
+    SendPriority.TIMER: 60.0,
+    SendPriority.EVENT: 120.0,
+}
+
+
+class _TokenBucket:
+    """Token bucket that never admits more than *limit* sends per *window* seconds.
+
+    Up to *burst* tokens are available at once, and the refill rate is
+    ``(limit - burst) / window``, so a full burst plus a window of refill
+    still fits inside the limit.
+    """
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, limit: int, window: float, burst: int) -> None:
+        burst = max(1, min(burst, limit - 1))
+        self.capacity = float(burst)
+        self.rate = (limit - burst) / window
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0.0 if one is available now)."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1.0 else (1.0 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1.0
+
+
+class _ChannelQueue:
+    __slots__ = ("heap", "pending", "bucket", "task")
+
+    def __init__(self, bucket: _TokenBucket) -> None:
+        # [priority, seq, enqueued_at, message, reply_to, on_sent callbacks]
+        self.heap: list[list[Any]] = []
+        # (message text, reply_to) -> heap entry, for coalescing
+        self.pending: dict[tuple[str, str | None], list[Any]] = {}
+        self.bucket = bucket
+        self.task: asyncio.Task | None = None
+
+
+class ChatDispatcher:
+    """Per-channel priority queues drained under Twitch chat rate limits.
+
+    Args:
+        bot: The bot that owns the queues (provides ``bot_id`` and partial users).
+        channel_limit: Messages per *window* in a single channel.
+        global_limit: Messages per *window* across all channels.
+        window: Rate-limit window in seconds.
+        burst: Messages that may be sent back-to-back in one channel.
+        max_queue: Pending messages per channel. When full, a new message
+            evicts the lowest-priority queued one, or is dropped itself.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        *,
+        channel_limit: int = 20,
+        global_limit: int = 100,
+        window: float = 30.0,
+        burst: int = 4,
+        max_queue: int = 50,
+    ) -> None:
+        self._bot = bot
+        self._channel_limit = channel_limit
+        self._window = window
+        self._burst = burst
+        self._max_queue = max_queue
+        self._global = _TokenBucket(global_limit, window, burst * 5)
+        self._queues: dict[str, _ChannelQueue] = {}
+        self._seq = itertools.count()
+        self._closed = False
+        # Running async on_sent callbacks (strong refs until they finish)
+        self._callbacks: set[asyncio.Task] = set()
+
+        # Backpressure metrics
+        self.sent = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.expired = 0
+        self.throttled = 0
+        self.max_wait = 0.0
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        channel_id: str,
+        message: str,
+        priority: SendPriority = SendPriority.COMMAND,
+        *,
+        reply_to: str | None = None,
+        on_sent: OnSent | None = None,
+    ) -> bool:
+        """Queue *message* for *channel_id*. Returns False if it was coalesced or dropped.
+
+        *on_sent* runs only after the message is actually delivered, so usage
+        counts and fire times are not recorded for messages that expire,
+        are evicted or fail. A coalesced message's callback runs when the
+        message it was folded into is sent.
+        """
+        if self._closed or not message:
+            return False
+
+        queue = self._queues.get(channel_id)
+        if queue is None:
+            queue = _ChannelQueue(_TokenBucket(self._channel_limit, self._window, self._burst))
+            self._queues[channel_id] = queue
+
+        key = (message, reply_to)
+        existing = queue.pending.get(key)
+        if existing is not None:
+            self.coalesced += 1
+            if on_sent is not None:
+                existing[5].append(on_sent)
+            if priority < existing[0]:
+                existing[0] = priority
+                heapq.heapify(queue.heap)
+            return False
+
+        if len(queue.heap) >= self._max_queue:
+            worst = max(queue.heap)
+            if priority >= worst[0]:
+                self.dropped += 1
+                return False
+            queue.heap.remove(worst)
+            heapq.heapify(queue.heap)
+            del queue.pending[(worst[3], worst[4])]
+            self.dropped += 1
+
+        callbacks = [on_sent] if on_sent is not None else []
+        entry = [priority, next(self._seq), time.monotonic(), message, reply_to, callbacks]
+        heapq.heappush(queue.heap, entry)
+        queue.pending[key] = entry
+
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.create_task(self._drain(channel_id, queue))
+        return True
+
+    # ------------------------------------------------------------------
+    # Consumer side
+    # ------------------------------------------------------------------
+
+    async def _drain(self, channel_id: str, queue: _ChannelQueue) -> None:
+        """Send queued messages for one channel until its queue is empty."""
+        heap = queue.heap
+        while heap:
+            now = time.monotonic()
+            wait = max(queue.bucket.wait_time(now), self._global.wait_time(now))
+            if wait > 0:
+                self.throttled += 1
+                # Re-check the head afterwards: a higher-priority message may arrive meanwhile
+                await asyncio.sleep(wait)
+                continue
+
+            priority, _, enqueued_at, message, reply_to, callbacks = heapq.heappop(heap)
+            queue.pending.pop((message, reply_to), None)
+
+            waited = now - enqueued_at
+            if waited > _MAX_WAIT[priority]:
+                self.expired += 1
+                LOGGER.debug(
+                    f"[{channel_id}] Dropped stale {priority.name} message ({waited:.0f}s)"
+                )
+                continue
+
+            queue.bucket.take()
+            self._global.take()
+            self.max_wait = max(self.max_wait, waited)
+            try:
+                broadcaster = self._bot.create_partialuser(user_id=channel_id)
+                await broadcaster.send_message(
+                    message=message,
+                    sender=self._bot.bot_id,
+                    token_for=self._bot.bot_id,
+                    reply_to_message_id=reply_to,
+                )
+                self.sent += 1
+            except Exception as e:
+                self.failed += 1
+                LOGGER.warning(f"[{channel_id}] Failed to send {priority.name} message: {e}")
+                continue
+            for callback in callbacks:
+                self._run_on_sent(channel_id, callback)
+
+    def _run_on_sent(self, channel_id: str, callback: OnSent) -> None:
+        try:
+            result = callback()
+        except Exception as e:
+            LOGGER.warning(f"[{channel_id}] on_sent callback failed: {e}")
+            return
+        if not inspect.isawaitable(result):
+            return
+        task = asyncio.ensure_future(result)
+        self._callbacks.add(task)
+
+        def _done(t: asyncio.Task) -> None:
+            self._callbacks.discard(t)
+            if not t.cancelled() and t.exception() is not None:
+                LOGGER.warning(f"[{channel_id}] on_sent callback failed: {t.exception()}")
+
+        task.add_done_callback(_done)
+
+    # ------------------------------------------------------------------
+    # Lifecycle / metrics
+    # ------------------------------------------------------------------
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q.heap) for q in self._queues.values())
+
+    def stats(self) -> dict[str, Any]:
+        """Backpressure metrics for the health server."""
+        depths = {cid: len(q.heap) for cid, q in self._queues.items() if q.heap}
+        return {
+            "queued": sum(depths.values()),
+            "busiest_channels": dict(sorted(depths.items(), key=lambda kv: -kv[1])[:5]),
+            "sent": self.sent,
+            "failed": self.failed,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "expired": self.expired,
+            "throttled": self.throttled,
+            "max_wait_seconds": round(self.max_wait, 2),
+        }
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Stop accepting messages and give pending sends *timeout* seconds to finish."""
+        self._closed = True
+        deadline = time.monotonic() + timeout
+        tasks = [q.task for q in self._queues.values() if q.task and not q.task.done()]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                LOGGER.info(f"Discarded {self.queued} unsent chat messages on shutdown")
+        # Let usage / fire-time records for sent messages finish
+        if self._callbacks:
+            await asyncio.wait(set(self._callbacks), timeout=max(deadline - time.monotonic(), 0))
@@ -0,0 +1,81 @@
+"""Compact per-channel chatter counters for the chat hot path.
+
+Replaces ``{user_id: {"username", "count", "last_at"}}`` dicts with
+column storage: one dict maps user_id to a slot, and counts / last-seen
+times live in typed arrays. Each chatter keeps a single username string
+(replaced only on rename) interned with ``sys.intern``, so a chatter seen
+in several channels or across flushes shares one copy, and timestamps are integer seconds on the
+monotonic clock, converted to ``datetime`` only when the table is flushed.
+
+See ``scripts/bench_chatter_memory.py`` for a size comparison.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from array import array
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+
+class ChatterTable:
+    """Message counts and last-seen times for the chatters of one channel."""
+
+    __slots__ = ("_slots", "_names", "_counts", "_last", "_epoch_mono", "_epoch_wall")
+
+    def __init__(self) -> None:
+        self._slots: dict[str, int] = {}
+        self._names: list[str] = []
+        self._counts = array("I")
+        self._last = array("I")  # seconds since _epoch_mono
+        self._epoch_mono = time.monotonic()
+        self._epoch_wall = datetime.now()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def record(self, user_id: str, username: str) -> None:
+        """Count one message from *user_id*."""
+        now = int(time.monotonic() - self._epoch_mono)
+        slot = self._slots.get(user_id)
+        if slot is None:
+            self._slots[user_id] = len(self._names)
+            self._names.append(sys.intern(username))
+            self._counts.append(1)
+            self._last.append(now)
+            return
+        self._counts[slot] += 1
+        self._last[slot] = now
+        if self._names[slot] != username:
+            self._names[slot] = sys.intern(username)
+
+    def merge(self, other: ChatterTable) -> None:
+        """Fold *other*, a newer table, into this one (e.g. after a failed flush).
+
+        Counts add up; last-seen times and usernames come from the newer
+        table. Both epochs are on the monotonic clock and *other*'s is the
+        later one, so its times shift forward and stay unsigned.
+        """
+        offset = max(int(other._epoch_mono - self._epoch_mono), 0)
+        for user_id, src in other._slots.items():
+            last = other._last[src] + offset
+            slot = self._slots.get(user_id)
+            if slot is None:
+                self._slots[user_id] = len(self._names)
+                self._names.append(sys.intern(other._names[src]))
+                self._counts.append(other._counts[src])
+                self._last.append(last)
+                continue
+            self._counts[slot] += other._counts[src]
+            if last > self._last[slot]:
+                self._last[slot] = last
+            if self._names[slot] != other._names[src]:
+                self._names[slot] = sys.intern(other._names[src])
+
+    def rows(self) -> Iterator[tuple[str, str, int, datetime]]:
+        """Yield ``(user_id, username, count, last_at)`` with wall-clock timestamps."""
+        epoch = self._epoch_wall
+        names, counts, last = self._names, self._counts, self._last
+        for user_id, slot in self._slots.items():
+            yield user_id, names[slot], counts[slot], epoch + timedelta(seconds=last[slot])
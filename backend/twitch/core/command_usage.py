@@ -0,0 +1,143 @@
+"""Write-behind aggregator for command usage analytics.
+
+Counts command hits in memory per ``(session_id, command_name)`` and flushes
+them to ``command_stats`` as one batched upsert, instead of one round-trip per
+command on the small bot pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from shared.database import BULK, db_lane
+
+if TYPE_CHECKING:
+    from shared.repositories.analytics import AnalyticsRepository
+
+LOGGER = logging.getLogger("CommandUsage")
+
+
+class CommandUsageAggregator:
+    """In-memory command usage counters with periodic batched flush.
+
+    Args:
+        analytics: Repository used for the batched upsert.
+        sessions: The bot's live ``{channel_id: session_id}`` map. Hits are
+            only counted for channels with an active session.
+        flush_interval: Seconds between background flushes.
+        max_keys: Buffer size that triggers an early flush. Beyond twice this
+            size (e.g. while the DB is down) new keys are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        analytics: AnalyticsRepository,
+        sessions: dict[str, int],
+        *,
+        flush_interval: float = 60.0,
+        max_keys: int = 500,
+    ) -> None:
+        self._analytics = analytics
+        self._sessions = sessions
+        self._flush_interval = flush_interval
+        self._max_keys = max_keys
+        # (session_id, command_name) -> [channel_id, count, last_used_ts]
+        self._counts: dict[tuple[int, str], list] = {}
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self.dropped = 0
+
+    def record(self, channel_id: str, command_name: str) -> None:
+        """Count one command hit. Synchronous and DB-free."""
+        session_id = self._sessions.get(channel_id)
+        if not session_id:
+            return
+
+        key = (session_id, command_name)
+        entry = self._counts.get(key)
+        if entry is not None:
+            entry[1] += 1
+            entry[2] = time.time()
+            return
+
+        size = len(self._counts)
+        if size >= self._max_keys * 2:
+            self.dropped += 1
+            if self.dropped == 1:
+                LOGGER.warning(f"Command usage buffer full ({size} keys), dropping new keys")
+            return
+        if size >= self._max_keys:
+            self._flush_requested.set()
+        self._counts[key] = [channel_id, 1, time.time()]
+
+    @property
+    def pending(self) -> int:
+        return len(self._counts)
+
+    async def flush(self, session_id: int | None = None) -> int:
+        """Write buffered counters in one upsert. Returns the number of rows written.
+
+        With *session_id*, only that session's counters are flushed (stream end).
+        On failure the counters are merged back into the buffer for the next attempt.
+        """
+        async with self._flush_lock:
+            if session_id is None:
+                batch, self._counts = self._counts, {}
+            else:
+                batch = {k: self._counts.pop(k) for k in list(self._counts) if k[0] == session_id}
+            if not batch:
+                return 0
+
+            rows = [
+                (sid, channel_id, name, count, datetime.fromtimestamp(ts))
+                for (sid, name), (channel_id, count, ts) in batch.items()
+            ]
+            try:
+                await self._analytics.record_command_usage_batch(rows)
+            except Exception as e:
+                LOGGER.warning(f"Command usage flush failed ({len(rows)} rows): {e}")
+                for key, (channel_id, count, ts) in batch.items():
+                    entry = self._counts.get(key)
+                    if entry is None:
+                        self._counts[key] = [channel_id, count, ts]
+                    else:
+                        entry[1] += count
+                        entry[2] = max(entry[2], ts)
+                return 0
+
+            if self.dropped:
+                LOGGER.warning(f"Command usage buffer dropped {self.dropped} hits")
+                self.dropped = 0
+            LOGGER.debug(f"Flushed {len(rows)} command usage rows")
+            return len(rows)
+
+    @db_lane(BULK)
+    async def _flush_loop(self) -> None:
+        """Flush every *flush_interval* seconds, or early when the buffer fills up."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self._flush_interval)
+            except TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """Stop the background loop and write whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
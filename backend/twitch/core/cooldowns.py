@@ -0,0 +1,82 @@
+"""Monotonic, self-expiring cooldown store.
+
+Keys are tuples such as ``(channel_id, command_name)``. Each key maps to its
+expiry on the ``time.monotonic()`` clock, and a min-heap of expiries lets
+every call evict what has run out. Memory therefore tracks only the cooldowns
+that are active right now.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+
+CooldownKey = tuple[str, ...]
+
+
+class CooldownStore:
+    """Active cooldowns with O(1) lookup and amortised O(log n) expiry."""
+
+    __slots__ = ("_expiry", "_heap", "_seq")
+
+    def __init__(self) -> None:
+        self._expiry: dict[CooldownKey, float] = {}
+        # (expires_at, seq, key); seq breaks ties so keys are never compared
+        self._heap: list[tuple[float, int, CooldownKey]] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def _purge(self, now: float) -> None:
+        heap, expiry = self._heap, self._expiry
+        while heap and heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(heap)
+            # Skip heap entries superseded by a later record() of the same key
+            if expiry.get(key) == expires_at:
+                del expiry[key]
+
+    def _set(self, key: CooldownKey, expires_at: float) -> None:
+        self._expiry[key] = expires_at
+        heapq.heappush(self._heap, (expires_at, next(self._seq), key))
+
+    def acquire(self, key: CooldownKey, seconds: float) -> bool:
+        """Check and record in one step.
+
+        Returns False if *key* is still cooling down; otherwise starts a
+        *seconds*-long cooldown (none if ``seconds <= 0``) and returns True.
+        """
+        now = time.monotonic()
+        self._purge(now)
+        if key in self._expiry:
+            return False
+        if seconds > 0:
+            self._set(key, now + seconds)
+        return True
+
+    def is_active(self, key: CooldownKey) -> bool:
+        """Return True if *key* is cooling down."""
+        self._purge(time.monotonic())
+        return key in self._expiry
+
+    def remaining(self, key: CooldownKey) -> float:
+        """Seconds left on *key*'s cooldown (0.0 if none)."""
+        now = time.monotonic()
+        self._purge(now)
+        expires_at = self._expiry.get(key)
+        return expires_at - now if expires_at is not None else 0.0
+
+    def record(self, key: CooldownKey, seconds: float) -> None:
+        """Start (or extend) a cooldown unconditionally."""
+        if seconds <= 0:
+            return
+        now = time.monotonic()
+        self._purge(now)
+        expires_at = now + seconds
+        if self._expiry.get(key, 0.0) < expires_at:
+            self._set(key, expires_at)
+
+    def clear(self) -> None:
+        self._expiry.clear()
+        self._heap.clear()
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
 from typing import Protocol
 
 from twitchio.ext import commands
@@ -13,6 +12,8 @@ from shared.models.command_config import CommandConfig
 from shared.repositories.channel import ChannelRepository
 from shared.repositories.command_config import CommandConfigRepository
 
+from .cooldowns import CooldownStore
+
 
 class _HasCooldown(Protocol):
     cooldown: int | None
@@ -20,9 +21,9 @@ class _HasCooldown(Protocol):
 
 LOGGER = logging.getLogger("CommandGuard")
 
-# In-memory cooldown tracker (reset on bot restart)
-# key: "{channel_id}:{command_name}"
-_cooldown_tracker: dict[str, datetime] = {}
+# In-memory cooldown store (reset on bot restart)
+# key: (channel_id, command_name)
+_cooldowns = CooldownStore()
 
 # Role hierarchy (higher index = higher privilege)
 ROLE_HIERARCHY = ["everyone", "subscriber", "vip", "moderator", "broadcaster"]
@@ -49,35 +50,53 @@ def has_role(chatter, min_role: str) -> bool:
     return min_level == 0
 
 
-def is_on_cooldown(
+def _effective_cooldown(config: _HasCooldown, channel: Channel | None) -> int:
+    """Command-level override if set, otherwise the channel default."""
+    if config.cooldown is not None:
+        return config.cooldown
+    return channel.default_cooldown if channel else 0
+
+
+def acquire_cooldown(
     channel_id: str,
     command_name: str,
     config: _HasCooldown,
     channel: Channel | None = None,
 ) -> bool:
-    """Check if command is on cooldown.
+    """Check and record the cooldown in one step.
 
-    Uses command-level override if set, otherwise falls back to channel default.
+    Returns True if the command may run (its cooldown is now started), or
+    False if it is still cooling down.
     """
-    effective_cd = (
-        config.cooldown
-        if config.cooldown is not None
-        else (channel.default_cooldown if channel else 0)
-    )
+    effective_cd = _effective_cooldown(config, channel)
     if effective_cd <= 0:
-        return False
-
-    key = f"{channel_id}:{command_name}"
-    last = _cooldown_tracker.get(key)
-    if last and (datetime.now() - last).total_seconds() < effective_cd:
         return True
+    return _cooldowns.acquire((channel_id, command_name), effective_cd)
+
+
+def is_on_cooldown(
+    channel_id: str,
+    command_name: str,
+    config: _HasCooldown,
+    channel: Channel | None = None,
+) -> bool:
+    """Check if command is on cooldown without recording a use.
 
-    return False
+    Uses command-level override if set, otherwise falls back to channel default.
+    """
+    if _effective_cooldown(config, channel) <= 0:
+        return False
+    return _cooldowns.is_active((channel_id, command_name))
 
 
-def record_cooldown(channel_id: str, command_name: str) -> None:
-    """Record cooldown timestamp after successful command execution."""
-    _cooldown_tracker[f"{channel_id}:{command_name}"] = datetime.now()
+def record_cooldown(
+    channel_id: str,
+    command_name: str,
+    config: _HasCooldown,
+    channel: Channel | None = None,
+) -> None:
+    """Start the cooldown unconditionally (e.g. after a forced execution)."""
+    _cooldowns.record((channel_id, command_name), _effective_cooldown(config, channel))
 
 
 async def check_command(
@@ -111,8 +130,10 @@ async def check_command(
         LOGGER.warning(f"DB error fetching channel {channel_id}: {type(e).__name__}: {e}")
         channel = None
 
-    if is_on_cooldown(channel_id, command_name, config, channel):
+    if not acquire_cooldown(channel_id, command_name, config, channel):
         return None
 
-    record_cooldown(channel_id, command_name)
+    usage = getattr(ctx.bot, "command_usage", None)
+    if usage is not None:
+        usage.record(channel_id, f"!{command_name}")
     return config
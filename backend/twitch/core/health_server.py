@@ -8,6 +8,9 @@ from typing import TYPE_CHECKING, Any
 
 from aiohttp import web
 
+from shared.cache import cache_stats
+from shared.database import breaker_states, db_metrics, pool_states
+
 if TYPE_CHECKING:
     from core.bot import Bot
 
@@ -33,6 +36,8 @@ class HealthCheckServer:
         self.app.router.add_get("/", self.handle_root)
         self.app.router.add_get("/health", self.handle_health)
         self.app.router.add_get("/status", self.handle_status)
+        self.app.router.add_get("/caches", self.handle_caches)
+        self.app.router.add_get("/db", self.handle_db)
         self.app.router.add_get("/ping", self.handle_ping)
 
     async def handle_root(self, request: web.Request) -> web.Response:
@@ -54,9 +59,21 @@ class HealthCheckServer:
                 "bot_id": self.bot.bot_id if self.bot else None,
                 "uptime_seconds": int(time.time() - self._start_time),
                 "connected_channels": len(self.bot._subscribed_channels) if self.bot else 0,
+                "chat_queue": self.bot.chat_queue.stats() if self.bot else None,
+                "db_circuit": breaker_states(),
+                "db_pool": pool_states(),
+                "pg_listener": self.bot.pg_listener.stats() if self.bot else None,
             }
         )
 
+    async def handle_caches(self, request: web.Request) -> web.Response:
+        """Per-cache size, hit/miss, stale, eviction, lock-wait and load metrics"""
+        return web.json_response(cache_stats())
+
+    async def handle_db(self, request: web.Request) -> web.Response:
+        """Pool wait and per-statement latency histograms, timeouts and slow queries"""
+        return web.json_response(db_metrics())
+
     async def handle_ping(self, request: web.Request) -> web.Response:
         """Ping endpoint"""
         return web.Response(text="pong")
@@ -84,6 +101,8 @@ class HealthCheckServer:
             logger.info(f"Health server started on {self.host}:{self.port}")
             logger.info(f"  GET http://{self.host}:{self.port}/health - Health check")
             logger.info(f"  GET http://{self.host}:{self.port}/status - Detailed status")
+            logger.info(f"  GET http://{self.host}:{self.port}/caches - Cache metrics")
+            logger.info(f"  GET http://{self.host}:{self.port}/db - Database query metrics")
 
         except Exception as e:
             logger.exception(f"Failed to start health server: {e}")
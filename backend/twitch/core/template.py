@@ -0,0 +1,83 @@
+"""Response template compiler shared by custom commands, triggers, timers and events.
+
+A template is parsed once into literal and variable segments; the compiled
+form is cached by template text and rendered in a single pass.
+
+Supported syntax:
+    $(name)             Variable from the render mapping, e.g. $(user), $(query),
+                        $(channel), $(count), $(tier). Unknown names are kept as-is.
+    $(random min,max)   Random integer in range [min, max]
+    $(pick a,b,c)       Random pick from comma-separated items
+"""
+
+from __future__ import annotations
+
+import random
+import re
+from collections.abc import Mapping
+from functools import lru_cache
+
+_TOKEN_PATTERN = re.compile(r"\$\((?:random\s+(\d+)\s*,\s*(\d+)|pick\s+(.+?)|(\w+))\)")
+
+# Segment kinds (literal segments are plain str)
+_VAR = 0
+_RANDOM = 1
+_PICK = 2
+
+
+class Template:
+    """Compiled template: a tuple of literal strings and variable segments."""
+
+    __slots__ = ("text", "_segments")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        segments: list[str | tuple] = []
+        pos = 0
+        for m in _TOKEN_PATTERN.finditer(text):
+            if m.start() > pos:
+                segments.append(text[pos : m.start()])
+            lo, hi, pick, name = m.groups()
+            if name is not None:
+                segments.append((_VAR, name, m.group(0)))
+            elif pick is not None:
+                items = tuple(i.strip() for i in pick.split(",") if i.strip())
+                segments.append((_PICK, items))
+            else:
+                a, b = int(lo), int(hi)
+                segments.append((_RANDOM, min(a, b), max(a, b)))
+            pos = m.end()
+        if pos < len(text):
+            segments.append(text[pos:])
+        self._segments = tuple(segments)
+
+    @property
+    def is_static(self) -> bool:
+        """True when the template has no variable segments."""
+        return all(isinstance(seg, str) for seg in self._segments)
+
+    def render(self, variables: Mapping[str, str] | None = None) -> str:
+        """Render in a single pass. Substituted values are never re-expanded."""
+        variables = variables or {}
+        out: list[str] = []
+        for seg in self._segments:
+            if isinstance(seg, str):
+                out.append(seg)
+            elif seg[0] == _VAR:
+                out.append(variables.get(seg[1], seg[2]))
+            elif seg[0] == _RANDOM:
+                out.append(str(random.randint(seg[1], seg[2])))
+            else:
+                out.append(random.choice(seg[1]) if seg[1] else "")
+        return "".join(out)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(text: str) -> Template:
+    """Return the compiled (cached) form of *text*."""
+    return Template(text)
+
+
+def render_template(text: str, variables: Mapping[str, str] | None = None) -> str:
+    """Compile *text* (cached) and render it with *variables*."""
+    return compile_template(text).render(variables)
@@ -31,6 +31,7 @@ def main() -> None:
 
         from core import get_channel_subscriptions, load_env_config, validate_env_vars
         from core.bot import Bot
+        from shared.cache_snapshot import CacheSnapshot
         from shared.database import DatabaseManager, PoolConfig
         from shared.repositories.channel import ChannelRepository
 
@@ -48,7 +49,12 @@ def main() -> None:
         database_url: str = env_config["DATABASE_URL"]
         conduit_id: str | None = env_config["CONDUIT_ID"] or None
 
-        # 3. Database connection pool
+        # 3. Last-known-good cache values from the previous run, so the bot
+        #    can serve commands / triggers / timers if the DB is unreachable
+        cache_snapshot = CacheSnapshot.for_service("twitch")
+        cache_snapshot.load()
+
+        # 4. Database connection pool
         db_manager = DatabaseManager(
             database_url,
             PoolConfig.for_service("twitch"),
@@ -56,11 +62,12 @@ def main() -> None:
         await db_manager.connect()
         pool = db_manager.pool
 
+        cache_snapshot.start()
         try:
             subs: list[eventsub.SubscriptionPayload] = []
             channel_repo = ChannelRepository(pool)
 
-            # 4. Retry DB query (cross-region timeout)
+            # 5. Retry DB query (cross-region timeout)
             for attempt in range(1, 6):
                 try:
                     enabled_channels = await channel_repo.list_enabled_channels()
@@ -82,7 +89,7 @@ def main() -> None:
                 )
                 logger.warning("Background task will load channels once DB is reachable")
 
-            # 5. Start bot with auto-retry on rate limit
+            # 6. Start bot with auto-retry on rate limit
             retry_count = 0
             max_retries = 5
             base_delay = 60
@@ -159,6 +166,7 @@ def main() -> None:
                     )
         finally:
             await health_server.stop()
+            await cache_snapshot.stop()
             await db_manager.disconnect()
 
     bot_logger = logging.getLogger("Bot")